@@ -0,0 +1,43 @@
+"""indexes for filtered and sorted list queries
+
+- users(organization_id, is_active, id): organization/active filters in id
+  order; replaces users(organization_id), which is its leading column.
+- users(created_at, id): order_by=created_at / -created_at.
+- users(department_id), user_roles(role_id), departments(parent_id): the
+  department and role filters, and the reverse side of those foreign keys.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_users_org_active_id", "users", ["organization_id", "is_active", "id"])
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"])
+    op.create_index("ix_users_department_id", "users", ["department_id"])
+    op.create_index("ix_user_roles_role_id", "user_roles", ["role_id"])
+    op.create_index("ix_departments_parent_id", "departments", ["parent_id"])
+    op.drop_index("ix_users_organization_id", table_name="users")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_users_organization_id", "users", ["organization_id"])
+    op.drop_index("ix_departments_parent_id", table_name="departments")
+    op.drop_index("ix_user_roles_role_id", table_name="user_roles")
+    op.drop_index("ix_users_department_id", table_name="users")
+    op.drop_index("ix_users_created_at_id", table_name="users")
+    op.drop_index("ix_users_org_active_id", table_name="users")
@@ -0,0 +1,41 @@
+"""role permission sets and department role grants
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("roles", sa.Column("permissions", sa.JSON(), nullable=False, server_default=sa.text("'[]'")))
+    op.create_table(
+        "department_roles",
+        sa.Column("department_id", sa.Integer(), nullable=False),
+        sa.Column("role_id", sa.Integer(), nullable=False),
+        sa.Column("include_subdepartments", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["role_id"], ["roles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("department_id", "role_id"),
+    )
+    op.create_index("ix_department_roles_role_id", "department_roles", ["role_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_department_roles_role_id", table_name="department_roles")
+    op.drop_table("department_roles")
+    with op.batch_alter_table("roles") as batch:  # SQLite cannot drop columns in place
+        batch.drop_column("permissions")
@@ -0,0 +1,51 @@
+"""headcounts summary table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "headcounts",
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("kind", "group_id", "is_active"),
+    )
+    # Backfill from existing users (same queries as app/db/headcounts.py)
+    op.execute(
+        "INSERT INTO headcounts (kind, group_id, is_active, count) "
+        "SELECT 'organization', organization_id, is_active, COUNT(*) FROM users "
+        "GROUP BY organization_id, is_active"
+    )
+    op.execute(
+        "INSERT INTO headcounts (kind, group_id, is_active, count) "
+        "SELECT 'department', department_id, is_active, COUNT(*) FROM users "
+        "WHERE department_id IS NOT NULL GROUP BY department_id, is_active"
+    )
+    op.execute(
+        "INSERT INTO headcounts (kind, group_id, is_active, count) "
+        "SELECT 'role', user_roles.role_id, users.is_active, COUNT(*) FROM user_roles "
+        "JOIN users ON users.id = user_roles.user_id GROUP BY user_roles.role_id, users.is_active"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("headcounts")
@@ -0,0 +1,47 @@
+"""departments.path/depth and the FTS5 search index
+
+Both were added to the models after the baseline. Databases marked with
+``alembic stamp 0001`` lack them; databases migrated with an earlier version
+of 0001, which created them, already have them, so every step is skipped
+when its object exists.
+
+- departments.path/depth: added and filled from parent_id, plus ix_departments_path
+  (app/db/department_paths.py).
+- search_index/search_trigram and their triggers (SQLite only; app/db/search_index.py).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from app.db.department_paths import install_department_paths
+from app.db.search_index import install_search_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    install_department_paths(op.get_bind())
+    install_search_index(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for table in ("users", "departments", "organizations"):
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{suffix}")
+        op.execute("DROP TABLE IF EXISTS search_trigram")
+        op.execute("DROP TABLE IF EXISTS search_index")
+    op.drop_index("ix_departments_path", table_name="departments")
+    op.drop_column("departments", "depth")
+    op.drop_column("departments", "path")
@@ -0,0 +1,35 @@
+"""departments.path in byte order on PostgreSQL
+
+Subtree reads compare ``path`` against ``/1/5/`` .. ``/1/50`` ranges, which
+only hold in byte order. PostgreSQL databases with a locale collation (the
+default en_US.UTF-8 and friends) sort ``/`` and digits differently, so the
+column gets ``COLLATE "C"``; its index is rebuilt with it. Nothing changes on
+SQLite, which already compares text byte-wise.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from app.db.department_paths import install_department_paths
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    install_department_paths(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE departments ALTER COLUMN path TYPE VARCHAR(1024) COLLATE \"default\"")
@@ -0,0 +1,73 @@
+"""Conditional GET: ETag / Last-Modified validators and 304 responses.
+
+Handlers compute a validator from something much cheaper than the response
+body (``updated_at`` of one row, a cached read model, or an aggregate over the
+rows a page covers) and answer ``304 Not Modified`` before loading or
+serializing anything when the client's copy is current.
+
+Responses carry ``Cache-Control: no-cache`` so browsers keep the body and
+revalidate it on every use instead of refetching it.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+from fastapi import Request, Response, status
+
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over ``parts``; equal parts give equal tags."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a stored (naive UTC) timestamp as an HTTP date."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_conditional(request: Request) -> bool:
+    """Whether the request carries a validator worth checking before loading the resource."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """Evaluate If-None-Match (weak comparison) or, when absent, If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution.
+    modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+    return modified <= since
+
+
+def validator_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified))
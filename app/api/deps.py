@@ -1,7 +1,21 @@
 """Common FastAPI dependencies (DB session, etc.)."""
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+from fastapi import HTTPException, Query
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from pydantic import BaseModel
+from sqlalchemy import Row, Select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.services.fieldsets import Fields, InvalidFields, parse_fields
+
+T = TypeVar("T")
+
+# Either session flavour; route handlers only pass it on to run_db().
+AnySession = Session | AsyncSession
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -10,3 +24,103 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency used by the route handlers, chosen once from DATABASE_ASYNC.
+get_session = get_async_db if get_settings().DATABASE_ASYNC else get_db
+
+
+async def run_db(db: AnySession, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Call a sync service function ``fn(session, *args, **kwargs)`` without blocking the event loop.
+
+    - AsyncSession: runs through ``AsyncSession.run_sync`` on the async driver,
+      so no thread is held while waiting on the database.
+    - Session: runs in Starlette's threadpool, as a sync ``def`` handler would.
+
+    Services stay plain sync functions and are shared by both modes.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+@asynccontextmanager
+async def stream_session(db: AnySession) -> AsyncIterator[AnySession]:
+    """A new session of ``db``'s flavour on the same engine, closed when the block exits.
+
+    A ``StreamingResponse`` body runs after the route's dependencies have been
+    torn down, so it must not use the request session (``get_session``).
+    Binding to ``db``'s engine keeps dependency overrides (tests) in effect.
+    """
+    if isinstance(db, AsyncSession):
+        async with AsyncSession(db.bind, autoflush=False, expire_on_commit=False) as session:
+            yield session
+        return
+    session = Session(db.get_bind(), autoflush=False)
+    try:
+        yield session
+    finally:
+        await run_in_threadpool(session.close)
+
+
+async def stream_db(db: AnySession, stmt: Select, partition_size: int) -> AsyncIterator[Sequence[Row]]:
+    """Execute ``stmt`` with a server-side cursor and yield its rows ``partition_size`` at a time.
+
+    ``yield_per`` keeps only one partition in memory (psycopg/asyncpg use a
+    named cursor, SQLite steps its cursor lazily). Sync sessions fetch each
+    partition in the threadpool.
+    """
+    stmt = stmt.execution_options(yield_per=partition_size)
+    if isinstance(db, AsyncSession):
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+        return
+
+    def partitions() -> Generator[Sequence[Row], None, None]:
+        yield from db.execute(stmt).partitions()
+
+    async for partition in iterate_in_threadpool(partitions()):
+        yield partition
+
+
+def check_batch_ids(ids: Sequence[int]) -> list[int]:
+    """Reject empty id lists and lists longer than BATCH_MAX_IDS with a 400."""
+    limit = get_settings().BATCH_MAX_IDS
+    if not ids:
+        raise HTTPException(status_code=400, detail="Give at least one id")
+    if len(ids) > limit:
+        raise HTTPException(status_code=400, detail=f"At most {limit} ids per request")
+    return list(ids)
+
+
+def batch_ids(
+    ids: list[str] = Query(..., description="Comma-separated and/or repeated ids, e.g. ids=3,1,2"),
+) -> list[int]:
+    """Dependency parsing ``ids`` of GET /<resource>/batch."""
+    try:
+        parsed = [int(part) for value in ids for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be integers")
+    return check_batch_ids(parsed)
+
+
+def sparse_fields(model: type[BaseModel]) -> Callable[..., Fields | None]:
+    """Dependency parsing the ``fields`` query parameter against ``model``; unknown fields are a 400."""
+
+    def dependency(
+        fields: str | None = Query(
+            None, description="Comma-separated fields to return, e.g. email,roles.name (id is always included)"
+        ),
+    ) -> Fields | None:
+        try:
+            return parse_fields(model, fields)
+        except InvalidFields as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    return dependency
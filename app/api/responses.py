@@ -0,0 +1,74 @@
+"""JSON response classes for hot read paths.
+
+FastAPI's default path validates the handler's return value against
+``response_model`` object by object and then encodes it with
+``jsonable_encoder`` + ``json.dumps``. For large lists the handlers below skip
+both: services validate whole pages at once with a ``TypeAdapter`` and the
+adapter's Rust serializer produces the body, which ``FastJSONResponse`` sends
+unchanged. The ``response_model`` stays on the route for OpenAPI.
+
+Exports stream NDJSON/CSV straight from a server-side cursor instead.
+"""
+import json
+from collections.abc import AsyncIterator, Collection
+from typing import Any
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Select
+from app.api.deps import AnySession, stream_db, stream_session
+from app.services.export import EXPORT_FORMATS, EXPORT_PARTITION_SIZE, csv_header, encode_csv, encode_ndjson
+
+try:  # optional: pip install .[fast]
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that passes pre-encoded ``bytes`` through and encodes anything else with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def adapter_response(adapter: TypeAdapter, items: Any, **kwargs: Any) -> FastJSONResponse:
+    """Serialize already validated ``items`` with ``adapter`` in one call."""
+    return FastJSONResponse(adapter.dump_json(items), **kwargs)
+
+
+def model_response(item: BaseModel, **kwargs: Any) -> FastJSONResponse:
+    """Serialize a validated model whose class differs from the route's ``response_model`` (sparse fieldsets)."""
+    return FastJSONResponse(item.model_dump_json().encode("utf-8"), **kwargs)
+
+
+def export_response(
+    db: AnySession,
+    stmt: Select,
+    fmt: str,
+    filename: str,
+    list_columns: Collection[str] = (),
+) -> StreamingResponse:
+    """Stream the rows of ``stmt`` as NDJSON or CSV, one chunk per fetched partition.
+
+    ``db`` only picks the engine: the body reads through its own session
+    because the request session is closed before the body is sent.
+    """
+    columns = [column.key for column in stmt.selected_columns]
+    encode = encode_csv if fmt == "csv" else encode_ndjson
+
+    async def body() -> AsyncIterator[bytes]:
+        if fmt == "csv":
+            yield csv_header(columns)
+        async with stream_session(db) as session:
+            async for partition in stream_db(session, stmt, EXPORT_PARTITION_SIZE):
+                yield encode(partition, columns, list_columns)
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
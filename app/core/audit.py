@@ -0,0 +1,184 @@
+"""Write-behind queue for audit records.
+
+Committers hand their records to ``AuditWriter.submit`` and return; a daemon
+thread drains the queue and passes batches of up to ``batch_size`` records to
+``write`` (one executemany INSERT). After the first record arrives the thread
+lingers up to ``flush_interval`` seconds to fill the batch, so a burst of
+commits costs one insert rather than one each.
+
+Memory is bounded: at most ``max_pending`` records are queued. When the queue
+is full, committers wait for room for up to ``enqueue_timeout`` seconds and
+then write their records themselves, so a stalled writer slows writes down
+instead of growing without bound or dropping records.
+
+A failing batch is retried; records that still cannot be written are logged
+in full at ERROR level (logger ``app.audit``) so they can be replayed.
+``close`` drains the queue before it returns; it runs at app shutdown and at
+interpreter exit.
+"""
+import asyncio
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+logger = logging.getLogger("app.audit")
+
+Record = dict[str, Any]
+
+_STOP = object()
+
+
+class AuditWriter:
+    """Bounded queue of audit records plus the thread writing them in batches."""
+
+    retries = 3
+    retry_delay = 0.1
+
+    def __init__(
+        self,
+        write: Callable[[list[Record]], None],
+        max_pending: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        enqueue_timeout: float = 5.0,
+    ):
+        self._write = write
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = max(flush_interval, 0.0)
+        self.enqueue_timeout = max(enqueue_timeout, 0.0)
+        self._queue: queue.Queue = queue.Queue(max(max_pending, 1))
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.inline = 0
+        self.lost = 0
+
+    def _start(self) -> bool:
+        """Start the writer thread on first use; False once closed."""
+        with self._lock:
+            if self._closed:
+                return False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            return True
+
+    def submit(self, records: Sequence[Record]) -> None:
+        """Queue ``records`` for writing; waits for room when the queue is full."""
+        if not records:
+            return
+        with self._lock:
+            self.submitted += len(records)
+        if not self._start():
+            self._write_batch(list(records))  # after close (shutdown): write them here
+            return
+        for index, record in enumerate(records):
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self._wait_for_room(list(records[index:]))
+                return
+
+    def _wait_for_room(self, records: list[Record]) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._put_blocking(records)
+            return
+        # On the event loop thread, i.e. inside an AsyncSession commit: wait in a
+        # helper thread through SQLAlchemy's greenlet bridge so the loop keeps running.
+        from sqlalchemy.util import await_only
+
+        await_only(asyncio.to_thread(self._put_blocking, records))
+
+    def _put_blocking(self, records: list[Record]) -> None:
+        deadline = time.monotonic() + self.enqueue_timeout
+        for index, record in enumerate(records):
+            try:
+                self._queue.put(record, timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Full:
+                rest = records[index:]
+                logger.warning("Audit queue full for %.1fs; writing %d records inline", self.enqueue_timeout, len(rest))
+                with self._lock:
+                    self.inline += len(rest)
+                self._write_batch(rest)
+                return
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: list[Record] = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+                stop = self._gather(batch)
+            if batch:
+                self._write_batch(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _gather(self, batch: list[Record]) -> bool:
+        """Add queued records to ``batch`` until it is full or the linger time is over; True on stop."""
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                # Past the deadline this still takes whatever is already queued.
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                return False
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    def _write_batch(self, batch: list[Record]) -> None:
+        for attempt in range(self.retries):
+            try:
+                self._write(batch)
+            except Exception:
+                logger.exception("Audit batch of %d records failed (attempt %d)", len(batch), attempt + 1)
+                time.sleep(self.retry_delay * 2**attempt)
+                continue
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+            return
+        with self._lock:
+            self.lost += len(batch)
+        for record in batch:
+            logger.error("Audit record not written: %s", json.dumps(record, default=str, ensure_ascii=False))
+
+    def flush(self) -> None:
+        """Wait until every queued record has been written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self, timeout: float | None = 30.0) -> None:
+        """Write what is queued and stop the thread; later records are written by the caller."""
+        with self._lock:
+            thread, self._closed = self._thread, True
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "pending": self._queue.qsize(),
+            "submitted": self.submitted,
+            "written": self.written,
+            "batches": self.batches,
+            "inline": self.inline,
+            "lost": self.lost,
+        }
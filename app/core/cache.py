@@ -0,0 +1,270 @@
+"""In-process read-through cache with pluggable backends.
+
+Organizations and roles are read far more often than they change, so the
+service modules keep read models (Pydantic schemas, never ORM instances) in a
+namespaced ``Cache`` and clear the namespace after every committed write.
+
+Backends (selected by CACHE_BACKEND):
+- memory: per-process LRU bounded by CACHE_MAX_ENTRIES with a TTL (default)
+- sqlite: a file shared by all worker processes on the host, a local stand-in
+  for a shared cache such as Redis, so one worker's invalidation is seen by all
+- none:   caching disabled
+"""
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from functools import lru_cache
+from typing import Any, Protocol, TypeVar
+
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+MISSING: Any = object()
+
+
+class CacheBackend(Protocol):
+    """Storage used by ``Cache``. Keys are strings; ``ttl`` is in seconds."""
+
+    def get(self, key: str) -> Any: ...
+
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def delete_prefix(self, prefix: str) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class NullCacheBackend:
+    def get(self, key: str) -> Any:
+        return MISSING
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def delete_prefix(self, prefix: str) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return 0
+
+
+class MemoryCacheBackend:
+    """Thread-safe LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCacheBackend:
+    """Cache entries in a SQLite file shared across worker processes.
+
+    Values are pickled. When the table grows past ``max_entries`` the entries
+    closest to expiry are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: int = 2048):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any:
+        row = self._connect().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return MISSING if row is None else pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time() + ttl),
+        )
+        self._writes += 1
+        if self._writes % 64 == 0:
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        overflow = len(self) - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY expires_at LIMIT ?)",
+                (overflow,),
+            )
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str) -> None:
+        # Range instead of LIKE so the primary key index is used and '%'/'_' need no escaping.
+        self._connect().execute(
+            "DELETE FROM cache_entries WHERE key >= ? AND key < ?", (prefix, prefix + "\U0010ffff")
+        )
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+
+@lru_cache()
+def get_cache_backend() -> CacheBackend:
+    settings = get_settings()
+    if settings.CACHE_BACKEND == "none":
+        return NullCacheBackend()
+    if settings.CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(settings.CACHE_SQLITE_PATH, settings.CACHE_MAX_ENTRIES)
+    return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+
+
+def local_cache_backend(max_entries: int) -> CacheBackend:
+    """A per-process LRU of its own, for a namespace that must not compete with the shared backend."""
+    if get_settings().CACHE_BACKEND == "none":
+        return NullCacheBackend()
+    return MemoryCacheBackend(max_entries)
+
+
+class Cache:
+    """A namespace of read-through entries with hit/miss counters.
+
+    Counters are per process and guarded by a lock (cached reads run in
+    threadpool workers); with the sqlite backend the entries themselves are
+    shared.
+    """
+
+    _registry: dict[str, "Cache"] = {}
+
+    def __init__(self, namespace: str, ttl: float | None = None, backend: CacheBackend | None = None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        Cache._registry[namespace] = self
+
+    @property
+    def backend(self) -> CacheBackend:
+        return self._backend if self._backend is not None else get_cache_backend()
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key!r}"
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], T]) -> T:
+        """Return the cached value for ``key`` or call ``loader`` and store its result.
+
+        ``None`` results are not cached so a missing row is never pinned.
+        """
+        full_key = self._key(key)
+        value = self.backend.get(full_key)
+        if value is not MISSING:
+            self._count(1, 0)
+            return value
+        self._count(0, 1)
+        value = loader()
+        if value is not None:
+            self.backend.set(full_key, value, self.ttl or get_settings().CACHE_TTL_SECONDS)
+        return value
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        """Cached values of those ``keys`` that have one (batch reads load the rest and ``set`` them)."""
+        found: dict[Hashable, Any] = {}
+        hits = misses = 0
+        for key in keys:
+            value = self.backend.get(self._key(key))
+            if value is MISSING:
+                misses += 1
+            else:
+                hits += 1
+                found[key] = value
+        self._count(hits, misses)
+        return found
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.backend.set(self._key(key), value, self.ttl or get_settings().CACHE_TTL_SECONDS)
+
+    def delete(self, key: Hashable) -> None:
+        """Drop the entry for ``key`` (call after committing a write that changes it)."""
+        self.backend.delete(self._key(key))
+
+    def clear(self) -> None:
+        """Drop every entry in this namespace (call after committing a write)."""
+        self.backend.delete_prefix(f"{self.namespace}:")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def cache_stats() -> dict[str, Any]:
+    return {
+        "backend": type(get_cache_backend()).__name__,
+        "entries": len(get_cache_backend()),
+        "namespaces": {name: cache.stats() for name, cache in Cache._registry.items()},
+    }
+
+
+def clear_all_caches() -> None:
+    for cache in Cache._registry.values():
+        cache.clear()
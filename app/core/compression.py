@@ -0,0 +1,156 @@
+"""Response compression: gzip, and Brotli when the ``brotli`` package is installed.
+
+CompressionMiddleware (pure ASGI) picks a Content-Encoding from the request's
+Accept-Encoding (q-values honoured; br wins ties when available) and
+compresses textual responses (JSON, NDJSON, CSV, text/*) of at least
+``minimum_size`` bytes. Responses that already carry a Content-Encoding pass
+through untouched.
+
+Streaming responses (exports) are compressed chunk by chunk, flushing after
+each chunk so clients keep receiving rows as they are produced.
+"""
+import zlib
+from collections.abc import Callable
+
+try:  # optional: pip install .[compression]
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "image/svg+xml")
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Supported encodings in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str, supported: tuple[str, ...]) -> str | None:
+    """Best of ``supported`` for an Accept-Encoding header, or None for identity."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.lower()] = q
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self._factories: dict[str, Callable[[], _Gzip | _Brotli]] = {"gzip": lambda: _Gzip(gzip_level)}
+        if brotli is not None:
+            self._factories["br"] = lambda: _Brotli(brotli_quality)
+        self._supported = available_encodings()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept, self._supported) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: dict | None = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = {name.lower(): value for name, value in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                if b"content-encoding" in headers or not _is_compressible(content_type):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message  # held until the first body chunk shows the size
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body, more_body = message.get("body", b""), message.get("more_body", False)
+            if start is not None:
+                if not more_body and len(body) < self.minimum_size:
+                    await send(_with_headers(start))
+                    start = None
+                    await send(message)
+                    passthrough = True
+                    return
+                compressor = self._factories[encoding]()
+                if not more_body:
+                    body = compressor.finish(body)
+                    await send(_with_headers(start, encoding=encoding, length=len(body)))
+                    start = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(_with_headers(start, encoding=encoding))
+                start = None
+            data = compressor.chunk(body) if more_body else compressor.finish(body)
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _with_headers(start: dict, *, encoding: str | None = None, length: int | None = None) -> dict:
+    """``start`` with Vary (and, when compressing, Content-Encoding and the new Content-Length)."""
+    headers = list(start.get("headers", []))
+    if encoding is not None:
+        headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+    if not any(name.lower() == b"vary" and b"accept-encoding" in value.lower() for name, value in headers):
+        headers.append((b"vary", b"Accept-Encoding"))
+    if encoding is not None:
+        headers.append((b"content-encoding", encoding.encode("latin-1")))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode("latin-1")))
+    return {**start, "headers": headers}
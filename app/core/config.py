@@ -23,6 +23,112 @@ class Settings(BaseModel):
     # If using SQLite, we need check_same_thread=False
     SQLALCHEMY_ECHO: bool = os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"
 
+    # Connection pool (ignored for in-memory SQLite, which uses a single shared connection)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # SQLite PRAGMAs applied to every new connection. WAL lets readers run
+    # concurrently with a writer; synchronous=NORMAL is durable in WAL mode.
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    # Negative values are KiB (-65536 = 64 MiB page cache per connection)
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+    # Async mode: AsyncEngine + async sessions for route handlers (requires the "async" extra)
+    DATABASE_ASYNC: bool = os.getenv("DATABASE_ASYNC", "false").lower() == "true"
+    # Optional explicit async URL; derived from DATABASE_URL when empty
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+
+    # Domain modules whose routes this process serves (app/modules.py), comma-separated; empty: all
+    ENABLED_MODULES: str = os.getenv("ENABLED_MODULES", "")
+
+    # Schema at startup (app/db/schema.py): create (create_all, development) | check (require
+    # the Alembic head) | upgrade | off. python -m app.serve does it once and sets off for its workers.
+    SCHEMA_ON_STARTUP: str = os.getenv("SCHEMA_ON_STARTUP", "create").lower()
+    # Open the DB pool, start the password hashing processes and fill the read caches
+    # before serving (app/services/warmup.py); python -m app.serve turns this on
+    WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "false").lower() == "true"
+
+    # Production launcher (python -m app.serve); command-line options override these
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+    # Worker processes (0: one per CPU)
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "0"))
+    # Pending connections the kernel queues per listening socket
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    # Idle keep-alive; keep it above the load balancer's idle timeout (60s on most)
+    # so the server never closes a connection the balancer is about to reuse
+    SERVER_KEEPALIVE_SECONDS: int = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "65"))
+    # Concurrent connections per worker before answering 503 (0: unlimited)
+    SERVER_LIMIT_CONCURRENCY: int = int(os.getenv("SERVER_LIMIT_CONCURRENCY", "0"))
+    # Restart a worker after this many requests (0: never), bounding slow leaks
+    SERVER_LIMIT_MAX_REQUESTS: int = int(os.getenv("SERVER_LIMIT_MAX_REQUESTS", "0"))
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", "30"))
+    # Comma-separated proxy addresses trusted for X-Forwarded-For/Proto
+    SERVER_FORWARDED_ALLOW_IPS: str = os.getenv("SERVER_FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+    # Request metrics: Server-Timing header and GET /metrics (Prometheus text format)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+    # Response compression (app/core/compression.py): gzip, br with the "compression" extra
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    # Bodies smaller than this are sent as is
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # SQL debugging: slow-query log and N+1 detection per request (app.sql.* loggers)
+    SQL_DEBUG: bool = os.getenv("SQL_DEBUG", "false").lower() == "true"
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "100"))
+    # A SELECT repeated more than this many times within one request is reported
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
+    # Bulk import: rows per INSERT batch / email uniqueness check (POST /users/bulk)
+    BULK_INSERT_BATCH_SIZE: int = int(os.getenv("BULK_INSERT_BATCH_SIZE", "500"))
+
+    # Batch reads (GET/POST /<resource>/batch): ids per request, and per IN (...) query,
+    # which stays under SQLite's bound-parameter limit (999 before 3.32)
+    BATCH_MAX_IDS: int = int(os.getenv("BATCH_MAX_IDS", "10000"))
+    BATCH_READ_CHUNK_SIZE: int = int(os.getenv("BATCH_READ_CHUNK_SIZE", "500"))
+
+    # Audit log of user/organization/role changes (app/services/audit_service.py):
+    # behind (queued at commit, written in batches by a background thread) |
+    # transaction (written inside the committing transaction) | off
+    AUDIT_MODE: str = os.getenv("AUDIT_MODE", "behind").lower()
+    # Records held in memory for the writer; committers wait for room beyond this
+    AUDIT_QUEUE_SIZE: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    # How long the writer waits after a record to gather more into the same INSERT
+    AUDIT_FLUSH_INTERVAL_MS: float = float(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "50"))
+    # How long a committer waits for room before writing its records itself
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT_SECONDS", "5"))
+
+    # Password hashing (app/core/passwords.py): scheme for new hashes and its cost.
+    # Stored hashes with other parameters are replaced at the next login.
+    PASSWORD_HASHER: str = os.getenv("PASSWORD_HASHER", "scrypt").lower()
+    PASSWORD_SCRYPT_N: int = int(os.getenv("PASSWORD_SCRYPT_N", str(2**14)))
+    PASSWORD_SCRYPT_R: int = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+    PASSWORD_SCRYPT_P: int = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+    # Hashing processes (-1: min(4, CPU count), 0: hash inline) and the bound on queued + running hashes
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "-1"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+    # Read-through cache for organizations/roles: memory | sqlite | none
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+    # File shared by all workers when CACHE_BACKEND=sqlite
+    CACHE_SQLITE_PATH: str = os.getenv("CACHE_SQLITE_PATH", "./erp_cache.db")
+    # Per-user permission masks: an in-process LRU of their own (whatever CACHE_BACKEND says,
+    # except none), so they neither evict organization/role entries nor cost a SQLite read
+    PERMISSION_CACHE_MAX_ENTRIES: int = int(os.getenv("PERMISSION_CACHE_MAX_ENTRIES", "100000"))
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -0,0 +1,317 @@
+"""Request-level performance instrumentation.
+
+- MetricsMiddleware (pure ASGI) times every HTTP request, adds a
+  ``Server-Timing`` header and records the result per route template.
+- SQLAlchemy cursor events (install_sql_timing) count statements and DB time
+  for the request that issued them. The per-request RequestStats lives in a
+  contextvar, which follows the request into the threadpool and into
+  AsyncSession.run_sync.
+- InstrumentedRoute (used as ``route_class`` by the API routers) separates
+  endpoint time from response validation/encoding time.
+- render_prometheus() exposes the aggregates in the Prometheus text format.
+
+Server-Timing entries:
+    db   total time spent executing SQL (desc = statement count)
+    app  endpoint function time (includes db)
+    ser  response validation and JSON encoding
+    total  time until response headers were sent
+"""
+import functools
+import inspect
+import threading
+import time
+from collections.abc import Callable, Sequence
+from contextvars import ContextVar
+from typing import Any
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestStats:
+    """Timings collected while handling one request."""
+
+    __slots__ = ("route", "sql_count", "sql_time", "endpoint_time", "handler_time")
+
+    def __init__(self):
+        self.route: str | None = None
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.endpoint_time = 0.0
+        self.handler_time = 0.0
+
+    @property
+    def serialize_time(self) -> float:
+        return max(self.handler_time - self.endpoint_time, 0.0)
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _current.get()
+
+
+# ========== SQL timing ==========
+# The start time lives on the execution context, which is dropped with the
+# statement: a statement that raises (no after_cursor_execute) leaves nothing behind.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = context._query_start
+    stats = _current.get()
+    if stats is not None:
+        elapsed = time.perf_counter() - started
+        stats.sql_count += 1
+        stats.sql_time += elapsed
+
+
+def install_sql_timing(engine: Engine) -> None:
+    """Attribute statements executed on ``engine`` to the current request."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ========== Aggregation ==========
+LATENCY_BUCKETS: Sequence[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS: Sequence[float] = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "statements", "db_seconds", "serialize_seconds", "responses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.responses: dict[int, int] = {}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+
+    def record(self, method: str, route: str, status: int, duration: float, stats: RequestStats) -> None:
+        with self._lock:
+            metrics = self.routes.get((method, route))
+            if metrics is None:
+                metrics = self.routes[(method, route)] = RouteMetrics()
+            metrics.latency.observe(duration)
+            metrics.statements.observe(stats.sql_count)
+            metrics.db_seconds += stats.sql_time
+            metrics.serialize_seconds += stats.serialize_time
+            metrics.responses[status] = metrics.responses.get(status, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.routes.clear()
+
+
+registry = MetricsRegistry()
+
+
+# ========== Middleware ==========
+class MetricsMiddleware:
+    """Time each HTTP request, emit Server-Timing and record per-route metrics."""
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(stats, time.perf_counter() - started)))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = stats.route or _route_template(scope)
+            registry.record(scope["method"], route, status_code, time.perf_counter() - started, stats)
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    # Unmatched paths are collapsed so arbitrary URLs cannot create unbounded label sets.
+    return "<unmatched>"
+
+
+def _server_timing(stats: RequestStats, total: float) -> bytes:
+    parts = [
+        f'db;dur={stats.sql_time * 1000:.2f};desc="{stats.sql_count} queries"',
+        f"app;dur={stats.endpoint_time * 1000:.2f}",
+        f"ser;dur={stats.serialize_time * 1000:.2f}",
+        f"total;dur={total * 1000:.2f}",
+    ]
+    return ", ".join(parts).encode("latin-1")
+
+
+# ========== Route class ==========
+class InstrumentedRoute(APIRoute):
+    """APIRoute that records the route template plus endpoint vs. serialization time."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route_path = self.path
+
+        async def timed_handler(request):
+            stats = _current.get()
+            if stats is None:
+                return await handler(request)
+            stats.route = route_path
+            started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                stats.handler_time = time.perf_counter() - started
+
+        return timed_handler
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # Keep the coroutine/sync nature so FastAPI still picks event loop vs. threadpool correctly.
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _add_endpoint_time(time.perf_counter() - started)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            _add_endpoint_time(time.perf_counter() - started)
+
+    return sync_wrapper
+
+
+def _add_endpoint_time(elapsed: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.endpoint_time += elapsed
+
+
+# ========== Prometheus exposition ==========
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, hist: Histogram, labels: dict[str, Any]) -> list[str]:
+    lines = [
+        f"{name}_bucket{_labels(**labels, le=_fmt(bound))} {count}"
+        for bound, count in zip(hist.buckets, hist.counts)
+    ]
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {hist.total}")
+    lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+    return lines
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() and value >= 1 else str(value)
+
+
+# (metric name, "counter" | "gauge", [(labels, value), ...])
+ExtraMetric = tuple[str, str, list[tuple[dict[str, Any], float]]]
+
+
+def render_prometheus(extra: Sequence[ExtraMetric] = ()) -> str:
+    """Render the registry (plus ``extra`` samples) in the Prometheus text exposition format."""
+    with registry._lock:
+        routes = list(registry.routes.items())
+        lines: list[str] = [
+            "# HELP http_requests_total HTTP responses by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route), metrics in routes:
+            for status_code, count in sorted(metrics.responses.items()):
+                lines.append(f"http_requests_total{_labels(method=method, route=route, status=status_code)} {count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency until the response is complete.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), metrics in routes:
+            lines += _histogram_lines("http_request_duration_seconds", metrics.latency, {"method": method, "route": route})
+
+        lines += [
+            "# HELP http_request_db_statements SQL statements executed per request.",
+            "# TYPE http_request_db_statements histogram",
+        ]
+        for (method, route), metrics in routes:
+            lines += _histogram_lines("http_request_db_statements", metrics.statements, {"method": method, "route": route})
+
+        lines += [
+            "# HELP http_request_db_seconds_total Time spent executing SQL.",
+            "# TYPE http_request_db_seconds_total counter",
+        ]
+        for (method, route), metrics in routes:
+            lines.append(f"http_request_db_seconds_total{_labels(method=method, route=route)} {metrics.db_seconds}")
+
+        lines += [
+            "# HELP http_request_serialize_seconds_total Time spent validating and encoding responses.",
+            "# TYPE http_request_serialize_seconds_total counter",
+        ]
+        for (method, route), metrics in routes:
+            lines.append(f"http_request_serialize_seconds_total{_labels(method=method, route=route)} {metrics.serialize_seconds}")
+
+    for name, kind, samples in extra:
+        lines.append(f"# TYPE {name} {kind}")
+        lines += [f"{name}{_labels(**labels) if labels else ''} {value}" for labels, value in samples]
+    return "\n".join(lines) + "\n"
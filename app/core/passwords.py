@@ -0,0 +1,333 @@
+"""Password hashing: versioned hash formats and a bounded process pool.
+
+Stored hashes name their scheme and parameters, so the configured hasher can
+change without invalidating existing passwords:
+
+- ``$scrypt$v=1$n=16384,r=8,p=1$<salt>$<key>`` (unpadded base64): the default,
+  memory-hard (about ``128 * n * r`` bytes per hash).
+- 64 hex digits: unsalted SHA-256 from before hashes were versioned. Verify-only.
+
+``verify_password`` also returns a replacement hash when the stored one uses
+another scheme or other parameters than the configured hasher; callers save it
+so hashes are upgraded transparently at login (POST /auth/login).
+
+A hash costs tens of milliseconds of CPU, so hashing runs in a pool of
+PASSWORD_HASH_WORKERS processes instead of the request's thread. At most
+PASSWORD_HASH_MAX_PENDING jobs are queued or running; further callers wait for
+a slot rather than growing an unbounded backlog. On the event loop thread
+(async sessions) that wait goes through a helper thread, so the loop keeps
+serving other requests. PASSWORD_HASH_WORKERS=0 hashes inline (tests, scripts).
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import secrets
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class PasswordHasher(ABC):
+    """One hash scheme. Instances are pickled into the worker processes."""
+
+    scheme = ""
+
+    @abstractmethod
+    def identify(self, encoded: str) -> bool:
+        """Whether ``encoded`` is a hash of this scheme."""
+
+    @abstractmethod
+    def hash(self, password: str) -> str: ...
+
+    @abstractmethod
+    def verify(self, password: str, encoded: str) -> bool: ...
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Whether ``encoded`` (of this scheme) was made with other parameters than this hasher's."""
+        return False
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+class ScryptHasher(PasswordHasher):
+    scheme = "scrypt"
+    version = 1
+
+    def __init__(self, n: int = 2**14, r: int = 8, p: int = 1, salt_bytes: int = 16, key_bytes: int = 32):
+        if n < 2 or n & (n - 1):
+            raise ValueError("scrypt n must be a power of two greater than 1")
+        self.n, self.r, self.p = n, r, p
+        self.salt_bytes, self.key_bytes = salt_bytes, key_bytes
+
+    def _params(self) -> str:
+        return f"n={self.n},r={self.r},p={self.p}"
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, n: int, r: int, p: int, length: int) -> bytes:
+        # OpenSSL refuses to allocate more than maxmem; allow what these parameters need.
+        maxmem = 128 * r * (n + p + 2) + 2**20
+        return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=length)
+
+    @staticmethod
+    def _parse(encoded: str) -> tuple[dict[str, int], bytes, bytes]:
+        """(params, salt, key) of a stored hash; ValueError for anything malformed."""
+        _, _, version, params, salt, key = encoded.split("$")
+        if version != f"v={ScryptHasher.version}":
+            raise ValueError(f"Unsupported scrypt hash version: {version}")
+        values = dict(item.split("=", 1) for item in params.split(","))
+        if values.keys() != {"n", "r", "p"}:
+            raise ValueError(f"Malformed scrypt parameters: {params}")
+        values = {name: int(value) for name, value in values.items()}
+        if values["n"] < 2 or values["n"] & (values["n"] - 1) or values["r"] < 1 or values["p"] < 1:
+            raise ValueError(f"Invalid scrypt parameters: {params}")
+        salt_bytes, key_bytes = _b64decode(salt), _b64decode(key)
+        if not salt_bytes or not key_bytes:
+            raise ValueError("Empty scrypt salt or key")
+        return values, salt_bytes, key_bytes
+
+    def identify(self, encoded: str) -> bool:
+        return encoded.startswith("$scrypt$")
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(self.salt_bytes)
+        key = self._derive(password, salt, self.n, self.r, self.p, self.key_bytes)
+        return f"$scrypt$v={self.version}${self._params()}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            params, salt, key = self._parse(encoded)
+        except ValueError:
+            return False
+        derived = self._derive(password, salt, params["n"], params["r"], params["p"], len(key))
+        return hmac.compare_digest(derived, key)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        try:
+            params, salt, key = self._parse(encoded)
+        except ValueError:
+            return True
+        current = {"n": self.n, "r": self.r, "p": self.p}
+        return params != current or len(salt) != self.salt_bytes or len(key) != self.key_bytes
+
+
+class LegacySha256Hasher(PasswordHasher):
+    """Unsalted SHA-256 hex digests written before hashes were versioned; verify-only."""
+
+    scheme = "sha256"
+
+    def identify(self, encoded: str) -> bool:
+        return len(encoded) == 64 and all(c in "0123456789abcdef" for c in encoded)
+
+    def hash(self, password: str) -> str:
+        raise NotImplementedError("sha256 hashes are verify-only; configure another PASSWORD_HASHER")
+
+    def verify(self, password: str, encoded: str) -> bool:
+        return hmac.compare_digest(hashlib.sha256(password.encode("utf-8")).hexdigest(), encoded)
+
+
+# Schemes that can verify stored hashes, in identification order.
+HASHERS: dict[str, type[PasswordHasher]] = {
+    "scrypt": ScryptHasher,
+    "sha256": LegacySha256Hasher,
+}
+
+# Schemes that PASSWORD_HASHER may select for new hashes: scheme -> factory(settings)
+_CONFIGURABLE: dict[str, Callable[[Any], PasswordHasher]] = {
+    "scrypt": lambda cfg: ScryptHasher(cfg.PASSWORD_SCRYPT_N, cfg.PASSWORD_SCRYPT_R, cfg.PASSWORD_SCRYPT_P),
+}
+
+
+def identify_hasher(encoded: str) -> PasswordHasher | None:
+    for cls in HASHERS.values():
+        hasher = cls()
+        if hasher.identify(encoded):
+            return hasher
+    return None
+
+
+def _hash(hasher: PasswordHasher, password: str) -> str:
+    return hasher.hash(password)
+
+
+def _check(current: PasswordHasher, password: str, encoded: str | None) -> tuple[bool, str | None]:
+    """(valid, replacement hash or None); runs in a worker process."""
+    if encoded is None:
+        # Same cost as a real check, so unknown accounts do not answer faster.
+        current.hash(password)
+        return False, None
+    stored = identify_hasher(encoded)
+    if stored is None or not stored.verify(password, encoded):
+        return False, None
+    if stored.scheme != current.scheme or current.needs_rehash(encoded):
+        return True, current.hash(password)
+    return True, None
+
+
+# ========== Process pool ==========
+class HashingPool:
+    """Process pool with a bound on queued plus running jobs."""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max(max_pending, 1)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs threads (server, pool) is unsafe.
+                context = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+            return self._executor
+
+    def _acquire_slot(self) -> None:
+        if self._slots.acquire(blocking=False):
+            return
+        if not _on_event_loop():
+            self._slots.acquire()
+            return
+        # On the event loop thread, i.e. inside AsyncSession.run_sync: wait in a
+        # helper thread through SQLAlchemy's greenlet bridge so the loop keeps running.
+        from sqlalchemy.util import await_only
+
+        await_only(asyncio.to_thread(self._slots.acquire))
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        """Queue ``fn(*args)``, waiting for a free slot first."""
+        self._acquire_slot()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for later calls.
+            self._slots.release()
+            self.shutdown()
+            raise
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def map(self, fn: Callable[..., T], calls: Sequence[tuple]) -> list[T]:
+        """``[fn(*args) for args in calls]``, spread over the workers.
+
+        Calls are submitted in windows of at most ``max_pending``, each waited
+        for before the next, so a large batch never waits for slots it holds itself.
+        """
+        if self.workers <= 0:
+            return [fn(*args) for args in calls]
+        results: list[T] = []
+        for start in range(0, len(calls), self.max_pending):
+            window = calls[start:start + self.max_pending]
+            results += _wait([self.submit(fn, *args) for args in window])
+        return results
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        return self.map(fn, [args])[0]
+
+    def warm(self) -> int:
+        """Start the worker processes now rather than on the first hash; returns how many."""
+        if self.workers <= 0:
+            return 0
+        # A spawn-context executor starts all its processes on the first submit.
+        _wait([self.submit(os.getpid) for _ in range(self.workers)])
+        return self.workers
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _wait(futures: list["Future[T]"]) -> list[T]:
+    if not _on_event_loop():
+        return [future.result() for future in futures]
+    # On the event loop thread, i.e. inside AsyncSession.run_sync: await through
+    # SQLAlchemy's greenlet bridge so other requests are served meanwhile.
+    from sqlalchemy.util import await_only
+
+    return await_only(asyncio.gather(*(asyncio.wrap_future(future) for future in futures)))
+
+
+@lru_cache()
+def get_hasher() -> PasswordHasher:
+    """The hasher for new hashes (PASSWORD_HASHER)."""
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    factory = _CONFIGURABLE.get(settings.PASSWORD_HASHER)
+    if factory is None:
+        raise ValueError(f"Unsupported PASSWORD_HASHER: {settings.PASSWORD_HASHER!r}")
+    return factory(settings)
+
+
+@lru_cache()
+def get_pool() -> HashingPool:
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    workers = settings.PASSWORD_HASH_WORKERS
+    if workers < 0:
+        workers = min(4, os.cpu_count() or 1)
+    return HashingPool(workers, settings.PASSWORD_HASH_MAX_PENDING)
+
+
+def shutdown_pool() -> None:
+    if get_pool.cache_info().currsize:
+        get_pool().shutdown()
+
+
+# ========== API ==========
+def hash_password(password: str) -> str:
+    return get_pool().run(_hash, get_hasher(), password)
+
+
+def hash_passwords(passwords: Sequence[str]) -> list[str]:
+    """Hash many passwords in parallel across the pool (bulk imports)."""
+    hasher = get_hasher()
+    return get_pool().map(_hash, [(hasher, password) for password in passwords])
+
+
+def verify_password(password: str, encoded: str | None) -> tuple[bool, str | None]:
+    """Check ``password`` against a stored hash.
+
+    Returns ``(valid, replacement)``; ``replacement`` is a new hash to store when
+    the valid stored one is outdated. Pass ``encoded=None`` for unknown accounts
+    to spend the same time and get ``(False, None)``.
+    """
+    return get_pool().run(_check, get_hasher(), password, encoded)
+
+
+async def ahash_password(password: str) -> str:
+    """hash_password for async handlers; a helper thread waits for the pool."""
+    return await asyncio.to_thread(hash_password, password)
+
+
+async def averify_password(password: str, encoded: str | None) -> tuple[bool, str | None]:
+    return await asyncio.to_thread(verify_password, password, encoded)
@@ -0,0 +1,39 @@
+"""Permission catalog for role-based access control.
+
+Roles grant a subset of ``PERMISSIONS``. A user's effective permissions are
+folded into one integer bitmask (bit ``i`` = ``PERMISSIONS[i]``), so a check on
+the hot path is a single AND; see app/services/permission_service.py.
+
+Append new permissions at the end: the position is the bit.
+"""
+from collections.abc import Iterable
+from typing import Literal, get_args
+
+Permission = Literal[
+    "organizations:read",
+    "organizations:write",
+    "departments:read",
+    "departments:write",
+    "users:read",
+    "users:write",
+    "roles:read",
+    "roles:write",
+    "reports:read",
+    "audit:read",
+]
+
+PERMISSIONS: tuple[str, ...] = get_args(Permission)
+PERMISSION_BITS: dict[str, int] = {name: 1 << bit for bit, name in enumerate(PERMISSIONS)}
+
+
+def permission_mask(permissions: Iterable[str]) -> int:
+    """Bitmask of ``permissions``; names outside the catalog are ignored."""
+    mask = 0
+    for name in permissions:
+        mask |= PERMISSION_BITS.get(name, 0)
+    return mask
+
+
+def permission_names(mask: int) -> list[str]:
+    """Names set in ``mask``, in catalog order (also used to store role permission sets canonically)."""
+    return [name for name, bit in PERMISSION_BITS.items() if mask & bit]
@@ -0,0 +1,154 @@
+"""Slow-query log and N+1 detector (SQL_DEBUG=true).
+
+- Statements slower than SLOW_QUERY_MS are logged on ``app.sql.slow`` with
+  their parameters and the request that issued them.
+- Within one request (or an explicit ``sql_trace()`` block) SELECTs are grouped
+  by normalized text; one that runs more than N_PLUS_ONE_THRESHOLD times is
+  reported on ``app.sql.n_plus_one``. That is the signature of lazy loads such
+  as ``UserRead.roles`` or ``Department.children`` being fetched row by row.
+
+Findings are also passed to registered sinks (see ``collect_findings``), which
+is how the test suite fails tests that regress into N+1.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import NamedTuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import get_settings
+
+slow_logger = logging.getLogger("app.sql.slow")
+n_plus_one_logger = logging.getLogger("app.sql.n_plus_one")
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NAMED_PARAM = re.compile(r"%\(\w+\)s|:\w+|\$\d+|%s")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape: literals, bind markers and IN lists become ``?``."""
+    text = _STRING.sub("?", statement)
+    text = _NAMED_PARAM.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _IN_LIST.sub("IN (?)", text)
+
+
+class NPlusOneFinding(NamedTuple):
+    label: str
+    statement: str
+    count: int
+
+
+class SqlTrace:
+    """Per-request statement counters.
+
+    With an ASGI ``scope`` the label is the route template once routing has
+    matched (``GET /users/{user_id}``), otherwise the raw path.
+    """
+
+    def __init__(self, label: str, scope: dict | None = None):
+        self._label = label
+        self._scope = scope
+        self.select_counts: Counter[str] = Counter()
+
+    @property
+    def label(self) -> str:
+        route_path = getattr(self._scope.get("route"), "path", None) if self._scope else None
+        return f"{self._scope['method']} {route_path}" if route_path else self._label
+
+    def findings(self, threshold: int) -> list[NPlusOneFinding]:
+        return [
+            NPlusOneFinding(self.label, statement, count)
+            for statement, count in self.select_counts.most_common()
+            if count > threshold
+        ]
+
+
+_current_trace: ContextVar[SqlTrace | None] = ContextVar("sql_trace", default=None)
+_sinks: list[list[NPlusOneFinding]] = []
+_sinks_lock = threading.Lock()
+
+
+@contextmanager
+def sql_trace(label: str, threshold: int | None = None, scope: dict | None = None) -> Iterator[SqlTrace]:
+    """Trace statements executed in this context and report N+1 patterns when it exits."""
+    trace = SqlTrace(label, scope)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        limit = get_settings().N_PLUS_ONE_THRESHOLD if threshold is None else threshold
+        for finding in trace.findings(limit):
+            n_plus_one_logger.warning(
+                "N+1 suspected in %s: statement executed %d times: %s",
+                finding.label,
+                finding.count,
+                finding.statement,
+            )
+            with _sinks_lock:
+                for sink in _sinks:
+                    sink.append(finding)
+
+
+@contextmanager
+def collect_findings() -> Iterator[list[NPlusOneFinding]]:
+    """Collect N+1 findings reported by any thread while the block runs."""
+    sink: list[NPlusOneFinding] = []
+    with _sinks_lock:
+        _sinks.append(sink)
+    try:
+        yield sink
+    finally:
+        with _sinks_lock:
+            _sinks.remove(sink)
+
+
+# ========== Engine hooks ==========
+# Started on the execution context (not conn.info), so failed statements leave nothing behind.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._sql_debug_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._sql_debug_start) * 1000
+    trace = _current_trace.get()
+    if elapsed_ms >= get_settings().SLOW_QUERY_MS:
+        slow_logger.warning(
+            "slow query %.1fms [%s]: %s | params=%r",
+            elapsed_ms,
+            trace.label if trace is not None else "-",
+            _WHITESPACE.sub(" ", statement).strip(),
+            parameters,
+        )
+    if trace is not None and statement.lstrip()[:6].upper() == "SELECT":
+        trace.select_counts[normalize_statement(statement)] += 1
+
+
+def install_sql_debug(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SqlDebugMiddleware:
+    """Wrap every HTTP request in a ``sql_trace`` labelled with its method and route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with sql_trace(f"{scope['method']} {scope['path']}", scope=scope):
+            await self.app(scope, receive, send)
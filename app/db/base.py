@@ -1,19 +1,31 @@
 """SQLAlchemy Declarative Base.
 This module defines the Base class used by all ORM models.
-Import all model modules here so Alembic's autogenerate can discover them.
+Model modules are listed per domain in app/modules.py; call load_models() for
+the complete metadata (create_all, Alembic autogenerate), and
+load_session_hooks() in processes that write through sessions (the app).
 """
+import importlib
+from sqlalchemy import MetaData
 from sqlalchemy.orm import DeclarativeBase
+from app.modules import hook_modules, model_modules
 
 
 class Base(DeclarativeBase):
     pass
 
 
-# Import models for metadata registration
-# These imports ensure Base.metadata is aware of all tables
-try:
-    from app.models import organization, department, user, role  # noqa: F401
-except Exception:
-    # During some tooling or early import phases, models may not be available.
-    # It's safe to ignore import errors here; runtime app and alembic will import them.
-    pass
+def load_models() -> MetaData:
+    """Import every registered model module and return the complete ``Base.metadata``."""
+    for path in model_modules():
+        importlib.import_module(path)
+    return Base.metadata
+
+
+def load_session_hooks() -> None:
+    """Import every registered hook module, whichever modules serve routes in this process.
+
+    The hooks import the services and with them the settings, so this is kept
+    out of ``load_models`` (Alembic, the benchmark seeder).
+    """
+    for path in hook_modules():
+        importlib.import_module(path)
@@ -0,0 +1,90 @@
+"""Materialized ``departments.path``/``depth`` for databases that predate them.
+
+Databases created by earlier versions of the app have a ``departments`` table
+without the two columns; ``create_all`` never alters an existing table.
+``install_department_paths`` adds them, fills them from ``parent_id`` and
+creates their index. On PostgreSQL it also gives ``path`` the byte-order
+``COLLATE "C"`` the subtree ranges rely on (see app/models/department.py).
+It is idempotent and runs from migrations 0006 and 0007 and, for databases
+managed by ``create_all`` (SCHEMA_ON_STARTUP=create), after every
+``Base.metadata.create_all``.
+"""
+from sqlalchemy import String, cast, event, exists, inspect, literal, literal_column, or_, select, update
+from sqlalchemy.engine import Connection
+from app.db.base import Base
+from app.models.department import Department
+
+# Columns added to an existing table need a server default to be NOT NULL.
+_ADD_COLUMNS = {
+    "path": "ALTER TABLE departments ADD COLUMN path {path_type} DEFAULT '' NOT NULL",
+    "depth": "ALTER TABLE departments ADD COLUMN depth INTEGER DEFAULT 0 NOT NULL",
+}
+
+
+def _path_type(connection: Connection) -> str:
+    """DDL type of ``departments.path`` on this backend (``VARCHAR(1024) COLLATE "C"`` on PostgreSQL)."""
+    return Department.__table__.c.path.type.compile(dialect=connection.dialect)
+
+
+def _ensure_path_collation(connection: Connection) -> None:
+    """Switch an existing PostgreSQL ``path`` column to ``COLLATE "C"`` (rebuilds its index)."""
+    if connection.dialect.name != "postgresql":
+        return
+    collation = connection.exec_driver_sql(
+        "SELECT collation_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'departments' AND column_name = 'path'"
+    ).scalar()
+    if collation != "C":
+        connection.exec_driver_sql(f"ALTER TABLE departments ALTER COLUMN path TYPE {_path_type(connection)}")
+
+
+def backfill_department_paths(connection: Connection) -> None:
+    """Recompute every department's ``path``/``depth`` from ``parent_id`` in one statement.
+
+    Departments whose parent does not exist are treated as roots; departments
+    on a ``parent_id`` cycle are not reachable from a root and keep their values.
+    """
+    departments = Department.__table__
+    parent, child = departments.alias("parent"), departments.alias("child")
+    roots = select(
+        departments.c.id,
+        (literal("/") + cast(departments.c.id, String) + "/").label("path"),
+        literal_column("0").label("depth"),
+    ).where(
+        or_(departments.c.parent_id.is_(None), ~exists().where(parent.c.id == departments.c.parent_id))
+    )
+    tree = roots.cte("tree", recursive=True)
+    tree = tree.union_all(
+        select(child.c.id, tree.c.path + cast(child.c.id, String) + "/", tree.c.depth + 1).where(
+            child.c.parent_id == tree.c.id
+        )
+    )
+    connection.execute(
+        update(departments)
+        .where(departments.c.id.in_(select(tree.c.id)))
+        .values(
+            path=select(tree.c.path).where(tree.c.id == departments.c.id).scalar_subquery(),
+            depth=select(tree.c.depth).where(tree.c.id == departments.c.id).scalar_subquery(),
+        )
+    )
+
+
+def install_department_paths(connection: Connection) -> None:
+    """Add and backfill ``path``/``depth`` if the table lacks them, give ``path`` its collation
+    and create ``ix_departments_path`` if missing."""
+    existing = {column["name"] for column in inspect(connection).get_columns("departments")}
+    missing = [name for name in _ADD_COLUMNS if name not in existing]
+    for name in missing:
+        connection.exec_driver_sql(_ADD_COLUMNS[name].format(path_type=_path_type(connection)))
+    if missing:
+        backfill_department_paths(connection)
+    _ensure_path_collation(connection)
+    for index in Department.__table__.indexes:
+        if index.name == "ix_departments_path":
+            index.create(connection, checkfirst=True)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_on_existing_table(target, connection: Connection, **kw) -> None:
+    if inspect(connection).has_table("departments"):
+        install_department_paths(connection)
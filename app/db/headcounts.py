@@ -0,0 +1,48 @@
+"""Full recomputation of the ``headcounts`` summary table.
+
+The table is maintained incrementally (app/services/report_service.py); this
+module fills it from scratch with three GROUP BY queries: when the table is
+first created on a database that already has users (after_create hook), after
+bulk loads that bypass the services (benchmarks/seed.py), or to repair drift.
+"""
+from sqlalchemy import delete, event, func, insert, literal, select
+from sqlalchemy.engine import Connection
+from app.db.base import Base
+from app.models.report import Headcount
+from app.models.role import user_roles
+from app.models.user import User
+
+HEADCOUNT_KINDS = ("organization", "department", "role")
+
+
+def headcount_queries():
+    """(kind, SELECT kind, group_id, is_active, count) for each kind, grouped over the base tables."""
+    by_org = select(literal("organization"), User.organization_id, User.is_active, func.count()).group_by(
+        User.organization_id, User.is_active
+    )
+    by_dept = (
+        select(literal("department"), User.department_id, User.is_active, func.count())
+        .where(User.department_id.is_not(None))
+        .group_by(User.department_id, User.is_active)
+    )
+    by_role = (
+        select(literal("role"), user_roles.c.role_id, User.is_active, func.count())
+        .join(User, User.id == user_roles.c.user_id)
+        .group_by(user_roles.c.role_id, User.is_active)
+    )
+    return zip(HEADCOUNT_KINDS, (by_org, by_dept, by_role))
+
+
+def rebuild_headcounts(connection: Connection) -> None:
+    """Replace every row of ``headcounts`` with counts computed from users and user_roles."""
+    connection.execute(delete(Headcount))
+    columns = ["kind", "group_id", "is_active", "count"]
+    for _, query in headcount_queries():
+        connection.execute(insert(Headcount).from_select(columns, query))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _backfill_new_table(target, connection: Connection, tables=(), **kw) -> None:
+    # Metadata-level, so users and user_roles exist by now; only when create_all created this table.
+    if Headcount.__table__ in tables:
+        rebuild_headcounts(connection)
@@ -0,0 +1,72 @@
+"""Schema preparation at startup (SCHEMA_ON_STARTUP, ``python -m app.serve --schema``).
+
+Modes:
+- create:  ``Base.metadata.create_all`` (development default; inspects every table)
+- check:   fail unless the database is at the Alembic head (read-only, one query)
+- upgrade: ``alembic upgrade head`` on the given engine
+- off:     nothing (the workers of ``python -m app.serve``, whose parent did it once)
+
+Alembic is imported only by the check and upgrade modes; it roughly doubles
+the import time of the app otherwise.
+"""
+from pathlib import Path
+from typing import TYPE_CHECKING
+from sqlalchemy.engine import Engine
+from app.db.base import load_models
+
+if TYPE_CHECKING:
+    from alembic.config import Config
+
+SCHEMA_MODES = ("create", "check", "upgrade", "off")
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class SchemaOutOfDate(RuntimeError):
+    """Raised by the ``check`` mode when the database is not at the Alembic head."""
+
+
+def alembic_config() -> "Config":
+    """alembic.ini with paths resolved from the project root, whatever the working directory."""
+    from alembic.config import Config
+
+    cfg = Config(str(ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(ROOT / "alembic"))
+    return cfg
+
+
+def check_schema(engine: Engine) -> str:
+    """Return the database's revision; raise SchemaOutOfDate unless it is the Alembic head."""
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory.from_config(alembic_config()).get_heads())
+    with engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+    if current != heads:
+        found = ", ".join(sorted(current)) or "no revision"
+        raise SchemaOutOfDate(
+            f"Database is at {found}, expected {', '.join(sorted(heads))}; run `alembic upgrade head`"
+            " (or `alembic stamp head` for a database created by create_all)"
+        )
+    return next(iter(current))
+
+
+def upgrade_schema(engine: Engine) -> None:
+    from alembic import command
+
+    cfg = alembic_config()
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, "head")
+
+
+def prepare_schema(engine: Engine, mode: str) -> None:
+    if mode == "create":
+        load_models().create_all(bind=engine)
+    elif mode == "check":
+        check_schema(engine)
+    elif mode == "upgrade":
+        upgrade_schema(engine)
+    elif mode != "off":
+        raise ValueError(f"Unsupported schema mode: {mode!r} (expected one of {', '.join(SCHEMA_MODES)})")
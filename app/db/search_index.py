@@ -0,0 +1,121 @@
+"""SQLite FTS5 search index over users, departments and organizations.
+
+Two FTS5 tables, kept in sync by triggers so that every write path (ORM,
+Core bulk inserts, raw SQL) updates them:
+
+- ``search_index``: unicode61 tokens with prefix indexes, ranked with bm25.
+  Stores the displayed text plus ``kind``/``ref_id``/``organization_id``.
+- ``search_trigram``: contentless trigram index over the same text, used for
+  substring matches of 3+ characters the token index cannot answer
+  (``"ildong"`` in ``hong.gildong@…``, ``"길동이"`` in ``"홍길동이"``).
+
+Both share one rowid per entity: ``ref_id * 4 + kind code``.
+
+They are created by ``Base.metadata.create_all`` (after_create hook) and backfilled
+from the base tables the first time. Other backends have no index and
+search falls back to LIKE (see app/services/search_service.py).
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from app.db.base import Base
+
+KIND_CODES = {"user": 1, "department": 2, "organization": 3}
+KINDS = {code: kind for kind, code in KIND_CODES.items()}
+
+# kind -> (table, columns whose update re-indexes the row, title, body, organization id);
+# expressions use {t} for the row alias (new/old in triggers, the table in backfills).
+_SOURCES = {
+    "user": ("users", "full_name, email, organization_id", "coalesce({t}.full_name, '')", "{t}.email", "{t}.organization_id"),
+    "department": ("departments", "name, organization_id", "{t}.name", "''", "{t}.organization_id"),
+    "organization": ("organizations", "name", "{t}.name", "''", "{t}.id"),
+}
+
+_CREATE_TABLES = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "title, body, kind UNINDEXED, ref_id UNINDEXED, organization_id UNINDEXED, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3 4 6')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_trigram USING fts5("
+    "title, body, content = '', tokenize = 'trigram')",
+)
+
+
+def _values(kind: str, t: str) -> tuple[str, str, str, str]:
+    """(rowid, title, body, organization id) expressions for row alias ``t``."""
+    _, _, title, body, org = _SOURCES[kind]
+    return f"{t}.id * 4 + {KIND_CODES[kind]}", title.format(t=t), body.format(t=t), org.format(t=t)
+
+
+def _insert_rows(kind: str, t: str, source: str) -> list[str]:
+    """INSERTs indexing ``t``; ``source`` is "VALUES" for one trigger row or "FROM <table>" for a backfill."""
+    rowid, title, body, org = _values(kind, t)
+    index_cols = f"{rowid}, {title}, {body}, '{kind}', {t}.id, {org}"
+    trigram_cols = f"{rowid}, {title}, {body}"
+    if source == "VALUES":
+        index_select, trigram_select = f"VALUES ({index_cols})", f"VALUES ({trigram_cols})"
+    else:
+        index_select, trigram_select = f"SELECT {index_cols} {source}", f"SELECT {trigram_cols} {source}"
+    return [
+        f"INSERT INTO search_index (rowid, title, body, kind, ref_id, organization_id) {index_select}",
+        f"INSERT INTO search_trigram (rowid, title, body) {trigram_select}",
+    ]
+
+
+def _delete_row(kind: str, t: str) -> list[str]:
+    rowid, title, body, _ = _values(kind, t)
+    return [
+        f"DELETE FROM search_index WHERE rowid = {rowid}",
+        # Contentless tables must be told which terms to drop, via the 'delete' command.
+        f"INSERT INTO search_trigram (search_trigram, rowid, title, body) VALUES ('delete', {rowid}, {title}, {body})",
+    ]
+
+
+def _trigger(name: str, event_sql: str, statements: list[str]) -> str:
+    return f"CREATE TRIGGER IF NOT EXISTS {name} {event_sql} BEGIN " + "; ".join(statements) + "; END"
+
+
+def trigger_ddl() -> list[str]:
+    statements = []
+    for kind, (table, watched, *_) in _SOURCES.items():
+        statements += [
+            _trigger(f"{table}_search_ai", f"AFTER INSERT ON {table}", _insert_rows(kind, "new", "VALUES")),
+            _trigger(f"{table}_search_ad", f"AFTER DELETE ON {table}", _delete_row(kind, "old")),
+            _trigger(
+                f"{table}_search_au",
+                f"AFTER UPDATE OF {watched} ON {table}",
+                _delete_row(kind, "old") + _insert_rows(kind, "new", "VALUES"),
+            ),
+        ]
+    return statements
+
+
+def has_search_index(connection: Connection) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+    return connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+    ).first() is not None
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """Repopulate both tables from the base tables (after restores or manual edits)."""
+    connection.exec_driver_sql("DELETE FROM search_index")
+    connection.exec_driver_sql("INSERT INTO search_trigram (search_trigram) VALUES ('delete-all')")
+    for kind, (table, *_) in _SOURCES.items():
+        for statement in _insert_rows(kind, table, f"FROM {table}"):
+            connection.exec_driver_sql(statement)
+
+
+def install_search_index(connection: Connection) -> None:
+    """Create the FTS tables and triggers if missing (SQLite only); backfill when newly created."""
+    if connection.dialect.name != "sqlite":
+        return
+    existed = has_search_index(connection)
+    for statement in (*_CREATE_TABLES, *trigger_ddl()):
+        connection.exec_driver_sql(statement)
+    if not existed:
+        rebuild_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection: Connection, **kw) -> None:
+    install_search_index(connection)
@@ -1,17 +1,169 @@
 """Database engine and session configuration.
 Creates SQLAlchemy engine from settings and provides SessionLocal factory.
+
+- Pool sizing/recycling/pre-ping come from DB_POOL_* settings.
+- SQLite connections get performance PRAGMAs (WAL, synchronous, mmap, cache).
+- Pool checkout/checkin counters are kept per engine (see pool_stats()).
+- Statement count/time is attributed to the current request (app/core/metrics.py).
+
+With DATABASE_ASYNC=true an AsyncEngine/AsyncSessionLocal pair is created as
+well (aiosqlite for SQLite, asyncpg for PostgreSQL). The sync engine is always
+available for startup tasks, Alembic and scripts.
 """
-from sqlalchemy import create_engine
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.metrics import install_sql_timing
+from app.core.sql_debug import install_sql_debug
 
 settings = get_settings()
 
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    # Needed for SQLite when using threads (e.g., FastAPI with uvicorn reload)
-    connect_args = {"check_same_thread": False}
 
-engine = create_engine(settings.DATABASE_URL, echo=settings.SQLALCHEMY_ECHO, connect_args=connect_args)
+class PoolStats:
+    """Counters fed by pool events of one engine."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+        }
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and make_url(url).database in (None, "", ":memory:")
+
+
+def engine_options(url: str, cfg: Settings) -> dict:
+    """Keyword arguments for create_engine/create_async_engine for ``url``."""
+    options: dict = {"echo": cfg.SQLALCHEMY_ECHO}
+    if _is_sqlite(url) and make_url(url).get_driver_name() == "pysqlite":
+        # Needed for SQLite when using threads (e.g., FastAPI with uvicorn reload)
+        options["connect_args"] = {"check_same_thread": False}
+    if not _is_sqlite_memory(url):
+        # In-memory SQLite uses SingletonThreadPool/StaticPool, which take no sizing arguments.
+        options.update(
+            pool_size=cfg.DB_POOL_SIZE,
+            max_overflow=cfg.DB_MAX_OVERFLOW,
+            pool_timeout=cfg.DB_POOL_TIMEOUT,
+            pool_recycle=cfg.DB_POOL_RECYCLE,
+            pool_pre_ping=cfg.DB_POOL_PRE_PING,
+        )
+    return options
+
+
+def install_sqlite_pragmas(engine: Engine, cfg: Settings) -> None:
+    """Apply the SQLITE_* PRAGMAs to every new DBAPI connection of ``engine``."""
+    pragmas = [
+        f"PRAGMA journal_mode={cfg.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={cfg.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={int(cfg.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA cache_size={int(cfg.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA busy_timeout={int(cfg.SQLITE_BUSY_TIMEOUT_MS)}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+# Pool counters per engine, keyed by (sync) engine
+POOL_STATS: dict[Engine, PoolStats] = {}
+
+
+def _instrument(sync_engine: Engine, url: str, cfg: Settings) -> None:
+    if _is_sqlite(url):
+        install_sqlite_pragmas(sync_engine, cfg)
+    POOL_STATS[sync_engine] = PoolStats()
+    POOL_STATS[sync_engine].install(sync_engine)
+    install_sql_timing(sync_engine)
+    if cfg.SQL_DEBUG:
+        install_sql_debug(sync_engine)
+
+
+def create_db_engine(url: str, cfg: Settings | None = None) -> Engine:
+    """Create the sync engine with pool settings, SQLite PRAGMAs and pool counters."""
+    cfg = cfg or settings
+    db_engine = create_engine(url, **engine_options(url, cfg))
+    _instrument(db_engine, url, cfg)
+    return db_engine
+
+engine = create_db_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async driver for each sync backend name
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL to the matching async driver (sqlite -> aiosqlite, postgresql -> asyncpg)."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()!r}; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _async_url = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url, settings))
+    _instrument(async_engine.sync_engine, _async_url, settings)
+    # expire_on_commit=False: attributes must stay loaded after commit because
+    # response serialization cannot lazy-load outside the async session.
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def pool_stats() -> dict[str, dict]:
+    """Checkout counters and pool status for the app's engines."""
+    stats = {"sync": {**POOL_STATS[engine].as_dict(), "status": engine.pool.status()}}
+    if async_engine is not None:
+        sync_side = async_engine.sync_engine
+        stats["async"] = {**POOL_STATS[sync_side].as_dict(), "status": sync_side.pool.status()}
+    return stats
@@ -7,34 +7,37 @@ FastAPI ERP Skeleton
 
 실행 예시 (개발용):
     uv run uvicorn app.main:app --reload
+실행 예시 (운영용, 다중 워커):
+    python -m app.serve --workers 4
 
 환경 변수:
     DATABASE_URL: 기본값 sqlite:///./erp.db (개발용)
     SQLALCHEMY_ECHO: true/false (SQL 로깅)
+    DATABASE_ASYNC: true/false (AsyncEngine/AsyncSession 사용)
+    SQL_DEBUG: true/false (느린 쿼리 로그, N+1 감지)
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
-from app.db.base import Base
-from app.db.session import engine
-from app.routes.organization import router as org_router
-from app.routes.users import router as user_router
-from app.routes.roles import router as role_router
+from app.core.metrics import MetricsMiddleware
+from app.core.passwords import shutdown_pool
+from app.core.sql_debug import SqlDebugMiddleware
+from app.db.base import load_models, load_session_hooks
+from app.db.schema import prepare_schema
+from app.db.session import SessionLocal, async_engine, engine
+from app.modules import enabled_modules, include_modules, openapi_tags
 
 settings = get_settings()
+modules = enabled_modules(settings.ENABLED_MODULES)
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description=settings.APP_DESCRIPTION,
-    openapi_tags=[
-        {"name": "Organizations", "description": "조직/부서 관리"},
-        {"name": "Users", "description": "사용자(직원) 관리"},
-        {"name": "Roles", "description": "권한(역할) 관리"},
-        {"name": "Finance", "description": "회계/재무 관리 (추후)"},
-        {"name": "Assets", "description": "자산/구매/재고 관리 (추후)"},
-    ],
+    openapi_tags=openapi_tags(modules),
 )
 
 # CORS (필요 시 도메인을 설정하세요)
@@ -44,15 +47,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
 
+# 느린 쿼리 로그 / N+1 감지 (개발·테스트용)
+if settings.SQL_DEBUG:
+    app.add_middleware(SqlDebugMiddleware)
+
+# 응답 압축(gzip/br). 크기 기준 미만이거나 이미 인코딩된 응답은 그대로 보냅니다.
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# 요청별 지연시간/SQL 통계 (Server-Timing 헤더, GET /metrics). 마지막에 추가해 가장 바깥에서 측정합니다.
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
 
 @app.on_event("startup")
-def on_startup() -> None:
-    """개발 초기 단계에서는 자동으로 테이블을 생성합니다.
-    운영 단계에서는 Alembic 마이그레이션을 사용하세요.
+async def on_startup() -> None:
+    """SCHEMA_ON_STARTUP 에 따라 스키마를 준비합니다(기본값 create: 테이블 자동 생성, 개발용).
+    운영 단계에서는 Alembic 마이그레이션을 사용하고 python -m app.serve 로 실행하세요.
+    WARMUP_ON_STARTUP 이면 요청을 받기 전에 DB 풀/해시 프로세스/캐시를 미리 준비합니다.
     """
-    Base.metadata.create_all(bind=engine)
+    prepare_schema(engine, settings.SCHEMA_ON_STARTUP)
+    if settings.WARMUP_ON_STARTUP:
+        from app.services.warmup import warm_async_pool, warm_up  # loads the services it warms
+
+        with SessionLocal() as db:
+            await run_in_threadpool(warm_up, engine, db)
+        if async_engine is not None:
+            await warm_async_pool(async_engine)
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    """대기 중인 감사 로그를 기록하고 비밀번호 해시 프로세스 풀을 정리합니다."""
+    from app.services.audit_service import shutdown_audit  # already loaded by load_session_hooks
+
+    shutdown_audit()
+    shutdown_pool()
 
 
 @app.get("/")
@@ -60,10 +98,11 @@ def root():
     return {"message": "ERP Backend is running", "version": settings.APP_VERSION}
 
 
-# 라우터 등록
-app.include_router(org_router)
-app.include_router(user_router)
-app.include_router(role_router)
+# 라우터 등록: ENABLED_MODULES 의 라우터만 import 합니다(app/modules.py).
+# 모델과 세션 훅(권한 캐시 무효화, 인원 현황, 감사 로그)은 모듈 선택과 무관하게 모두 불러옵니다.
+load_models()
+load_session_hooks()
+include_modules(app, modules)
 
 # 정적 프론트엔드 제공 (/frontend)
 app.mount("/frontend", StaticFiles(directory="frontend", html=True), name="frontend")
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import JSON, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class AuditEvent(Base):
+    """One recorded change to a user, organization or role.
+
+    ``changes`` holds the written values of the audited fields: every field on
+    create, the fields that changed on update, the last known values on delete
+    and ``{"role_id": ...}`` for role_added/role_removed on a user. Rows are
+    appended by app/services/audit_service.py and never updated.
+    """
+
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        # History of one entity, newest first (GET /audit?entity=user&entity_id=...)
+        Index("ix_audit_events_entity_id", "entity", "entity_id", "id"),
+        # Time windows (since/until)
+        Index("ix_audit_events_occurred_at", "occurred_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    entity: Mapped[str] = mapped_column(String(32), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    action: Mapped[str] = mapped_column(String(32), nullable=False)
+    changes: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
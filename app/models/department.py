@@ -3,10 +3,19 @@ from sqlalchemy import String, Integer, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
+# Byte-order comparison of paths on every backend (see Department).
+PATH_TYPE = String(1024).with_variant(String(1024, collation="C"), "postgresql")
+
 
 class Department(Base):
     """Department entity belonging to an Organization.
     Supports hierarchical parent-child relationships (e.g., divisions/teams).
+
+    ``path`` materializes the ancestry as ``/<root id>/.../<own id>/`` so a whole
+    subtree is one indexed range scan. It is maintained by
+    app/services/department_service.py on create and move. The range relies on
+    byte order: SQLite compares text that way (BINARY), PostgreSQL is told to
+    with ``COLLATE "C"`` (locale collations ignore or reorder ``/``).
     """
 
     __tablename__ = "departments"
@@ -15,7 +24,9 @@ class Department(Base):
     name: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
 
     organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), index=True)
-    parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey("departments.id"), nullable=True)
+    parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey("departments.id"), nullable=True, index=True)
+    path: Mapped[str] = mapped_column(PATH_TYPE, nullable=False, default="", index=True)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     # Relationships
     organization: Mapped["Organization"] = relationship(back_populates="departments")
@@ -0,0 +1,20 @@
+from sqlalchemy import Boolean, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class Headcount(Base):
+    """Number of users per group and active state, kept current on every write.
+
+    ``kind`` is organization, department or role, and ``group_id`` the id of that
+    organization/department/role. Department rows count the department's own
+    members; subtree totals are summed from them at read time. Maintained by
+    app/services/report_service.py, rebuilt by app/db/headcounts.py.
+    """
+
+    __tablename__ = "headcounts"
+
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)
+    group_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
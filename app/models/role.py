@@ -1,5 +1,5 @@
 from typing import List
-from sqlalchemy import String, Integer, Table, Column, ForeignKey
+from sqlalchemy import JSON, Boolean, String, Integer, Table, Column, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -9,6 +9,8 @@ user_roles = Table(
     Base.metadata,
     Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
     Column("role_id", ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
+    # The primary key covers user -> roles; this covers role -> users.
+    Index("ix_user_roles_role_id", "role_id"),
 )
 
 
@@ -20,10 +22,27 @@ class Role(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, index=True)
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Names from app.core.permissions.PERMISSIONS
+    permissions: Mapped[List[str]] = mapped_column(JSON, nullable=False, default=list, server_default=text("'[]'"))
 
     users: Mapped[List["User"]] = relationship(
         secondary=user_roles, back_populates="roles", passive_deletes=True
     )
 
 
+class DepartmentRole(Base):
+    """Role granted to every member of a department.
+
+    With ``include_subdepartments`` the grant also covers members of all
+    descendant departments.
+    """
+
+    __tablename__ = "department_roles"
+    __table_args__ = (Index("ix_department_roles_role_id", "role_id"),)
+
+    department_id: Mapped[int] = mapped_column(ForeignKey("departments.id", ondelete="CASCADE"), primary_key=True)
+    role_id: Mapped[int] = mapped_column(ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True)
+    include_subdepartments: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+
+
 # Note: Relationships use string-based references to avoid circular imports.
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import String, Integer, ForeignKey, Boolean, DateTime
+from sqlalchemy import String, Integer, ForeignKey, Boolean, DateTime, Index, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 from app.models.role import user_roles
@@ -15,6 +15,12 @@ class User(Base):
     """User (employee) entity with organization, department, and roles."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # List filters: organization [+ active state] in id order; the leading
+        # column also serves plain organization lookups.
+        Index("ix_users_org_active_id", "organization_id", "is_active", "id"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
@@ -22,8 +28,8 @@ class User(Base):
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
-    organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id"), index=True)
-    department_id: Mapped[Optional[int]] = mapped_column(ForeignKey("departments.id"), nullable=True)
+    organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id"))
+    department_id: Mapped[Optional[int]] = mapped_column(ForeignKey("departments.id"), nullable=True, index=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
@@ -36,3 +42,11 @@ class User(Base):
     roles: Mapped[List["Role"]] = relationship(
         secondary=user_roles, back_populates="users", passive_deletes=True
     )
+
+
+@event.listens_for(User.roles, "append")
+@event.listens_for(User.roles, "remove")
+def _touch_on_role_change(target: User, value, initiator) -> None:
+    # Roles are part of the user's representation (UserRead.roles), so their
+    # changes count as modifications for ETag / Last-Modified.
+    target.updated_at = datetime.utcnow()
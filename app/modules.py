@@ -0,0 +1,132 @@
+"""Domain modules the app is assembled from.
+
+A module names its routers (``"package.module:attribute"``) and model modules
+by import path, so nothing of it is imported until it is used:
+
+- routers of the modules in ENABLED_MODULES are imported when the app is
+  built (``include_modules``); the others are never imported;
+- model modules of every module are imported by ``app.db.base.load_models``
+  when the complete schema is needed (startup schema step, Alembic, tests),
+  since the schema spans all modules whichever routes a process serves;
+- hook modules of every module (Session event listeners that keep caches,
+  summary tables and the audit log in step with writes) are imported by
+  ``app.db.base.load_session_hooks`` when the app is built: a write made by
+  any module's routes must fire them, whether or not the module owning them
+  serves routes in this process.
+
+New domains (Finance, Assets, ...) add a ``register(DomainModule(...))`` call
+here instead of imports in app/main.py and app/db/base.py.
+"""
+import importlib
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+
+class DomainModule(NamedTuple):
+    name: str
+    # OpenAPI tag shown in /docs
+    tag: dict[str, str]
+    # "package.module:router" paths, included in this order
+    routers: tuple[str, ...] = ()
+    # Modules declaring tables (or metadata events) on Base.metadata
+    models: tuple[str, ...] = ()
+    # Modules registering Session event listeners, loaded whatever ENABLED_MODULES says
+    hooks: tuple[str, ...] = ()
+
+
+# Registered modules in documentation order
+MODULES: dict[str, DomainModule] = {}
+
+
+def register(module: DomainModule) -> DomainModule:
+    MODULES[module.name] = module
+    return module
+
+
+register(DomainModule(
+    "organizations",
+    {"name": "Organizations", "description": "조직/부서 관리"},
+    routers=("app.routes.organization:router", "app.routes.departments:router"),
+    # department_paths adds path/depth to departments tables created before them
+    models=("app.models.organization", "app.models.department", "app.db.department_paths"),
+))
+register(DomainModule(
+    "users",
+    {"name": "Users", "description": "사용자(직원) 관리"},
+    routers=("app.routes.users:router",),
+    models=("app.models.user",),
+))
+register(DomainModule(
+    "roles",
+    {"name": "Roles", "description": "권한(역할) 관리"},
+    routers=("app.routes.roles:router",),
+    models=("app.models.role",),
+    hooks=("app.services.permission_service",),  # permission cache invalidation
+))
+register(DomainModule(
+    "auth",
+    {"name": "Auth", "description": "로그인(비밀번호 확인)"},
+    routers=("app.routes.auth:router",),
+))
+register(DomainModule(
+    "search",
+    {"name": "Search", "description": "사용자/부서/조직 통합 검색"},
+    routers=("app.routes.search:router",),
+    models=("app.db.search_index",),  # FTS5 tables/triggers, created with the schema
+))
+register(DomainModule(
+    "reports",
+    {"name": "Reports", "description": "인원 현황 보고서"},
+    routers=("app.routes.reports:router",),
+    models=("app.models.report", "app.db.headcounts"),  # headcounts is backfilled when it is created
+    hooks=("app.services.report_service",),  # headcount deltas of unit-of-work changes
+))
+register(DomainModule(
+    "audit",
+    {"name": "Audit", "description": "변경 이력(감사 로그)"},
+    routers=("app.routes.audit:router",),
+    models=("app.models.audit",),
+    hooks=("app.services.audit_service",),  # collects and hands over audit records
+))
+register(DomainModule("finance", {"name": "Finance", "description": "회계/재무 관리 (추후)"}))
+register(DomainModule("assets", {"name": "Assets", "description": "자산/구매/재고 관리 (추후)"}))
+register(DomainModule(
+    "operations",
+    {"name": "Operations", "description": "운영/모니터링"},
+    routers=("app.routes.ops:router",),
+))
+
+
+def enabled_modules(names: str | Iterable[str] = "") -> list[DomainModule]:
+    """Modules selected by a comma-separated list (ENABLED_MODULES); all when empty."""
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(",") if name.strip()]
+    names = list(names)
+    unknown = [name for name in names if name not in MODULES]
+    if unknown:
+        raise ValueError(f"Unknown modules: {', '.join(unknown)} (registered: {', '.join(MODULES)})")
+    return [module for name, module in MODULES.items() if not names or name in names]
+
+
+def _import(path: str) -> Any:
+    module, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def openapi_tags(modules: Iterable[DomainModule]) -> list[dict[str, str]]:
+    return [module.tag for module in modules]
+
+
+def include_modules(app, modules: Iterable[DomainModule]) -> None:
+    """Import the modules' routers and add them to ``app``."""
+    for module in modules:
+        for path in module.routers:
+            app.include_router(_import(path))
+
+
+def model_modules() -> list[str]:
+    return [path for module in MODULES.values() for path in module.models]
+
+
+def hook_modules() -> list[str]:
+    return [path for module in MODULES.values() for path in module.hooks]
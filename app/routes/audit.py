@@ -0,0 +1,32 @@
+"""Audit log API route."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.api.deps import AnySession, get_session, run_db
+from app.api.responses import adapter_response
+from app.core.metrics import InstrumentedRoute
+from app.schemas.audit import AuditEventRead, AuditFilters
+from app.services.audit_service import AUDIT_LIST_ADAPTER, InvalidAuditFilter, list_audit_events
+from app.services.pagination import InvalidCursor
+
+router = APIRouter(prefix="/audit", tags=["Audit"], route_class=InstrumentedRoute)
+
+
+@router.get("", response_model=list[AuditEventRead])
+async def list_audit_ep(
+    limit: int = Query(100, ge=1, le=1000),
+    after: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    filters: AuditFilters = Depends(),
+    db: AnySession = Depends(get_session),
+):
+    """Recorded changes, newest first.
+
+    With AUDIT_MODE=behind events appear shortly after the commit that made
+    them (once the background writer has flushed its batch).
+    """
+    try:
+        page = await run_db(db, list_audit_events, filters, limit=limit, after=after)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except InvalidAuditFilter as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+    return adapter_response(AUDIT_LIST_ADAPTER, page.items, headers=headers)
@@ -0,0 +1,27 @@
+"""Authentication API route."""
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.api.deps import AnySession, get_session, run_db
+from app.core.metrics import InstrumentedRoute
+from app.core.passwords import averify_password
+from app.schemas.user import UserLogin, UserRead
+from app.services.user_service import get_credentials, get_user, replace_password_hash
+
+router = APIRouter(prefix="/auth", tags=["Auth"], route_class=InstrumentedRoute)
+
+
+@router.post("/login", response_model=UserRead)
+async def login_ep(payload: UserLogin, db: AnySession = Depends(get_session)):
+    """Check an email/password pair and return the user.
+
+    A stored hash in an outdated format or with outdated parameters is replaced
+    by a fresh one on success. Hashing runs in the password process pool.
+    """
+    credentials = await run_db(db, get_credentials, payload.email)
+    valid, new_hash = await averify_password(
+        payload.password, credentials.hashed_password if credentials is not None else None
+    )
+    if not valid or not credentials.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+    if new_hash is not None:
+        await run_db(db, replace_password_hash, credentials.id, credentials.hashed_password, new_hash)
+    return await run_db(db, get_user, credentials.id)
@@ -0,0 +1,115 @@
+"""Department API routes.
+Provides CRUD endpoints for departments and subtree queries over the hierarchy.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from app.api.deps import AnySession, get_session, run_db
+from app.core.metrics import InstrumentedRoute
+from app.schemas.organization import DepartmentCreate, DepartmentRead, DepartmentUpdate
+from app.schemas.role import DepartmentRoleGrant
+from app.schemas.user import UserRead
+from app.services.department_service import (
+    HierarchyError,
+    create_department,
+    get_department,
+    update_department,
+    delete_department,
+    list_descendants,
+    list_subtree_users,
+)
+from app.services.organization_service import get_organization_read
+from app.services.pagination import InvalidCursor
+from app.services.permission_service import GrantError, grant_department_role, revoke_department_role
+
+router = APIRouter(prefix="/departments", tags=["Organizations"], route_class=InstrumentedRoute)
+
+
+@router.post("/", response_model=DepartmentRead, status_code=status.HTTP_201_CREATED)
+async def create_department_ep(payload: DepartmentCreate, db: AnySession = Depends(get_session)):
+    if not await run_db(db, get_organization_read, payload.organization_id):
+        raise HTTPException(status_code=404, detail="Organization not found")
+    try:
+        return await run_db(db, create_department, payload)
+    except HierarchyError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/{dept_id}", response_model=DepartmentRead)
+async def get_department_ep(dept_id: int, db: AnySession = Depends(get_session)):
+    dept = await run_db(db, get_department, dept_id)
+    if not dept:
+        raise HTTPException(status_code=404, detail="Department not found")
+    return dept
+
+
+@router.put("/{dept_id}", response_model=DepartmentRead)
+async def update_department_ep(dept_id: int, payload: DepartmentUpdate, db: AnySession = Depends(get_session)):
+    dept = await run_db(db, get_department, dept_id)
+    if not dept:
+        raise HTTPException(status_code=404, detail="Department not found")
+    try:
+        return await run_db(db, update_department, dept, payload)
+    except HierarchyError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.delete("/{dept_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_department_ep(dept_id: int, db: AnySession = Depends(get_session)):
+    dept = await run_db(db, get_department, dept_id)
+    if not dept:
+        raise HTTPException(status_code=404, detail="Department not found")
+    try:
+        await run_db(db, delete_department, dept)
+    except HierarchyError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return None
+
+
+@router.get("/{dept_id}/descendants", response_model=list[DepartmentRead])
+async def list_descendants_ep(dept_id: int, include_self: bool = False, db: AnySession = Depends(get_session)):
+    dept = await run_db(db, get_department, dept_id)
+    if not dept:
+        raise HTTPException(status_code=404, detail="Department not found")
+    return await run_db(db, list_descendants, dept, include_self=include_self)
+
+
+@router.get("/{dept_id}/users", response_model=list[UserRead])
+async def list_subtree_users_ep(
+    dept_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = Query(None, description="Opaque cursor from X-Next-Cursor; takes precedence over skip"),
+    db: AnySession = Depends(get_session),
+):
+    """Users of this department and every department below it."""
+    dept = await run_db(db, get_department, dept_id)
+    if not dept:
+        raise HTTPException(status_code=404, detail="Department not found")
+    try:
+        page = await run_db(db, list_subtree_users, dept, skip=skip, limit=limit, after=after)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+
+@router.put("/{dept_id}/roles/{role_id}", response_model=DepartmentRoleGrant)
+async def grant_department_role_ep(
+    dept_id: int,
+    role_id: int,
+    include_subdepartments: bool = Query(True, description="Also grant the role to members of sub-departments"),
+    db: AnySession = Depends(get_session),
+):
+    """Grant a role to every member of the department (and, by default, of its sub-departments)."""
+    try:
+        return await run_db(db, grant_department_role, dept_id, role_id, include_subdepartments)
+    except GrantError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+@router.delete("/{dept_id}/roles/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_department_role_ep(dept_id: int, role_id: int, db: AnySession = Depends(get_session)):
+    if not await run_db(db, revoke_department_role, dept_id, role_id):
+        raise HTTPException(status_code=404, detail="Grant not found")
+    return None
@@ -0,0 +1,43 @@
+"""Operational API routes (metrics, cache and connection pool statistics)."""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.cache import cache_stats
+from app.core.metrics import InstrumentedRoute, render_prometheus
+from app.db.session import pool_stats
+from app.services.audit_service import audit_stats
+
+router = APIRouter(tags=["Operations"], route_class=InstrumentedRoute)
+
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    """Hit/miss counters per cache namespace (this worker process) and backend entry count."""
+    return cache_stats()
+
+
+@router.get("/db/pool/stats")
+def get_pool_stats():
+    """Connection pool checkout counters and pool status (this worker process)."""
+    return pool_stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus text exposition: per-route latency/SQL histograms, pool, cache and audit writer counters (this worker)."""
+    pools = pool_stats()
+    namespaces = cache_stats()["namespaces"]
+    audit = audit_stats()
+    body = render_prometheus(
+        [
+            ("db_pool_checked_out", "gauge", [({"engine": k}, v["checked_out"]) for k, v in pools.items()]),
+            ("db_pool_checkouts_total", "counter", [({"engine": k}, v["checkouts"]) for k, v in pools.items()]),
+            ("db_pool_connects_total", "counter", [({"engine": k}, v["connects"]) for k, v in pools.items()]),
+            ("cache_hits_total", "counter", [({"namespace": k}, v["hits"]) for k, v in namespaces.items()]),
+            ("cache_misses_total", "counter", [({"namespace": k}, v["misses"]) for k, v in namespaces.items()]),
+            ("audit_records_pending", "gauge", [({}, audit.get("pending", 0))]),
+            ("audit_records_written_total", "counter", [({}, audit.get("written", 0))]),
+            ("audit_records_inline_total", "counter", [({}, audit.get("inline", 0))]),
+            ("audit_records_lost_total", "counter", [({}, audit.get("lost", 0))]),
+        ]
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -1,73 +1,185 @@
 """Organization API routes.
-Provides CRUD endpoints for organizations (and simple department listing later).
+Provides CRUD endpoints for organizations and the nested department tree.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.api.deps import get_db
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from app.api.deps import AnySession, batch_ids, check_batch_ids, get_session, run_db, sparse_fields
+from app.api.conditional import is_not_modified, make_etag, not_modified, validator_headers
+from app.api.responses import FastJSONResponse, adapter_response, export_response, model_response
+from app.core.metrics import InstrumentedRoute
+from app.services.fieldsets import Fields, sparse_adapter
+from app.services.pagination import InvalidCursor
+from app.services.writes import ConstraintViolation
+from app.schemas.common import BatchIds, BatchRead
 from app.schemas.organization import (
+    DepartmentTree,
     OrganizationCreate,
+    OrganizationListFilters,
     OrganizationRead,
     OrganizationUpdate,
     OrganizationWithRelations,
 )
+from app.services.department_service import get_department_tree
 from app.services.organization_service import (
+    ORGANIZATION_LIST_ADAPTER,
     create_organization,
+    export_organizations_stmt,
     get_organization,
+    get_organization_detail_fields,
+    get_organization_read,
+    get_organizations_read,
     get_organization_with_relations,
-    list_organizations,
-    get_organization_by_name,
+    list_organizations_read,
     update_organization,
     delete_organization,
 )
 
-router = APIRouter(prefix="/organizations", tags=["Organizations"])
+router = APIRouter(prefix="/organizations", tags=["Organizations"], route_class=InstrumentedRoute)
 
 
 @router.post("/", response_model=OrganizationRead, status_code=status.HTTP_201_CREATED)
-def create_org(payload: OrganizationCreate, db: Session = Depends(get_db)):
-    # Ensure unique name
-    existing = get_organization_by_name(db, payload.name)
-    if existing:
-        raise HTTPException(status_code=400, detail="Organization name already exists")
-    org = create_organization(db, payload)
-    return org
+async def create_org(payload: OrganizationCreate, db: AnySession = Depends(get_session)):
+    try:
+        return await run_db(db, create_organization, payload)
+    except ConstraintViolation as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/", response_model=list[OrganizationRead], response_class=FastJSONResponse)
+async def list_orgs(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = Query(None, description="Opaque cursor from X-Next-Cursor; takes precedence over skip"),
+    order_by: Literal["id", "-id", "name", "-name", "created_at", "-created_at"] = "id",
+    filters: OrganizationListFilters = Depends(),
+    fields: Fields | None = Depends(sparse_fields(OrganizationRead)),
+    db: AnySession = Depends(get_session),
+):
+    """List organizations matching every given filter; a leading ``-`` in ``order_by`` sorts descending.
+
+    Pages come from the organization cache, so the ETag is derived from the
+    cached rows and a 304 costs no query at all while the cache is warm.
+    ``fields`` narrows both the SELECT and the items; each selection is cached apart.
+    """
+    try:
+        page = await run_db(
+            db,
+            list_organizations_read,
+            skip=skip,
+            limit=limit,
+            after=after,
+            order_by=order_by,
+            filters=filters,
+            fields=fields,
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    etag = make_etag("organizations", request.url.query, page.version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    headers = validator_headers(etag)
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    adapter = ORGANIZATION_LIST_ADAPTER if fields is None else sparse_adapter(OrganizationRead, fields)
+    return adapter_response(adapter, page.items, headers=headers)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_orgs(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: AnySession = Depends(get_session),
+):
+    """Stream every organization as NDJSON or CSV, in id order."""
+    return export_response(db, export_organizations_stmt(), fmt, "organizations")
+
+
+@router.get("/batch", response_model=BatchRead[OrganizationRead])
+async def get_orgs_batch(ids: list[int] = Depends(batch_ids), db: AnySession = Depends(get_session)):
+    """Organizations by id in one call, in request order; unknown ids are listed in ``missing``."""
+    return await _orgs_batch(db, ids)
+
 
+@router.post("/batch", response_model=BatchRead[OrganizationRead])
+async def post_orgs_batch(payload: BatchIds, db: AnySession = Depends(get_session)):
+    """Same as GET /organizations/batch, for id lists too long for a query string."""
+    return await _orgs_batch(db, check_batch_ids(payload.ids))
 
-@router.get("/", response_model=list[OrganizationRead])
-def list_orgs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return list_organizations(db, skip=skip, limit=limit)
+
+async def _orgs_batch(db: AnySession, ids: list[int]):
+    items, missing = await run_db(db, get_organizations_read, ids)
+    return model_response(BatchRead[OrganizationRead](items=items, missing=missing))
 
 
 @router.get("/{org_id}", response_model=OrganizationRead)
-def get_org(org_id: int, db: Session = Depends(get_db)):
-    org = get_organization(db, org_id)
+async def get_org(org_id: int, request: Request, response: Response, db: AnySession = Depends(get_session)):
+    org = await run_db(db, get_organization_read, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
+    etag = make_etag("organization", org_id, org.updated_at)
+    if is_not_modified(request, etag, org.updated_at):
+        return not_modified(etag, org.updated_at)
+    response.headers.update(validator_headers(etag, org.updated_at))
     return org
 
 
 @router.put("/{org_id}", response_model=OrganizationRead)
-def update_org(org_id: int, payload: OrganizationUpdate, db: Session = Depends(get_db)):
-    org = get_organization(db, org_id)
+async def update_org(org_id: int, payload: OrganizationUpdate, db: AnySession = Depends(get_session)):
+    """Update the given fields; null/omitted fields keep their value."""
+    return await _update_org(db, org_id, payload, partial=False)
+
+
+@router.patch("/{org_id}", response_model=OrganizationRead)
+async def patch_org(org_id: int, payload: OrganizationUpdate, db: AnySession = Depends(get_session)):
+    """Write exactly the fields sent (an explicit null clears ``description``) in one UPDATE."""
+    return await _update_org(db, org_id, payload, partial=True)
+
+
+async def _update_org(db: AnySession, org_id: int, payload: OrganizationUpdate, partial: bool) -> OrganizationRead:
+    try:
+        org = await run_db(db, update_organization, org_id, payload, partial)
+    except ConstraintViolation as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
-    org = update_organization(db, org, payload)
     return org
 
 
 @router.delete("/{org_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_org(org_id: int, db: Session = Depends(get_db)):
-    org = get_organization(db, org_id)
+async def delete_org(org_id: int, db: AnySession = Depends(get_session)):
+    org = await run_db(db, get_organization, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
-    delete_organization(db, org)
+    await run_db(db, delete_organization, org)
     return None
 
 
-
 @router.get("/{org_id}/detail", response_model=OrganizationWithRelations)
-def get_org_detail(org_id: int, db: Session = Depends(get_db)):
-    org = get_organization_with_relations(db, org_id)
+async def get_org_detail(
+    org_id: int,
+    fields: Fields | None = Depends(sparse_fields(OrganizationWithRelations)),
+    db: AnySession = Depends(get_session),
+):
+    """Organization with all its departments; ``fields`` (e.g. ``name,departments.name``) narrows both queries."""
+    if fields is not None:
+        org = await run_db(db, get_organization_detail_fields, org_id, fields)
+        if not org:
+            raise HTTPException(status_code=404, detail="Organization not found")
+        return model_response(org)
+    org = await run_db(db, get_organization_with_relations, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
     return org
+
+
+@router.get("/{org_id}/departments/tree", response_model=list[DepartmentTree])
+async def get_org_department_tree(org_id: int, db: AnySession = Depends(get_session)):
+    """Whole department hierarchy of the organization, nested, loaded with a single query."""
+    if not await run_db(db, get_organization_read, org_id):
+        raise HTTPException(status_code=404, detail="Organization not found")
+    return await run_db(db, get_department_tree, org_id)
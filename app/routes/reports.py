@@ -0,0 +1,33 @@
+"""Report API routes."""
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.api.deps import AnySession, get_session, run_db
+from app.core.metrics import InstrumentedRoute
+from app.schemas.report import DepartmentHeadcount, HeadcountRow
+from app.services.organization_service import get_organization_read
+from app.services.report_service import department_headcounts, organization_headcounts, role_headcounts
+
+router = APIRouter(prefix="/reports", tags=["Reports"], route_class=InstrumentedRoute)
+
+HeadcountSource = Literal["summary", "live"]
+_SOURCE = Query("summary", description="summary: maintained counts table; live: GROUP BY over users (slower)")
+
+
+@router.get("/headcount/organizations", response_model=list[HeadcountRow])
+async def organization_headcount(source: HeadcountSource = _SOURCE, db: AnySession = Depends(get_session)):
+    """Active/inactive users per organization."""
+    return await run_db(db, organization_headcounts, live=source == "live")
+
+
+@router.get("/headcount/roles", response_model=list[HeadcountRow])
+async def role_headcount(source: HeadcountSource = _SOURCE, db: AnySession = Depends(get_session)):
+    """Active/inactive holders per role (direct assignments)."""
+    return await run_db(db, role_headcounts, live=source == "live")
+
+
+@router.get("/headcount/organizations/{org_id}/departments", response_model=list[DepartmentHeadcount])
+async def department_headcount(org_id: int, source: HeadcountSource = _SOURCE, db: AnySession = Depends(get_session)):
+    """Active/inactive users per department of an organization, rolled up over sub-departments."""
+    if not await run_db(db, get_organization_read, org_id):
+        raise HTTPException(status_code=404, detail="Organization not found")
+    return await run_db(db, department_headcounts, org_id, live=source == "live")
@@ -1,57 +1,134 @@
 """Role API routes.
 Provides CRUD endpoints for roles.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.api.deps import get_db
-from app.schemas.role import RoleCreate, RoleRead, RoleUpdate
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from app.api.deps import AnySession, batch_ids, check_batch_ids, get_session, run_db
+from app.api.responses import model_response
+from app.core.metrics import InstrumentedRoute
+from app.services.pagination import InvalidCursor
+from app.services.writes import ConstraintViolation
+from app.schemas.common import BatchIds, BatchRead
+from app.schemas.role import RoleCreate, RoleMembersChange, RoleMembersResult, RoleRead, RoleUpdate
 from app.services.role_service import (
+    MembershipError,
+    add_role_members,
+    remove_role_members,
     create_role,
     get_role,
-    list_roles,
-    get_role_by_name,
+    get_role_read,
+    get_roles_read,
+    list_roles_read,
     update_role,
     delete_role,
 )
 
-router = APIRouter(prefix="/roles", tags=["Roles"])
+router = APIRouter(prefix="/roles", tags=["Roles"], route_class=InstrumentedRoute)
 
 
 @router.post("/", response_model=RoleRead, status_code=status.HTTP_201_CREATED)
-def create_role_ep(payload: RoleCreate, db: Session = Depends(get_db)):
-    existing = get_role_by_name(db, payload.name)
-    if existing:
-        raise HTTPException(status_code=400, detail="Role name already exists")
-    role = create_role(db, payload)
-    return role
+async def create_role_ep(payload: RoleCreate, db: AnySession = Depends(get_session)):
+    try:
+        return await run_db(db, create_role, payload)
+    except ConstraintViolation as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 @router.get("/", response_model=list[RoleRead])
-def list_roles_ep(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return list_roles(db, skip=skip, limit=limit)
+async def list_roles_ep(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = Query(None, description="Opaque cursor from X-Next-Cursor; takes precedence over skip"),
+    order_by: Literal["id", "name"] = "id",
+    db: AnySession = Depends(get_session),
+):
+    try:
+        page = await run_db(db, list_roles_read, skip=skip, limit=limit, after=after, order_by=order_by)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+
+@router.get("/batch", response_model=BatchRead[RoleRead])
+async def get_roles_batch(ids: list[int] = Depends(batch_ids), db: AnySession = Depends(get_session)):
+    """Roles by id in one call, in request order; unknown ids are listed in ``missing``."""
+    return await _roles_batch(db, ids)
+
+
+@router.post("/batch", response_model=BatchRead[RoleRead])
+async def post_roles_batch(payload: BatchIds, db: AnySession = Depends(get_session)):
+    """Same as GET /roles/batch, for id lists too long for a query string."""
+    return await _roles_batch(db, check_batch_ids(payload.ids))
+
+
+async def _roles_batch(db: AnySession, ids: list[int]):
+    items, missing = await run_db(db, get_roles_read, ids)
+    return model_response(BatchRead[RoleRead](items=items, missing=missing))
 
 
 @router.get("/{role_id}", response_model=RoleRead)
-def get_role_ep(role_id: int, db: Session = Depends(get_db)):
-    role = get_role(db, role_id)
+async def get_role_ep(role_id: int, db: AnySession = Depends(get_session)):
+    role = await run_db(db, get_role_read, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
     return role
 
 
 @router.put("/{role_id}", response_model=RoleRead)
-def update_role_ep(role_id: int, payload: RoleUpdate, db: Session = Depends(get_db)):
-    role = get_role(db, role_id)
+async def update_role_ep(role_id: int, payload: RoleUpdate, db: AnySession = Depends(get_session)):
+    """Update the given fields; null/omitted fields keep their value."""
+    return await _update_role(db, role_id, payload, partial=False)
+
+
+@router.patch("/{role_id}", response_model=RoleRead)
+async def patch_role_ep(role_id: int, payload: RoleUpdate, db: AnySession = Depends(get_session)):
+    """Write exactly the fields sent (an explicit null clears ``description``) in one UPDATE."""
+    return await _update_role(db, role_id, payload, partial=True)
+
+
+async def _update_role(db: AnySession, role_id: int, payload: RoleUpdate, partial: bool) -> RoleRead:
+    try:
+        role = await run_db(db, update_role, role_id, payload, partial)
+    except ConstraintViolation as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
-    role = update_role(db, role, payload)
     return role
 
 
 @router.delete("/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_role_ep(role_id: int, db: Session = Depends(get_db)):
-    role = get_role(db, role_id)
+async def delete_role_ep(role_id: int, db: AnySession = Depends(get_session)):
+    role = await run_db(db, get_role, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
-    delete_role(db, role)
+    await run_db(db, delete_role, role)
     return None
+
+
+@router.post("/{role_id}/members", response_model=RoleMembersResult)
+async def add_role_members_ep(role_id: int, payload: RoleMembersChange, db: AnySession = Depends(get_session)):
+    """Assign the role to many users at once (ids, or a department and by default its subtree)."""
+    role = await run_db(db, get_role, role_id)
+    if not role:
+        raise HTTPException(status_code=404, detail="Role not found")
+    try:
+        changed = await run_db(db, add_role_members, role, payload)
+    except MembershipError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    return RoleMembersResult(role_id=role_id, changed=changed)
+
+
+@router.delete("/{role_id}/members", response_model=RoleMembersResult)
+async def remove_role_members_ep(role_id: int, payload: RoleMembersChange, db: AnySession = Depends(get_session)):
+    """Revoke the role from many users at once; same body as POST."""
+    role = await run_db(db, get_role, role_id)
+    if not role:
+        raise HTTPException(status_code=404, detail="Role not found")
+    try:
+        changed = await run_db(db, remove_role_members, role, payload)
+    except MembershipError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    return RoleMembersResult(role_id=role_id, changed=changed)
@@ -0,0 +1,20 @@
+"""Search API route."""
+from fastapi import APIRouter, Depends, Query
+from app.api.deps import AnySession, get_session, run_db
+from app.core.metrics import InstrumentedRoute
+from app.schemas.search import SearchKind, SearchResult
+from app.services.search_service import search
+
+router = APIRouter(tags=["Search"], route_class=InstrumentedRoute)
+
+
+@router.get("/search", response_model=list[SearchResult])
+async def search_ep(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find (prefix match per word)"),
+    limit: int = Query(20, ge=1, le=100),
+    kind: list[SearchKind] | None = Query(None, description="Restrict to these kinds (repeatable)"),
+    organization_id: int | None = None,
+    db: AnySession = Depends(get_session),
+):
+    """Ranked search over user names/emails, department names and organization names."""
+    return await run_db(db, search, q, limit=limit, kinds=kind, organization_id=organization_id)
@@ -1,57 +1,230 @@
 """User API routes.
 Provides CRUD endpoints for users.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.api.deps import get_db
-from app.schemas.user import UserCreate, UserRead, UserUpdate
+import tempfile
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from app.api.deps import AnySession, batch_ids, check_batch_ids, get_session, run_db, sparse_fields
+from app.api.conditional import is_conditional, is_not_modified, make_etag, not_modified, validator_headers
+from app.api.responses import FastJSONResponse, adapter_response, export_response, model_response
+from app.core.metrics import InstrumentedRoute
+from app.core.config import get_settings
+from app.core.passwords import ahash_password
+from app.services.department_service import get_department
+from app.services.fieldsets import Fields, fields_key, sparse_adapter, sparse_model
+from app.services.pagination import InvalidCursor
+from app.services.permission_service import effective_permissions
+from app.services.writes import ConstraintViolation
+from app.schemas.common import BatchIds, BatchRead
+from app.schemas.role import EffectivePermissions
+from app.schemas.user import BulkUserImportResult, UserCreate, UserListFilters, UserRead, UserUpdate
 from app.services.user_service import (
+    IMPORT_FORMATS,
+    USER_LIST_ADAPTER,
+    InvalidImportPayload,
+    bulk_create_users,
+    iter_import_rows,
     create_user,
+    export_users_stmt,
     get_user,
-    list_users,
-    get_user_by_email,
+    get_user_fields,
+    get_user_version,
+    get_users_read,
+    list_users_read,
+    list_users_version,
     update_user,
     delete_user,
 )
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=InstrumentedRoute)
+
+# Uploads larger than this are spooled to a temporary file instead of memory.
+_IMPORT_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def create_user_ep(payload: UserCreate, db: Session = Depends(get_db)):
-    existing = get_user_by_email(db, payload.email)
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    user = create_user(db, payload)
-    return user
+async def create_user_ep(payload: UserCreate, db: AnySession = Depends(get_session)):
+    try:
+        hashed_password = await ahash_password(payload.password)
+        return await run_db(db, create_user, payload, hashed_password)
+    except ConstraintViolation as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.post("/bulk", response_model=BulkUserImportResult)
+async def bulk_create_users_ep(
+    request: Request,
+    batch_size: int | None = Query(None, ge=1, le=5000, description="Rows per INSERT batch"),
+    db: AnySession = Depends(get_session),
+):
+    """Import many users from a JSON array, NDJSON (application/x-ndjson) or CSV (text/csv) body.
+
+    Returns a result per input row; invalid rows and duplicate emails do not abort the import.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = IMPORT_FORMATS.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use application/json, application/x-ndjson or text/csv",
+        )
+    with tempfile.SpooledTemporaryFile(max_size=_IMPORT_SPOOL_MAX_MEMORY) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        try:
+            return await run_db(
+                db,
+                bulk_create_users,
+                iter_import_rows(spool, fmt),
+                batch_size or get_settings().BULK_INSERT_BATCH_SIZE,
+            )
+        except InvalidImportPayload as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/", response_model=list[UserRead], response_class=FastJSONResponse)
+async def list_users_ep(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = Query(None, description="Opaque cursor from X-Next-Cursor; takes precedence over skip"),
+    order_by: Literal["id", "-id", "email", "-email", "created_at", "-created_at"] = "id",
+    filters: UserListFilters = Depends(),
+    fields: Fields | None = Depends(sparse_fields(UserRead)),
+    db: AnySession = Depends(get_session),
+):
+    """List users matching every given filter; a leading ``-`` in ``order_by`` sorts descending.
+
+    The ETag covers the page's rows (count, ids, newest ``updated_at``); a
+    matching If-None-Match is answered with 304 from one aggregate query.
+    ``fields`` narrows both the SELECT and the items.
+    """
+    params = dict(skip=skip, limit=limit, after=after, order_by=order_by, filters=filters)
+    try:
+        if is_conditional(request):
+            etag = make_etag("users", request.url.query, await run_db(db, list_users_version, **params))
+            if is_not_modified(request, etag):
+                return not_modified(etag)
+        page = await run_db(db, list_users_read, **params, fields=fields)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    headers = validator_headers(make_etag("users", request.url.query, page.version))
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    adapter = USER_LIST_ADAPTER if fields is None else sparse_adapter(UserRead, fields)
+    return adapter_response(adapter, page.items, headers=headers)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_users_ep(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    organization_id: int | None = None,
+    department_id: int | None = None,
+    include_subdepartments: bool = Query(False, description="With department_id, also export its sub-departments"),
+    db: AnySession = Depends(get_session),
+):
+    """Stream every matching user as NDJSON or CSV, in id order, with constant memory."""
+    department = None
+    if department_id is not None:
+        department = await run_db(db, get_department, department_id)
+        if department is None:
+            raise HTTPException(status_code=404, detail="Department not found")
+    stmt = export_users_stmt(organization_id, department, include_subdepartments)
+    return export_response(db, stmt, fmt, "users", list_columns=("roles",))
 
 
-@router.get("/", response_model=list[UserRead])
-def list_users_ep(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return list_users(db, skip=skip, limit=limit)
+@router.get("/batch", response_model=BatchRead[UserRead])
+async def get_users_batch(
+    ids: list[int] = Depends(batch_ids),
+    fields: Fields | None = Depends(sparse_fields(UserRead)),
+    db: AnySession = Depends(get_session),
+):
+    """Users by id in one call, in request order; unknown ids are listed in ``missing``."""
+    return await _users_batch(db, ids, fields)
+
+
+@router.post("/batch", response_model=BatchRead[UserRead])
+async def post_users_batch(
+    payload: BatchIds,
+    fields: Fields | None = Depends(sparse_fields(UserRead)),
+    db: AnySession = Depends(get_session),
+):
+    """Same as GET /users/batch, for id lists too long for a query string."""
+    return await _users_batch(db, check_batch_ids(payload.ids), fields)
+
+
+async def _users_batch(db: AnySession, ids: list[int], fields: Fields | None):
+    items, missing = await run_db(db, get_users_read, ids, fields)
+    return model_response(BatchRead[sparse_model(UserRead, fields)](items=items, missing=missing))
 
 
 @router.get("/{user_id}", response_model=UserRead)
-def get_user_ep(user_id: int, db: Session = Depends(get_db)):
-    user = get_user(db, user_id)
+async def get_user_ep(
+    user_id: int,
+    request: Request,
+    response: Response,
+    fields: Fields | None = Depends(sparse_fields(UserRead)),
+    db: AnySession = Depends(get_session),
+):
+    if is_conditional(request):
+        updated_at = await run_db(db, get_user_version, user_id)
+        if updated_at is not None:
+            etag = make_etag("user", user_id, updated_at, fields_key(fields))
+            if is_not_modified(request, etag, updated_at):
+                return not_modified(etag, updated_at)
+    if fields is not None:
+        found = await run_db(db, get_user_fields, user_id, fields)
+        if not found:
+            raise HTTPException(status_code=404, detail="User not found")
+        item, updated_at = found
+        etag = make_etag("user", user_id, updated_at, fields_key(fields))
+        return model_response(item, headers=validator_headers(etag, updated_at))
+    user = await run_db(db, get_user, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    etag = make_etag("user", user_id, user.updated_at, fields_key(fields))
+    response.headers.update(validator_headers(etag, user.updated_at))
     return user
 
 
+@router.get("/{user_id}/permissions", response_model=EffectivePermissions)
+async def get_user_permissions_ep(user_id: int, db: AnySession = Depends(get_session)):
+    """Permissions the user holds through direct roles and department grants (cached per user)."""
+    permissions = await run_db(db, effective_permissions, user_id)
+    if permissions is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return EffectivePermissions(user_id=user_id, permissions=permissions)
+
+
 @router.put("/{user_id}", response_model=UserRead)
-def update_user_ep(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)):
-    user = get_user(db, user_id)
+async def update_user_ep(user_id: int, payload: UserUpdate, db: AnySession = Depends(get_session)):
+    """Update the given fields; null/omitted fields keep their value."""
+    return await _update_user(db, user_id, payload, partial=False)
+
+
+@router.patch("/{user_id}", response_model=UserRead)
+async def patch_user_ep(user_id: int, payload: UserUpdate, db: AnySession = Depends(get_session)):
+    """Write exactly the fields sent (an explicit null ``department_id`` detaches the user) in one UPDATE."""
+    return await _update_user(db, user_id, payload, partial=True)
+
+
+async def _update_user(db: AnySession, user_id: int, payload: UserUpdate, partial: bool) -> UserRead:
+    user = await run_db(db, update_user, user_id, payload, partial)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    user = update_user(db, user, payload)
     return user
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user_ep(user_id: int, db: Session = Depends(get_db)):
-    user = get_user(db, user_id)
+async def delete_user_ep(user_id: int, db: AnySession = Depends(get_session)):
+    user = await run_db(db, get_user, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    delete_user(db, user)
+    await run_db(db, delete_user, user)
     return None
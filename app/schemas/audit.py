@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from app.schemas.common import UtcDatetime
+
+AuditEntity = Literal["user", "organization", "role"]
+AuditAction = Literal["create", "update", "delete", "role_added", "role_removed"]
+
+
+class AuditEventRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    occurred_at: datetime
+    entity: AuditEntity
+    entity_id: int
+    action: AuditAction
+    changes: Optional[dict[str, Any]] = Field(
+        None, description="Written values of the audited fields; role_added/role_removed carry role_id"
+    )
+
+
+class AuditFilters(BaseModel):
+    """Query filters for GET /audit; every given filter must match."""
+
+    model_config = ConfigDict(frozen=True)
+    entity: Optional[AuditEntity] = None
+    entity_id: Optional[int] = Field(None, description="Requires entity")
+    action: Optional[AuditAction] = None
+    since: Optional[UtcDatetime] = Field(None, description="occurred_at >= this instant")
+    until: Optional[UtcDatetime] = Field(None, description="occurred_at < this instant")
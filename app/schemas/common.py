@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+from typing import Annotated, Generic, TypeVar
+from pydantic import AfterValidator, BaseModel, Field
+
+T = TypeVar("T")
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# Timestamps are stored as naive UTC (datetime.utcnow); filters given with an
+# offset are converted so they compare against the stored values correctly.
+UtcDatetime = Annotated[datetime, AfterValidator(_to_naive_utc)]
+
+
+class BatchIds(BaseModel):
+    """Body of POST /<resource>/batch, for id lists too long for a query string."""
+
+    ids: list[int] = Field(..., min_length=1)
+
+
+class BatchRead(BaseModel, Generic[T]):
+    """Result of a batch read: found items in request order, plus the ids that do not exist."""
+
+    items: list[T]
+    missing: list[int] = Field(..., description="Requested ids that were not found, in request order")
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field, ConfigDict
+from app.schemas.common import UtcDatetime
 
 
 # ========== Department Schemas ==========
@@ -22,6 +23,12 @@ class DepartmentUpdate(BaseModel):
 class DepartmentRead(DepartmentBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
+    path: str
+    depth: int
+
+
+class DepartmentTree(DepartmentRead):
+    children: List["DepartmentTree"] = []
 
 
 # ========== Organization Schemas ==========
@@ -34,6 +41,15 @@ class OrganizationCreate(OrganizationBase):
     pass
 
 
+class OrganizationListFilters(BaseModel):
+    """Query filters for GET /organizations/; every given filter must match."""
+
+    model_config = ConfigDict(frozen=True)
+    name_prefix: Optional[str] = Field(None, description="Names starting with this text (case-sensitive)")
+    created_after: Optional[UtcDatetime] = Field(None, description="created_at >= this instant")
+    created_before: Optional[UtcDatetime] = Field(None, description="created_at < this instant")
+
+
 class OrganizationUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = None
@@ -0,0 +1,17 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class HeadcountRow(BaseModel):
+    id: int
+    name: str
+    active: int
+    inactive: int
+    total: int
+
+
+class DepartmentHeadcount(HeadcountRow):
+    """Counts include all sub-departments; ``direct`` counts the department's own members."""
+
+    parent_id: Optional[int] = None
+    direct: int
@@ -1,10 +1,12 @@
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from app.core.permissions import Permission
 
 
 class RoleBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=255)
+    permissions: List[Permission] = []
 
 
 class RoleCreate(RoleBase):
@@ -14,8 +16,40 @@ class RoleCreate(RoleBase):
 class RoleUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=255)
+    permissions: Optional[List[Permission]] = Field(None, description="Replaces the role's permission set")
 
 
 class RoleRead(RoleBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
+
+
+class DepartmentRoleGrant(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    department_id: int
+    role_id: int
+    include_subdepartments: bool
+
+
+class EffectivePermissions(BaseModel):
+    user_id: int
+    permissions: List[Permission]
+
+
+class RoleMembersChange(BaseModel):
+    """Users to add to or remove from a role: explicit ids, or everyone in a department."""
+
+    user_ids: Optional[List[int]] = Field(None, min_length=1, max_length=10_000)
+    department_id: Optional[int] = None
+    include_subdepartments: bool = Field(True, description="With department_id, also cover its sub-departments")
+
+    @model_validator(mode="after")
+    def _one_target(self) -> "RoleMembersChange":
+        if (self.user_ids is None) == (self.department_id is None):
+            raise ValueError("Give either user_ids or department_id")
+        return self
+
+
+class RoleMembersResult(BaseModel):
+    role_id: int
+    changed: int = Field(..., description="Assignments actually added or removed")
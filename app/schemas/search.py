@@ -0,0 +1,14 @@
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+SearchKind = Literal["user", "department", "organization"]
+
+
+class SearchResult(BaseModel):
+    kind: SearchKind
+    id: int
+    title: str
+    subtitle: Optional[str] = None
+    organization_id: int
+    # "token": word/prefix match ranked by bm25; "substring": fallback match inside words
+    match: Literal["token", "substring"]
@@ -1,6 +1,12 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from typing import Annotated, Literal, Optional, List
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, WithJsonSchema
+from app.schemas.common import UtcDatetime
+
+# Emails read back from the database were validated by UserCreate on the way in.
+# Re-running email validation per row dominated list serialization, so read
+# models accept the stored string as is while documenting the same schema.
+StoredEmail = Annotated[str, WithJsonSchema({"type": "string", "format": "email"})]
 
 
 class RoleRead(BaseModel):
@@ -22,6 +28,11 @@ class UserCreate(UserBase):
     password: str = Field(..., min_length=6, max_length=100)
 
 
+class UserLogin(BaseModel):
+    email: EmailStr
+    password: str = Field(..., min_length=1, max_length=100)
+
+
 class UserUpdate(BaseModel):
     full_name: Optional[str] = Field(None, max_length=255)
     is_active: Optional[bool] = None
@@ -31,7 +42,7 @@ class UserUpdate(BaseModel):
 class UserRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    email: EmailStr
+    email: StoredEmail
     full_name: Optional[str] = None
     is_active: bool
     organization_id: int
@@ -39,3 +50,29 @@ class UserRead(BaseModel):
     created_at: datetime
     updated_at: datetime
     roles: List[RoleRead] = []
+
+
+class UserListFilters(BaseModel):
+    """Query filters for GET /users/; every given filter must match."""
+
+    model_config = ConfigDict(frozen=True)
+    organization_id: Optional[int] = None
+    department_id: Optional[int] = None
+    role_id: Optional[int] = Field(None, description="Only users holding this role")
+    is_active: Optional[bool] = None
+    created_after: Optional[UtcDatetime] = Field(None, description="created_at >= this instant")
+    created_before: Optional[UtcDatetime] = Field(None, description="created_at < this instant")
+
+
+class BulkUserRowResult(BaseModel):
+    index: int
+    status: Literal["created", "error"]
+    id: Optional[int] = None
+    email: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkUserImportResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkUserRowResult]
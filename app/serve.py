@@ -0,0 +1,95 @@
+"""Production launcher: ``python -m app.serve [--workers N] [--schema check] ...``
+
+``uvicorn app.main:app --reload`` stays the development path. This launcher:
+
+1. prepares the schema once, in this parent process (``--schema``, default
+   ``check``: the database must be at the Alembic head), instead of every
+   worker running ``create_all`` at the same time;
+2. starts the uvicorn workers with SCHEMA_ON_STARTUP=off and
+   WARMUP_ON_STARTUP=true, so each opens its DB pool, starts its password
+   hashing processes and fills its caches before accepting connections;
+3. passes the SERVER_* settings (backlog, keep-alive, concurrency limit,
+   max requests, graceful timeout) to uvicorn.
+
+Unless PASSWORD_HASH_WORKERS is set, the CPUs are shared between the hashing
+pools of all workers instead of each worker starting up to four processes.
+"""
+import argparse
+import os
+from typing import Any
+from app.core.config import Settings, get_settings
+from app.db.schema import SCHEMA_MODES, SchemaOutOfDate, prepare_schema
+
+
+def parse_args(argv: list[str] | None, settings: Settings) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS, help="0: one per CPU")
+    parser.add_argument("--schema", choices=SCHEMA_MODES, default="check", help="schema step run once before the workers start")
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument("--keepalive", type=int, default=settings.SERVER_KEEPALIVE_SECONDS, help="idle keep-alive seconds")
+    parser.add_argument("--limit-concurrency", type=int, default=settings.SERVER_LIMIT_CONCURRENCY, help="0: unlimited")
+    parser.add_argument("--limit-max-requests", type=int, default=settings.SERVER_LIMIT_MAX_REQUESTS, help="0: unlimited")
+    parser.add_argument("--no-warmup", action="store_true", help="accept traffic without pre-warming")
+    parser.add_argument("--access-log", action="store_true", help="log every request (off: metrics cover it)")
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+def worker_count(requested: int) -> int:
+    return requested if requested > 0 else os.cpu_count() or 1
+
+
+def server_options(args: argparse.Namespace, settings: Settings) -> dict[str, Any]:
+    """Keyword arguments for ``uvicorn.run``."""
+    return {
+        "host": args.host,
+        "port": args.port,
+        "workers": worker_count(args.workers),
+        "backlog": args.backlog,
+        "timeout_keep_alive": args.keepalive,
+        "limit_concurrency": args.limit_concurrency or None,
+        "limit_max_requests": args.limit_max_requests or None,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "proxy_headers": True,
+        "forwarded_allow_ips": settings.SERVER_FORWARDED_ALLOW_IPS,
+        "access_log": args.access_log,
+        "log_level": args.log_level,
+    }
+
+
+def worker_settings(args: argparse.Namespace, workers: int) -> dict[str, Any]:
+    """Settings the workers run with instead of the environment's."""
+    overrides: dict[str, Any] = {"SCHEMA_ON_STARTUP": "off", "WARMUP_ON_STARTUP": not args.no_warmup}
+    if "PASSWORD_HASH_WORKERS" not in os.environ:
+        overrides["PASSWORD_HASH_WORKERS"] = max(1, (os.cpu_count() or 1) // workers)
+    return overrides
+
+
+def main(argv: list[str] | None = None) -> None:
+    import uvicorn
+
+    settings = get_settings()
+    args = parse_args(argv, settings)
+    options = server_options(args, settings)
+
+    from app.db.session import engine
+
+    try:
+        prepare_schema(engine, args.schema)
+    except SchemaOutOfDate as exc:
+        raise SystemExit(f"error: {exc}")
+    engine.dispose()  # the workers open their own connections
+
+    overrides = worker_settings(args, options["workers"])
+    # Spawned workers read them from the environment; with one worker app.main
+    # runs in this process, whose Settings already read the environment at import.
+    os.environ.update({name: str(value).lower() for name, value in overrides.items()})
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    uvicorn.run("app.main:app", **options)
+
+
+if __name__ == "__main__":
+    main()
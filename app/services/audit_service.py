@@ -0,0 +1,272 @@
+"""Audit log of changes to users, organizations, roles and role membership.
+
+Records are collected on the session and handed over when its transaction
+commits; rolled-back work leaves no record. They come from:
+
+- unit-of-work changes (ORM inserts, updates and deletes of ``User``,
+  ``Organization`` and ``Role``, and ``User.roles``/``Role.users`` edits)
+  through the session hooks at the bottom of this module;
+- set-based writes in the services (single-statement creates and updates,
+  bulk import, role membership, role and department deletion) through
+  ``record_created``, ``record_updated`` and ``record_membership``.
+
+AUDIT_MODE decides what happens at commit: ``behind`` queues the records for
+a background writer (app/core/audit.py), so a write costs no extra statement;
+``transaction`` inserts them in the committing transaction, so they commit or
+roll back with the change; ``off`` records nothing.
+
+Single-statement updates do not read the row first, so an update records the
+new values only; the previous ones are in the entity's earlier events.
+"""
+import threading
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+from functools import partial
+from itertools import chain
+from typing import Any
+from pydantic import TypeAdapter
+from sqlalchemy import Connection, Engine, event, insert, inspect, select
+from sqlalchemy.orm import Session
+from app.core.audit import AuditWriter, Record
+from app.core.config import get_settings
+from app.models.audit import AuditEvent
+from app.models.organization import Organization
+from app.models.role import Role
+from app.models.user import User
+from app.schemas.audit import AuditEventRead, AuditFilters
+from app.services.pagination import Page, paginate
+
+AUDIT_MODES = ("behind", "transaction", "off")
+
+# Fields recorded per entity; timestamps and password hashes are left out.
+AUDITED_FIELDS = {
+    "user": ("email", "full_name", "is_active", "organization_id", "department_id"),
+    "organization": ("name", "description"),
+    "role": ("name", "description", "permissions"),
+}
+_ENTITIES = {User: "user", Organization: "organization", Role: "role"}
+
+AUDIT_READ_COLUMNS = (
+    AuditEvent.id,
+    AuditEvent.occurred_at,
+    AuditEvent.entity,
+    AuditEvent.entity_id,
+    AuditEvent.action,
+    AuditEvent.changes,
+)
+AUDIT_LIST_ADAPTER = TypeAdapter(list[AuditEventRead])
+
+
+class InvalidAuditFilter(ValueError):
+    """Raised for filter combinations the audit indexes cannot serve."""
+
+
+def audit_mode() -> str:
+    mode = get_settings().AUDIT_MODE
+    if mode not in AUDIT_MODES:
+        raise ValueError(f"Unsupported AUDIT_MODE: {mode!r}")
+    return mode
+
+
+# ========== Query ==========
+def list_audit_events(
+    db: Session, filters: AuditFilters | None = None, limit: int = 100, after: str | None = None
+) -> Page[AuditEventRead]:
+    """Audit events matching every given filter, newest first, one cursor page at a time."""
+    stmt = select(*AUDIT_READ_COLUMNS)
+    if filters is not None:
+        if filters.entity_id is not None and filters.entity is None:
+            raise InvalidAuditFilter("entity_id needs entity")
+        if filters.entity is not None:
+            stmt = stmt.where(AuditEvent.entity == filters.entity)
+        if filters.entity_id is not None:
+            stmt = stmt.where(AuditEvent.entity_id == filters.entity_id)
+        if filters.action is not None:
+            stmt = stmt.where(AuditEvent.action == filters.action)
+        if filters.since is not None:
+            stmt = stmt.where(AuditEvent.occurred_at >= filters.since)
+        if filters.until is not None:
+            stmt = stmt.where(AuditEvent.occurred_at < filters.until)
+    page = paginate(db, stmt, (AuditEvent.id,), limit=limit, after=after, rows=True, descending=True)
+    return Page(AUDIT_LIST_ADAPTER.validate_python(page.items, from_attributes=True), page.next_cursor)
+
+
+# ========== Recording ==========
+_PENDING = "audit_pending"
+
+
+def _record(db: Session, entity: str, entity_id: int, action: str, changes: dict[str, Any] | None) -> None:
+    db.info.setdefault(_PENDING, []).append(
+        {
+            "occurred_at": datetime.utcnow(),
+            "entity": entity,
+            "entity_id": entity_id,
+            "action": action,
+            "changes": changes,
+        }
+    )
+
+
+def _audited(entity: str, values: Mapping[str, Any]) -> dict[str, Any]:
+    return {name: values[name] for name in AUDITED_FIELDS[entity] if name in values}
+
+
+def record_created(db: Session, entity: str, rows: Iterable[Mapping[str, Any]]) -> None:
+    """Record the creation of ``rows`` (mappings with ``id`` and the audited fields)."""
+    if audit_mode() == "off":
+        return
+    for row in rows:
+        _record(db, entity, row["id"], "create", _audited(entity, row))
+
+
+def record_updated(db: Session, entity: str, ids: Iterable[int], values: Mapping[str, Any]) -> None:
+    """Record ``values`` written to each of ``ids``; fields that are not audited are ignored."""
+    changes = _audited(entity, values)
+    if not changes or audit_mode() == "off":
+        return
+    for entity_id in ids:
+        _record(db, entity, entity_id, "update", changes)
+
+
+def record_membership(db: Session, action: str, role_id: int, user_ids: Iterable[int]) -> None:
+    """Record ``role_added``/``role_removed`` for each user."""
+    if audit_mode() == "off":
+        return
+    for user_id in user_ids:
+        _record(db, "user", user_id, action, {"role_id": role_id})
+
+
+# ========== Writers ==========
+_writers: dict[Engine, AuditWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _insert_events(engine: Engine, records: list[Record]) -> None:
+    with engine.begin() as connection:
+        connection.execute(insert(AuditEvent), records)
+
+
+def audit_writer(bind: Engine | Connection) -> AuditWriter:
+    """The write-behind writer for the database behind ``bind`` (one per engine and process)."""
+    engine = bind.engine
+    if engine.dialect.is_async:
+        # Async drivers only run on the event loop; the writer thread uses the
+        # sync engine, which points at the same database.
+        from app.db.session import engine
+    with _writers_lock:
+        writer = _writers.get(engine)
+        if writer is None:
+            settings = get_settings()
+            writer = _writers[engine] = AuditWriter(
+                partial(_insert_events, engine),
+                max_pending=settings.AUDIT_QUEUE_SIZE,
+                batch_size=settings.AUDIT_BATCH_SIZE,
+                flush_interval=settings.AUDIT_FLUSH_INTERVAL_MS / 1000,
+                enqueue_timeout=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS,
+            )
+    return writer
+
+
+def flush_audit() -> None:
+    """Wait until every queued record of this process has been written."""
+    for writer in list(_writers.values()):
+        writer.flush()
+
+
+def shutdown_audit() -> None:
+    """Write what is queued and stop the writer threads (app shutdown)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+def audit_stats() -> dict[str, int]:
+    """Writer counters of this process, summed over databases."""
+    totals: dict[str, int] = {}
+    for writer in list(_writers.values()):
+        for name, value in writer.as_dict().items():
+            totals[name] = totals.get(name, 0) + value
+    return totals
+
+
+# ========== Session hooks ==========
+def _loaded(obj: Any, entity: str) -> dict[str, Any]:
+    """Audited values already loaded on ``obj`` (reading others would emit SQL)."""
+    return _audited(entity, inspect(obj).dict)
+
+
+def _changes(obj: Any, entity: str) -> dict[str, Any]:
+    attrs = inspect(obj).attrs
+    changes = {}
+    for name in AUDITED_FIELDS[entity]:
+        history = attrs[name].history
+        if history.has_changes():
+            changes[name] = history.added[0] if history.added else None
+    return changes
+
+
+def _memberships(obj: Any) -> Iterable[tuple[str, int, int]]:
+    """(action, user id, role id) for the ``User.roles``/``Role.users`` edits on ``obj``."""
+    if isinstance(obj, User):
+        history, pair = inspect(obj).attrs.roles.history, lambda role: (obj.id, role.id)
+    elif isinstance(obj, Role):
+        history, pair = inspect(obj).attrs.users.history, lambda user: (user.id, obj.id)
+    else:
+        return ()
+    return chain(
+        (("role_added", *pair(other)) for other in history.added),
+        (("role_removed", *pair(other)) for other in history.deleted),
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    # new/dirty/deleted and attribute history still describe the flushed changes here.
+    if audit_mode() == "off":
+        return
+    for obj in session.new:
+        entity = _ENTITIES.get(type(obj))
+        if entity is not None:
+            _record(session, entity, obj.id, "create", _loaded(obj, entity))
+    for obj in session.dirty:
+        entity = _ENTITIES.get(type(obj))
+        if entity is not None and obj not in session.deleted:
+            changes = _changes(obj, entity)
+            if changes:
+                _record(session, entity, obj.id, "update", changes)
+    for obj in session.deleted:
+        entity = _ENTITIES.get(type(obj))
+        if entity is not None:
+            _record(session, entity, obj.id, "delete", _loaded(obj, entity))
+    # Both sides of the relationship may carry the same edit.
+    memberships = {
+        edit
+        for edit in chain.from_iterable(_memberships(obj) for obj in chain(session.new, session.dirty))
+        if None not in edit
+    }
+    for action, user_id, role_id in sorted(memberships):
+        _record(session, "user", user_id, action, {"role_id": role_id})
+
+
+@event.listens_for(Session, "before_commit")
+def _write_in_transaction(session: Session) -> None:
+    if audit_mode() != "transaction":
+        return
+    session.flush()  # collects the unit of work's changes through _collect_changes
+    records = session.info.pop(_PENDING, None)
+    if records:
+        session.connection().execute(insert(AuditEvent), records)
+
+
+@event.listens_for(Session, "after_commit")
+def _hand_over(session: Session) -> None:
+    records = session.info.pop(_PENDING, None)
+    if records:
+        audit_writer(session.get_bind()).submit(records)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_PENDING, None)
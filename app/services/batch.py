@@ -0,0 +1,38 @@
+"""Reads of many rows by id, for the ``/<resource>/batch`` routes.
+
+Requested ids are deduplicated (first occurrence wins) and looked up with
+``WHERE id IN (...)`` in chunks of BATCH_READ_CHUNK_SIZE, so no statement
+exceeds the database's bound-parameter limit. Results come back in request
+order together with the ids that were not found.
+"""
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, TypeVar
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+
+def unique_ids(ids: Iterable[int]) -> list[int]:
+    return list(dict.fromkeys(ids))
+
+
+def id_chunks(ids: list[int], size: int | None = None) -> Iterator[list[int]]:
+    size = size or get_settings().BATCH_READ_CHUNK_SIZE
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def in_request_order(ids: list[int], found: Mapping[int, T]) -> tuple[list[T], list[int]]:
+    """``(found items in the order of ids, ids without an item)``."""
+    return [found[i] for i in ids if i in found], [i for i in ids if i not in found]
+
+
+def rows_by_id(db: Session, stmt: Select, id_column: Any, ids: list[int]) -> dict[int, Any]:
+    """Rows of ``stmt`` whose ``id_column`` is in ``ids`` as ``{id: row dict}``, one query per chunk."""
+    found: dict[int, Any] = {}
+    for chunk in id_chunks(ids):
+        for row in db.execute(stmt.where(id_column.in_(chunk))):
+            found[row.id] = row._asdict()
+    return found
@@ -0,0 +1,217 @@
+"""Service layer for Department operations and the department hierarchy.
+
+Each department stores its materialized ancestry in ``path`` (``/1/5/12/``).
+Because ``/`` sorts immediately before ``0``, every descendant of a node with
+path ``P`` satisfies ``P < path < P[:-1] + "0"`` in byte order, which the
+column compares in on every backend (``COLLATE "C"`` on PostgreSQL, see
+app/models/department.py). Subtree reads are therefore a single range scan on
+the ``path`` index, instead of one query per level.
+"""
+from sqlalchemy import delete, func, literal, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.department import Department
+from app.models.role import DepartmentRole
+from app.models.user import User
+from app.schemas.organization import DepartmentCreate, DepartmentUpdate
+from app.schemas.user import UserRead
+from app.services.audit_service import record_updated
+from app.services.loading import loader_options
+from app.services.pagination import Page, paginate
+from app.services.permission_service import invalidate_permissions
+from app.services.report_service import drop_headcount_group
+
+
+class HierarchyError(ValueError):
+    """Raised when a create/move would produce an invalid hierarchy."""
+
+
+def _subtree_clause(path: str, include_self: bool = False):
+    upper = path[:-1] + "0"
+    lower = Department.path >= path if include_self else Department.path > path
+    return lower & (Department.path < upper)
+
+
+def _check_parent(db: Session, organization_id: int, parent_id: int | None) -> Department | None:
+    if parent_id is None:
+        return None
+    parent = db.get(Department, parent_id)
+    if parent is None:
+        raise HierarchyError("Parent department not found")
+    if parent.organization_id != organization_id:
+        raise HierarchyError("Parent department belongs to another organization")
+    return parent
+
+
+def create_department(db: Session, data: DepartmentCreate) -> Department:
+    parent = _check_parent(db, data.organization_id, data.parent_id)
+    dept = Department(name=data.name, organization_id=data.organization_id, parent_id=data.parent_id)
+    db.add(dept)
+    db.flush()  # assigns dept.id, needed for its own path segment
+    dept.path = f"{parent.path if parent else '/'}{dept.id}/"
+    dept.depth = parent.depth + 1 if parent else 0
+    db.commit()
+    db.refresh(dept)
+    return dept
+
+
+def get_department(db: Session, dept_id: int) -> Department | None:
+    return db.get(Department, dept_id)
+
+
+def update_department(db: Session, dept: Department, data: DepartmentUpdate) -> Department:
+    """Rename and/or move a department.
+
+    Sending ``parent_id`` (including an explicit null, which moves it to the
+    root) re-parents the node; the paths of its whole subtree are rewritten by
+    one UPDATE statement.
+    """
+    if data.name is not None:
+        dept.name = data.name
+    if "parent_id" in data.model_fields_set and data.parent_id != dept.parent_id:
+        try:
+            _move_department(db, dept, data.parent_id)
+        except HierarchyError:
+            db.rollback()
+            raise
+    db.add(dept)
+    db.commit()
+    db.refresh(dept)
+    return dept
+
+
+def _move_department(db: Session, dept: Department, parent_id: int | None) -> None:
+    parent = _check_parent(db, dept.organization_id, parent_id)
+    if parent is not None and parent.path.startswith(dept.path):
+        raise HierarchyError("Cannot move a department under itself or its descendants")
+
+    old_path = dept.path
+    new_path = f"{parent.path if parent else '/'}{dept.id}/"
+    depth_delta = (parent.depth + 1 if parent else 0) - dept.depth
+    db.execute(
+        update(Department)
+        .where(_subtree_clause(old_path, include_self=True))
+        .values(
+            path=literal(new_path).concat(func.substr(Department.path, len(old_path) + 1)),
+            depth=Department.depth + depth_delta,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    dept.parent_id = parent_id
+    # Keep the in-session copy in line with what the bulk UPDATE wrote.
+    set_committed_value(dept, "path", new_path)
+    set_committed_value(dept, "depth", dept.depth + depth_delta)
+
+
+def delete_department(db: Session, dept: Department) -> None:
+    """Delete a leaf department; its users are detached from it."""
+    has_children = db.execute(
+        select(Department.id).where(Department.parent_id == dept.id).limit(1)
+    ).first()
+    if has_children:
+        raise HierarchyError("Department has child departments")
+    detached = db.execute(
+        update(User).where(User.department_id == dept.id).values(department_id=None).returning(User.id)
+    ).scalars().all()
+    record_updated(db, "user", detached, {"department_id": None})
+    invalidate_permissions(db, detached)
+    drop_headcount_group(db, "department", dept.id)
+    db.execute(delete(DepartmentRole).where(DepartmentRole.department_id == dept.id))
+    db.delete(dept)
+    db.commit()
+
+
+def list_descendants(db: Session, dept: Department, include_self: bool = False) -> list[Department]:
+    """Return the subtree below ``dept`` in depth-first (path) order with one query."""
+    stmt = (
+        select(Department)
+        .where(_subtree_clause(dept.path, include_self=include_self))
+        .order_by(Department.path)
+    )
+    return list(db.execute(stmt).scalars().all())
+
+
+def _attach_children(departments: list[Department]) -> list[Department]:
+    """Populate ``children`` from an already loaded flat list and return the roots.
+
+    set_committed_value marks the collections as loaded, so serializing the
+    tree does not trigger lazy loads.
+    """
+    by_id = {dept.id: dept for dept in departments}
+    children: dict[int, list[Department]] = {dept.id: [] for dept in departments}
+    roots: list[Department] = []
+    for dept in departments:
+        if dept.parent_id in children:
+            children[dept.parent_id].append(dept)
+        else:
+            roots.append(dept)
+    for dept_id, kids in children.items():
+        set_committed_value(by_id[dept_id], "children", kids)
+    return roots
+
+
+def get_department_tree(db: Session, organization_id: int) -> list[Department]:
+    """Return the root departments of an organization with ``children`` filled in, using one query."""
+    stmt = (
+        select(Department)
+        .where(Department.organization_id == organization_id)
+        .order_by(Department.path, Department.id)
+    )
+    return _attach_children(list(db.execute(stmt).scalars().all()))
+
+
+def subtree_department_ids(dept: Department):
+    """SELECT of the ids of ``dept`` and every department below it, for use in ``IN``."""
+    return select(Department.id).where(_subtree_clause(dept.path, include_self=True))
+
+
+def list_subtree_users(
+    db: Session,
+    dept: Department,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+) -> Page[User]:
+    """Users assigned to ``dept`` or any department below it."""
+    stmt = (
+        select(User)
+        .options(*loader_options(UserRead))
+        .where(User.department_id.in_(subtree_department_ids(dept)))
+    )
+    return paginate(db, stmt, (User.id,), limit=limit, skip=skip, after=after)
+
+
+def rebuild_department_paths(db: Session, organization_id: int | None = None) -> int:
+    """Recompute ``path``/``depth`` from ``parent_id`` (backfill for rows created outside this service).
+
+    Returns the number of departments whose path changed.
+    """
+    stmt = select(Department)
+    if organization_id is not None:
+        stmt = stmt.where(Department.organization_id == organization_id)
+    departments = list(db.execute(stmt).scalars().all())
+    by_id = {dept.id: dept for dept in departments}
+    resolved: dict[int, tuple[str, int]] = {}
+
+    def resolve(dept: Department) -> tuple[str, int]:
+        chain = []
+        node: Department | None = dept
+        while node is not None and node.id not in resolved:
+            chain.append(node)
+            node = by_id.get(node.parent_id) if node.parent_id is not None else None
+            if node is not None and node in chain:
+                raise HierarchyError(f"Cycle detected at department {node.id}")
+        base_path, base_depth = resolved[node.id] if node is not None else ("/", -1)
+        for item in reversed(chain):
+            base_path, base_depth = f"{base_path}{item.id}/", base_depth + 1
+            resolved[item.id] = (base_path, base_depth)
+        return resolved[dept.id]
+
+    changed = 0
+    for dept in departments:
+        path, depth = resolve(dept)
+        if dept.path != path or dept.depth != depth:
+            dept.path, dept.depth = path, depth
+            changed += 1
+    db.commit()
+    return changed
@@ -0,0 +1,117 @@
+"""Sparse fieldsets: the ``fields=`` parameter of list and detail routes.
+
+``fields=email,roles`` returns only those attributes of each item; ``id`` is
+always included. Nested models take dotted paths: ``fields=name,departments.name``
+keeps ``name`` (and ``id``) of every department.
+
+Services read the selection to narrow their SELECT to the columns it needs and
+to skip relationships nobody asked for. Responses are validated and serialized
+with a model reduced to the selection (``sparse_model``), built once per
+distinct selection.
+"""
+import copy
+import types
+import typing
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from typing import Any
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+# Selected dotted paths, e.g. frozenset({"id", "name", "departments.name"})
+Fields = frozenset[str]
+
+
+class InvalidFields(ValueError):
+    """Raised when ``fields`` names something the response model does not have."""
+
+
+def _nested_model(annotation: Any) -> tuple[type[BaseModel], bool] | None:
+    """(model, is_list) when ``annotation`` is a model, an optional model or a list of models."""
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin in (typing.Union, types.UnionType):
+        non_null = [arg for arg in args if arg is not type(None)]
+        return _nested_model(non_null[0]) if len(non_null) == 1 else None
+    if origin in (list, typing.List) and args:
+        nested = _nested_model(args[0])
+        return (nested[0], True) if nested is not None and not nested[1] else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None
+
+
+def _check(model: type[BaseModel], path: str) -> None:
+    name, _, rest = path.partition(".")
+    info = model.model_fields.get(name)
+    if info is None:
+        raise InvalidFields(f"Unknown field: {path}")
+    if rest:
+        nested = _nested_model(info.annotation)
+        if nested is None:
+            raise InvalidFields(f"Field has no sub-fields: {name}")
+        _check(nested[0], rest)
+
+
+def parse_fields(model: type[BaseModel], raw: str | None) -> Fields | None:
+    """Parse a comma-separated ``fields`` value against ``model``; None (all fields) when absent or blank."""
+    if raw is None:
+        return None
+    paths = {part.strip() for part in raw.split(",") if part.strip()}
+    if not paths:
+        return None
+    for path in paths:
+        _check(model, path)
+    return frozenset(paths | {"id"}) if "id" in model.model_fields else frozenset(paths)
+
+
+def top_level(fields: Fields) -> set[str]:
+    return {path.partition(".")[0] for path in fields}
+
+
+def wants(fields: Fields | None, name: str) -> bool:
+    """Whether the top-level field ``name`` is selected."""
+    return fields is None or name in top_level(fields)
+
+
+def nested_fields(fields: Fields | None, name: str) -> Fields | None:
+    """Selection inside ``name``: None when it is selected as a whole."""
+    if fields is None or name in fields:
+        return None
+    prefix = f"{name}."
+    return frozenset({path[len(prefix):] for path in fields if path.startswith(prefix)} | {"id"})
+
+
+def select_columns(columns: Sequence[Any], fields: Fields | None, required: Iterable[str] = ()) -> list[Any]:
+    """The ``columns`` (by key) the selection needs, plus ``required`` ones (sort keys, validators)."""
+    if fields is None:
+        return list(columns)
+    keep = top_level(fields) | set(required)
+    return [column for column in columns if column.key in keep]
+
+
+@lru_cache(maxsize=256)
+def sparse_model(model: type[BaseModel], fields: Fields | None) -> type[BaseModel]:
+    """``model`` reduced to ``fields``; nested selections reduce the nested models too."""
+    if fields is None:
+        return model
+    definitions: dict[str, Any] = {}
+    for name, info in model.model_fields.items():
+        if not wants(fields, name):
+            continue
+        annotation, inner = info.annotation, nested_fields(fields, name)
+        nested = _nested_model(annotation)
+        if nested is not None and inner is not None:
+            reduced = sparse_model(nested[0], inner)
+            annotation = list[reduced] if nested[1] else reduced | None
+        definitions[name] = (annotation, copy.copy(info))
+    return create_model(f"{model.__name__}Fields", __config__=ConfigDict(from_attributes=True), **definitions)
+
+
+@lru_cache(maxsize=256)
+def sparse_adapter(model: type[BaseModel], fields: Fields | None) -> TypeAdapter:
+    """TypeAdapter validating/serializing a list of ``sparse_model(model, fields)``."""
+    return TypeAdapter(list[sparse_model(model, fields)])
+
+
+def fields_key(fields: Fields | None) -> str | None:
+    """Canonical form of a selection, for cache keys and ETags."""
+    return None if fields is None else ",".join(sorted(fields))
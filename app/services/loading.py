@@ -0,0 +1,49 @@
+"""Eager-loading strategies keyed by response schema.
+
+Routes return ORM objects and FastAPI serializes them through the response
+model. Any relationship the schema reads must already be loaded, otherwise
+serialization issues one lazy SELECT per row (N+1). Services ask this module for
+the loader options matching the schema they serve instead of hard-coding them
+per query.
+
+- selectinload for collections: one extra ``IN (...)`` query per page, and it does
+  not multiply rows under LIMIT/OFFSET.
+- joinedload for many-to-one references: folded into the main SELECT.
+"""
+from typing import TypeVar
+from pydantic import BaseModel
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+from app.models.organization import Organization
+from app.models.user import User
+from app.schemas.organization import OrganizationWithRelations
+from app.schemas.user import UserRead
+
+T = TypeVar("T")
+
+_LOADER_OPTIONS: dict[type[BaseModel], tuple[ORMOption, ...]] = {
+    UserRead: (selectinload(User.roles),),
+    OrganizationWithRelations: (selectinload(Organization.departments),),
+}
+
+
+def loader_options(schema: type[BaseModel]) -> tuple[ORMOption, ...]:
+    """Return the loader options needed to serialize ``schema`` without lazy loads."""
+    return _LOADER_OPTIONS.get(schema, ())
+
+
+def refresh_for(db: Session, obj: T, schema: type[BaseModel]) -> T:
+    """Reload ``obj`` after a commit together with the relationships ``schema`` reads.
+
+    Unlike ``Session.refresh`` this leaves nothing to lazy-load during response
+    serialization, which async sessions cannot do.
+    """
+    mapper = inspect(obj).mapper
+    stmt = (
+        select(mapper)
+        .options(*loader_options(schema))
+        .where(*(column == value for column, value in zip(mapper.primary_key, mapper.primary_key_from_instance(obj))))
+        .execution_options(populate_existing=True)
+    )
+    return db.execute(stmt).scalar_one()
@@ -1,55 +1,216 @@
 """Service layer for Organization operations."""
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select
+from collections.abc import Iterable
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from app.core.cache import Cache
+from app.models.department import Department
 from app.models.organization import Organization
-from app.schemas.organization import OrganizationCreate, OrganizationUpdate
+from app.schemas.organization import (
+    OrganizationCreate,
+    OrganizationListFilters,
+    OrganizationRead,
+    OrganizationUpdate,
+    OrganizationWithRelations,
+)
+from app.services.audit_service import record_created, record_updated
+from app.services.batch import in_request_order, rows_by_id, unique_ids
+from app.services.fieldsets import Fields, fields_key, nested_fields, select_columns, sparse_adapter, sparse_model, wants
+from app.services.loading import loader_options
+from app.services.pagination import Page, page_version_of, paginate, resolve_sort
+from app.services.writes import constraint_errors, update_returning, update_values
 
+# Read models cached by id and list parameters; cleared after every committed write.
+organization_cache = Cache("organizations")
+
+# ``-name`` sorts descending; see USER_SORT_KEYS.
+ORGANIZATION_SORT_KEYS = {
+    "id": (Organization.id,),
+    "name": (Organization.name,),
+    "created_at": (Organization.created_at, Organization.id),
+}
+
+ORGANIZATION_READ_COLUMNS = (
+    Organization.id,
+    Organization.name,
+    Organization.description,
+    Organization.created_at,
+    Organization.updated_at,
+)
+ORGANIZATION_LIST_ADAPTER = TypeAdapter(list[OrganizationRead])
+
+# Columns behind DepartmentRead, for sparse organization details.
+DEPARTMENT_READ_COLUMNS = (
+    Department.id,
+    Department.name,
+    Department.organization_id,
+    Department.parent_id,
+    Department.path,
+    Department.depth,
+)
 
-def create_organization(db: Session, data: OrganizationCreate) -> Organization:
-    org = Organization(name=data.name, description=data.description)
-    db.add(org)
-    db.commit()
-    db.refresh(org)
-    return org
+
+def create_organization(db: Session, data: OrganizationCreate) -> OrganizationRead:
+    """INSERT ... RETURNING; a duplicate name raises ConstraintViolation."""
+    stmt = insert(Organization).values(name=data.name, description=data.description)
+    with constraint_errors(db, "Organization name already exists"):
+        row = db.execute(stmt.returning(*ORGANIZATION_READ_COLUMNS)).one()
+        record_created(db, "organization", [row._asdict()])
+        db.commit()
+    organization_cache.clear()
+    return OrganizationRead.model_validate(row._asdict())
 
 
 def get_organization(db: Session, org_id: int) -> Organization | None:
     return db.get(Organization, org_id)
 
 
+def _to_read(org: Organization | None) -> OrganizationRead | None:
+    return OrganizationRead.model_validate(org) if org is not None else None
+
+
+def get_organization_read(db: Session, org_id: int) -> OrganizationRead | None:
+    """Cached read model of an organization, for GET handlers that only serialize it."""
+    return organization_cache.get_or_load(("id", org_id), lambda: _to_read(get_organization(db, org_id)))
+
+
+def get_organizations_read(db: Session, ids: Iterable[int]) -> tuple[list[OrganizationRead], list[int]]:
+    """Organizations with the given ids as ``(items in request order, missing ids)``.
+
+    Cached read models are used as they are; the rest are loaded with chunked
+    IN queries and cached like get_organization_read's.
+    """
+    ids = unique_ids(ids)
+    cached = organization_cache.get_many(("id", org_id) for org_id in ids)
+    found = {key[1]: org for key, org in cached.items()}
+    rest = [org_id for org_id in ids if org_id not in found]
+    if rest:
+        rows = rows_by_id(db, select(*ORGANIZATION_READ_COLUMNS), Organization.id, rest)
+        for org in ORGANIZATION_LIST_ADAPTER.validate_python(list(rows.values())):
+            organization_cache.set(("id", org.id), org)
+            found[org.id] = org
+    return in_request_order(ids, found)
+
+
 def get_organization_with_relations(db: Session, org_id: int) -> Organization | None:
     """Load organization with related collections for detailed view."""
     stmt = (
         select(Organization)
-        .options(
-            selectinload(Organization.departments)
-        )
+        .options(*loader_options(OrganizationWithRelations))
         .where(Organization.id == org_id)
     )
     return db.execute(stmt).scalar_one_or_none()
 
 
+def get_organization_detail_fields(db: Session, org_id: int, fields: Fields) -> BaseModel | None:
+    """``sparse_model(OrganizationWithRelations, fields)`` of an organization, reading only selected columns.
+
+    Departments are read (as rows, in id order) only when selected, and only
+    the department columns the selection names.
+    """
+    row = db.execute(
+        select(*select_columns(ORGANIZATION_READ_COLUMNS, fields)).where(Organization.id == org_id)
+    ).one_or_none()
+    if row is None:
+        return None
+    org = row._asdict()
+    if wants(fields, "departments"):
+        columns = select_columns(DEPARTMENT_READ_COLUMNS, nested_fields(fields, "departments"))
+        departments = db.execute(
+            select(*columns).where(Department.organization_id == org_id).order_by(Department.id)
+        )
+        org["departments"] = [department._asdict() for department in departments]
+    return sparse_model(OrganizationWithRelations, fields).model_validate(org)
+
+
 def get_organization_by_name(db: Session, name: str) -> Organization | None:
     stmt = select(Organization).where(Organization.name == name)
     return db.execute(stmt).scalar_one_or_none()
 
 
-def list_organizations(db: Session, skip: int = 0, limit: int = 100) -> list[Organization]:
-    stmt = select(Organization).offset(skip).limit(limit)
-    return list(db.execute(stmt).scalars().all())
+def filter_organizations(stmt, filters: OrganizationListFilters | None):
+    """Add the WHERE clauses for ``filters`` to a statement selecting from organizations."""
+    if filters is None:
+        return stmt
+    if filters.name_prefix is not None:
+        stmt = stmt.where(Organization.name.startswith(filters.name_prefix, autoescape=True))
+    if filters.created_after is not None:
+        stmt = stmt.where(Organization.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        stmt = stmt.where(Organization.created_at < filters.created_before)
+    return stmt
 
 
-def update_organization(db: Session, org: Organization, data: OrganizationUpdate) -> Organization:
-    if data.name is not None:
-        org.name = data.name
-    if data.description is not None:
-        org.description = data.description
-    db.add(org)
-    db.commit()
-    db.refresh(org)
-    return org
+def list_organizations(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    order_by: str = "id",
+    filters: OrganizationListFilters | None = None,
+) -> Page[Organization]:
+    stmt = filter_organizations(select(Organization), filters)
+    keys, descending = resolve_sort(ORGANIZATION_SORT_KEYS, order_by)
+    return paginate(db, stmt, keys, limit=limit, skip=skip, after=after, descending=descending)
+
+
+def list_organizations_read(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    order_by: str = "id",
+    filters: OrganizationListFilters | None = None,
+    fields: Fields | None = None,
+) -> Page[OrganizationRead]:
+    """Cached variant of list_organizations returning read models.
+
+    Loads only OrganizationRead's columns as rows and validates the page with a
+    single TypeAdapter call. With ``fields`` only the selected columns (plus
+    sort keys and ``updated_at`` for the page version) are read and items are
+    ``sparse_model(OrganizationRead, fields)``; each selection is cached apart.
+    """
+    keys, descending = resolve_sort(ORGANIZATION_SORT_KEYS, order_by)
+
+    def load() -> Page[OrganizationRead]:
+        columns = select_columns(ORGANIZATION_READ_COLUMNS, fields, ["updated_at", *(key.key for key in keys)])
+        stmt = filter_organizations(select(*columns), filters)
+        page = paginate(
+            db, stmt, keys, limit=limit, skip=skip, after=after, rows=True, descending=descending
+        )
+        adapter = ORGANIZATION_LIST_ADAPTER if fields is None else sparse_adapter(OrganizationRead, fields)
+        items = adapter.validate_python([row._asdict() for row in page.items])
+        return Page(items, page.next_cursor, page_version_of(page.items))
+
+    return organization_cache.get_or_load(
+        ("list", skip, limit, after, order_by, filters, fields_key(fields)), load
+    )
+
+
+def export_organizations_stmt():
+    """Statement behind GET /organizations/export: OrganizationRead's columns in id order."""
+    return select(*ORGANIZATION_READ_COLUMNS).order_by(Organization.id)
+
+
+def update_organization(
+    db: Session, org_id: int, data: OrganizationUpdate, partial: bool = False
+) -> OrganizationRead | None:
+    """One UPDATE ... RETURNING without loading the row; None if it does not exist.
+
+    See ``update_values`` for PUT (``partial=False``) vs PATCH semantics.
+    """
+    values = update_values(Organization, data, partial)
+    with constraint_errors(db, "Organization name already exists"):
+        row = update_returning(db, Organization, org_id, values, ORGANIZATION_READ_COLUMNS)
+        if row is not None:
+            record_updated(db, "organization", [org_id], values)
+        db.commit()
+    if values:
+        organization_cache.clear()
+    return OrganizationRead.model_validate(row._asdict()) if row is not None else None
 
 
 def delete_organization(db: Session, org: Organization) -> None:
     db.delete(org)
     db.commit()
+    organization_cache.clear()
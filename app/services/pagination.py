@@ -0,0 +1,178 @@
+"""Keyset (cursor) pagination shared by the list services.
+
+OFFSET pagination makes the database walk and discard ``skip`` rows for every
+page. With a cursor the next page starts right after the last key seen, so each
+page is a bounded index range scan no matter how deep the client has paged.
+
+Cursors are opaque to clients: URL-safe base64 of the sort key names and the
+last row's key values. Descending orderings prefix the key names with ``-`` so
+a cursor cannot be replayed against the opposite direction; datetimes travel
+as ISO strings.
+"""
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Generic, NamedTuple, TypeVar
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or does not match the requested ordering."""
+
+
+class Page(NamedTuple, Generic[T]):
+    items: list[T]
+    next_cursor: str | None
+    # page_version_of the loaded rows, for services whose items may not carry id/updated_at
+    version: tuple[Any, ...] | None = None
+
+
+def _cursor_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_cursor(keys: Sequence[str], values: Sequence[Any]) -> str:
+    raw = json.dumps({"k": list(keys), "v": [_cursor_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[str]) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursor("Malformed cursor") from exc
+    if not isinstance(data, dict) or data.get("k") != list(keys):
+        raise InvalidCursor("Cursor does not match the requested ordering")
+    values = data.get("v")
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursor("Malformed cursor")
+    return values
+
+
+# Key column type -> JSON types its cursor values may have (datetimes travel as ISO strings)
+_CURSOR_TYPES: dict[type, tuple[type, ...]] = {
+    int: (int,),
+    float: (int, float),
+    str: (str,),
+    datetime: (str,),
+}
+
+
+def _key_values(keys: Sequence[InstrumentedAttribute], values: list[Any]) -> list[Any]:
+    """Check decoded cursor values against the key columns and turn them back into their Python types."""
+    converted = []
+    for key, value in zip(keys, values):
+        if value is not None:
+            try:
+                python_type = key.type.python_type
+            except NotImplementedError:
+                python_type = None
+            expected = _CURSOR_TYPES.get(python_type, (int, float, str))
+            # bool is an int subclass, but never a valid key value here.
+            if isinstance(value, bool) or not isinstance(value, expected):
+                raise InvalidCursor("Malformed cursor")
+            if python_type is datetime:
+                try:
+                    value = datetime.fromisoformat(value)
+                except ValueError as exc:
+                    raise InvalidCursor("Malformed cursor") from exc
+        converted.append(value)
+    return converted
+
+
+def resolve_sort(
+    sort_keys: dict[str, Sequence[InstrumentedAttribute]], order_by: str
+) -> tuple[Sequence[InstrumentedAttribute], bool]:
+    """Map an ``order_by`` value such as ``"email"`` or ``"-created_at"`` to (keys, descending)."""
+    descending = order_by.startswith("-")
+    return sort_keys[order_by.lstrip("-")], descending
+
+
+def _cursor_names(keys: Sequence[InstrumentedAttribute], descending: bool) -> list[str]:
+    names = [key.key for key in keys]
+    return [f"-{name}" for name in names] if descending else names
+
+
+def page_statement(
+    stmt: Select,
+    keys: Sequence[InstrumentedAttribute],
+    *,
+    limit: int,
+    skip: int = 0,
+    after: str | None = None,
+    descending: bool = False,
+) -> Select:
+    """``stmt`` restricted to one page: cursor or offset, ORDER BY the keys, LIMIT."""
+    if after is not None:
+        values = _key_values(keys, decode_cursor(after, _cursor_names(keys, descending)))
+        left, right = (keys[0], values[0]) if len(keys) == 1 else (tuple_(*keys), tuple_(*values))
+        stmt = stmt.where(left < right if descending else left > right)
+    elif skip:
+        stmt = stmt.offset(skip)
+    order = [key.desc() for key in keys] if descending else keys
+    return stmt.order_by(*order).limit(limit)
+
+
+def paginate(
+    db: Session,
+    stmt: Select,
+    keys: Sequence[InstrumentedAttribute],
+    *,
+    limit: int,
+    skip: int = 0,
+    after: str | None = None,
+    rows: bool = False,
+    descending: bool = False,
+) -> Page:
+    """Execute ``stmt`` ordered by ``keys`` and return one page plus the cursor for the next.
+
+    ``keys`` must be unique together (end with the primary key or a unique column).
+    When ``after`` is given it takes precedence over ``skip``. With ``rows=True``
+    ``stmt`` selects columns and the page holds ``Row`` tuples, which must
+    include the key columns, instead of ORM entities. ``descending`` reverses
+    every key, so an index on the keys is still walked in one direction.
+    """
+    page_stmt = page_statement(stmt, keys, limit=limit, skip=skip, after=after, descending=descending)
+    result = db.execute(page_stmt)
+    items = list(result.all() if rows else result.scalars().all())
+    next_cursor = None
+    if items and len(items) == limit:
+        last = items[-1]
+        next_cursor = encode_cursor(_cursor_names(keys, descending), [getattr(last, key.key) for key in keys])
+    return Page(items, next_cursor)
+
+
+def page_version(
+    db: Session,
+    stmt: Select,
+    keys: Sequence[InstrumentedAttribute],
+    *,
+    limit: int,
+    skip: int = 0,
+    after: str | None = None,
+    descending: bool = False,
+) -> tuple[Any, ...]:
+    """(row count, sum of ids, max updated_at) of the rows a page would hold.
+
+    ``stmt`` selects exactly an ``id`` and an ``updated_at`` column. The page
+    query runs without fetching the rows, so this costs about one index range
+    scan. Any committed write to the page changes the result: updates move
+    ``updated_at`` forward, and inserts or deletes change the count or the id sum.
+    """
+    window = page_statement(stmt, keys, limit=limit, skip=skip, after=after, descending=descending).subquery()
+    return tuple(
+        db.execute(select(func.count(), func.sum(window.c.id), func.max(window.c.updated_at))).one()
+    )
+
+
+def page_version_of(items: Sequence[Any]) -> tuple[Any, ...]:
+    """``page_version`` computed from an already loaded page (items with ``id`` and ``updated_at``)."""
+    if not items:
+        return (0, None, None)
+    return (len(items), sum(item.id for item in items), max(item.updated_at for item in items))
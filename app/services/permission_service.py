@@ -0,0 +1,186 @@
+"""Effective permissions of users, precomputed per user.
+
+A user's roles come from two places: direct assignments (``user_roles``) and
+department grants (``department_roles``) on the user's own department or, for
+grants with ``include_subdepartments``, on any of its ancestors (read from the
+materialized ``path``). The union of those roles' permission sets is folded
+into one bitmask (app/core/permissions.py) and kept in ``permission_cache``,
+so ``has_permission`` costs one cache lookup and one AND. The cache is an
+in-process LRU of its own (PERMISSION_CACHE_MAX_ENTRIES), apart from the
+shared organization/role backend: one entry per user would otherwise evict
+those pages, and a shared SQLite backend would turn every lookup into a read.
+
+Entries are invalidated after commit by the session hooks at the bottom of
+this module: unit-of-work changes to one user's roles, department or active
+flag drop that user's entry; changes to roles, department grants or the
+hierarchy, and set-based statements on those tables, drop them all.
+Set-based writes to ``users`` and ``user_roles`` are not inspected: the
+services report the users whose department, active flag or direct roles
+they changed (the ids their RETURNING clauses give) through
+``invalidate_permissions``. Writes made outside a ``Session``, and writes
+committed by other worker processes, are only picked up when the entry
+expires (CACHE_TTL_SECONDS).
+"""
+from collections.abc import Iterable
+from itertools import chain
+from sqlalchemy import and_, event, inspect, or_, select, union
+from sqlalchemy.orm import ORMExecuteState, Session
+from app.core.cache import Cache, local_cache_backend
+from app.core.config import get_settings
+from app.core.permissions import PERMISSION_BITS, permission_mask, permission_names
+from app.models.department import Department
+from app.models.role import DepartmentRole, Role, user_roles
+from app.models.user import User
+
+# user id -> permission bitmask
+permission_cache = Cache("permissions", backend=local_cache_backend(get_settings().PERMISSION_CACHE_MAX_ENTRIES))
+
+
+class UnknownPermission(ValueError):
+    """Raised when a check names a permission outside the catalog."""
+
+
+class GrantError(ValueError):
+    """Raised when a department grant refers to a missing department or role."""
+
+
+def _load_mask(db: Session, user_id: int) -> int | None:
+    user = db.execute(
+        select(User.is_active, Department.id, Department.path)
+        .outerjoin(Department, Department.id == User.department_id)
+        .where(User.id == user_id)
+    ).first()
+    if user is None:
+        return None  # not cached, so a user created later with this id is not shadowed
+    is_active, department_id, path = user
+    if not is_active:
+        return 0
+
+    role_ids = select(user_roles.c.role_id).where(user_roles.c.user_id == user_id)
+    if department_id is not None:
+        ancestor_ids = [int(part) for part in path.strip("/").split("/")[:-1]]
+        granted = select(DepartmentRole.role_id).where(
+            or_(
+                DepartmentRole.department_id == department_id,
+                and_(DepartmentRole.department_id.in_(ancestor_ids), DepartmentRole.include_subdepartments),
+            )
+        )
+        role_ids = union(role_ids, granted)
+    permission_sets = db.execute(select(Role.permissions).where(Role.id.in_(role_ids))).scalars()
+    return permission_mask(chain.from_iterable(permission_sets))
+
+
+def effective_mask(db: Session, user_id: int) -> int | None:
+    """Cached permission bitmask of a user, or None when the user does not exist."""
+    return permission_cache.get_or_load(user_id, lambda: _load_mask(db, user_id))
+
+
+def effective_permissions(db: Session, user_id: int) -> list[str] | None:
+    mask = effective_mask(db, user_id)
+    return None if mask is None else permission_names(mask)
+
+
+def has_permission(db: Session, user_id: int, permission: str) -> bool:
+    """Whether the user holds ``permission`` through any direct or department role."""
+    bit = PERMISSION_BITS.get(permission)
+    if bit is None:
+        raise UnknownPermission(f"Unknown permission: {permission}")
+    return bool((effective_mask(db, user_id) or 0) & bit)
+
+
+# ========== Department grants ==========
+def grant_department_role(
+    db: Session, department_id: int, role_id: int, include_subdepartments: bool = True
+) -> DepartmentRole:
+    if db.get(Department, department_id) is None:
+        raise GrantError("Department not found")
+    if db.get(Role, role_id) is None:
+        raise GrantError("Role not found")
+    grant = db.get(DepartmentRole, (department_id, role_id))
+    if grant is None:
+        grant = DepartmentRole(department_id=department_id, role_id=role_id)
+        db.add(grant)
+    grant.include_subdepartments = include_subdepartments
+    db.commit()
+    return grant
+
+
+def revoke_department_role(db: Session, department_id: int, role_id: int) -> bool:
+    """Remove a department grant; False when there was none."""
+    grant = db.get(DepartmentRole, (department_id, role_id))
+    if grant is None:
+        return False
+    db.delete(grant)
+    db.commit()
+    return True
+
+
+# ========== Invalidation ==========
+_PENDING = "permission_cache_pending"
+_ALL = "all"
+
+# Tables whose set-based writes can change anyone's effective permissions.
+# (users and user_roles writes are reported per user by the services.)
+_WATCHED_TABLES = {"roles", "department_roles", "departments"}
+
+# User columns that permissions depend on; services report set-based writes to them.
+PERMISSION_USER_FIELDS = frozenset({"department_id", "is_active"})
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING, set())
+
+
+def invalidate_permissions(db: Session, user_ids: Iterable[int]) -> None:
+    """Drop the cached entries of ``user_ids`` when ``db`` commits (set-based writes
+    to their department, active flag or direct roles)."""
+    _pending(db).update(user_ids)
+
+
+def _changed(obj, *attributes: str) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    # new/dirty/deleted and attribute history still describe the flushed changes here.
+    pending = _pending(session)
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, User) and (obj in session.deleted or _changed(obj, "roles", "department_id", "is_active")):
+            pending.add(obj.id)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        deleted, dirty = obj in session.deleted, obj in session.dirty
+        if isinstance(obj, DepartmentRole):
+            pending.add(_ALL)
+        elif isinstance(obj, Role) and (deleted or _changed(obj, "users") or (dirty and _changed(obj, "permissions"))):
+            pending.add(_ALL)
+        elif isinstance(obj, Department) and (deleted or (dirty and _changed(obj, "path", "parent_id"))):
+            pending.add(_ALL)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statements(state: ORMExecuteState) -> None:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    table = getattr(state.statement, "table", None)
+    # A bulk write to roles, grants or the hierarchy may affect many users.
+    if table is not None and table.name in _WATCHED_TABLES:
+        _pending(state.session).add(_ALL)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    if _ALL in pending:
+        permission_cache.clear()
+        return
+    for user_id in pending:
+        permission_cache.delete(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_PENDING, None)
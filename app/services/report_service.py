@@ -0,0 +1,253 @@
+"""Headcount reports and maintenance of the ``headcounts`` summary table.
+
+Reports read the summary (app/models/report.py), so their cost grows with the
+number of groups rather than the number of users. ``live=True`` computes the
+same figures with GROUP BY over users and user_roles instead, for checks.
+
+The summary is kept current inside the writing transaction:
+
+- unit-of-work changes to ``User`` (insert, delete, organization, department,
+  active flag, roles) through the session hooks at the bottom of this module,
+  which diff the affected users' groups before and after each flush;
+- set-based writes in the services (user create/bulk import/update, role
+  membership, role and department deletion) through ``apply_headcount_delta``
+  and ``tracked_users``.
+
+Core statements outside those paths are not seen; ``rebuild_headcounts``
+(app/db/headcounts.py) recomputes the table.
+"""
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from itertools import chain
+from typing import Any
+from sqlalchemy import Select, and_, delete, event, func, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.department import Department
+from app.models.organization import Organization
+from app.models.report import Headcount
+from app.models.role import Role, user_roles
+from app.models.user import User
+from app.db.headcounts import headcount_queries
+
+# (kind, group id, is_active) -> change in the number of users
+HeadcountDelta = Counter
+
+# User attributes that decide which groups a user is counted in
+_GROUP_ATTRIBUTES = ("organization_id", "department_id", "is_active", "roles")
+
+
+# ========== Reports ==========
+def _fold(rows: Iterable[Any]) -> dict[int, dict[str, int]]:
+    """(group id, is_active, count) rows -> {group id: {"active": n, "inactive": n}}."""
+    counts: dict[int, dict[str, int]] = {}
+    for group_id, is_active, count in rows:
+        entry = counts.setdefault(group_id, {"active": 0, "inactive": 0})
+        entry["active" if is_active else "inactive"] += count
+    return counts
+
+
+def _group_counts(db: Session, kind: str, live: bool, where=None) -> dict[int, dict[str, int]]:
+    if live:
+        query = dict(headcount_queries())[kind]
+        if where is not None:
+            query = query.where(where)
+        return _fold((group_id, is_active, count) for _, group_id, is_active, count in db.execute(query))
+    stmt = select(Headcount.group_id, Headcount.is_active, Headcount.count).where(Headcount.kind == kind)
+    if where is not None:
+        stmt = stmt.where(where)
+    return _fold(db.execute(stmt))
+
+
+def _row(group_id: int, name: str, counts: dict[str, int] | None, **extra: Any) -> dict[str, Any]:
+    active, inactive = (counts["active"], counts["inactive"]) if counts else (0, 0)
+    return {"id": group_id, "name": name, "active": active, "inactive": inactive, "total": active + inactive, **extra}
+
+
+def organization_headcounts(db: Session, live: bool = False) -> list[dict[str, Any]]:
+    """Active/inactive users of every organization, in id order."""
+    counts = _group_counts(db, "organization", live)
+    organizations = db.execute(select(Organization.id, Organization.name).order_by(Organization.id))
+    return [_row(org_id, name, counts.get(org_id)) for org_id, name in organizations]
+
+
+def role_headcounts(db: Session, live: bool = False) -> list[dict[str, Any]]:
+    """Active/inactive holders of every role (direct assignments), in id order."""
+    counts = _group_counts(db, "role", live)
+    roles = db.execute(select(Role.id, Role.name).order_by(Role.id))
+    return [_row(role_id, name, counts.get(role_id)) for role_id, name in roles]
+
+
+def department_headcounts(db: Session, organization_id: int, live: bool = False) -> list[dict[str, Any]]:
+    """Users of every department of an organization including all sub-departments, in path order.
+
+    ``direct`` is the number of the department's own members. Subtree totals are
+    summed from the per-department counts along the materialized paths.
+    """
+    departments = db.execute(
+        select(Department.id, Department.name, Department.parent_id, Department.path)
+        .where(Department.organization_id == organization_id)
+        .order_by(Department.path)
+    ).all()
+    ids = [dept.id for dept in departments]
+    if live:
+        where = User.department_id.in_(ids)
+    else:
+        where = Headcount.group_id.in_(ids)
+    direct = _group_counts(db, "department", live, where) if ids else {}
+
+    subtree = {dept_id: {"active": 0, "inactive": 0} for dept_id in ids}
+    for dept in departments:
+        own = direct.get(dept.id)
+        if not own:
+            continue
+        for ancestor in dept.path.strip("/").split("/"):
+            target = subtree.get(int(ancestor))
+            if target is not None:
+                target["active"] += own["active"]
+                target["inactive"] += own["inactive"]
+    return [
+        _row(
+            dept.id,
+            dept.name,
+            subtree[dept.id],
+            parent_id=dept.parent_id,
+            direct=sum(direct.get(dept.id, {}).values()),
+        )
+        for dept in departments
+    ]
+
+
+# ========== Maintenance ==========
+def user_groups(
+    organization_id: int, department_id: int | None, is_active: bool, role_ids: Iterable[int] = ()
+) -> Iterator[tuple]:
+    """Summary keys one user with these attributes is counted under."""
+    yield "organization", organization_id, is_active
+    if department_id is not None:
+        yield "department", department_id, is_active
+    for role_id in role_ids:
+        yield "role", role_id, is_active
+
+
+def _upsert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(Headcount)
+    if dialect == "postgresql":
+        return postgresql.insert(Headcount)
+    return None
+
+
+def apply_headcount_delta(db: Session, delta: HeadcountDelta) -> None:
+    """Add ``delta`` to the summary in the current transaction (one upsert per changed group)."""
+    changes = [{"kind": k, "group_id": g, "is_active": a, "count": n} for (k, g, a), n in delta.items() if n]
+    if not changes:
+        return
+    # On the connection: these writes must not re-enter the session's flush hooks.
+    connection = db.connection()
+    stmt = _upsert(db)
+    if stmt is not None:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["kind", "group_id", "is_active"], set_={"count": Headcount.count + stmt.excluded.count}
+        )
+        connection.execute(stmt, changes)
+        return
+    for change in changes:  # pragma: no cover - other backends
+        key = and_(
+            Headcount.kind == change["kind"],
+            Headcount.group_id == change["group_id"],
+            Headcount.is_active == change["is_active"],
+        )
+        result = connection.execute(update(Headcount).where(key).values(count=Headcount.count + change["count"]))
+        if result.rowcount == 0:
+            connection.execute(Headcount.__table__.insert().values(**change))
+
+
+def _snapshot(db: Session, user_ids: Iterable[int]) -> HeadcountDelta:
+    """Groups of the given users as currently stored (in this transaction)."""
+    ids = list(user_ids)
+    counts: HeadcountDelta = Counter()
+    if not ids:
+        return counts
+    connection = db.connection()
+    roles: dict[int, list[int]] = {}
+    for user_id, role_id in connection.execute(
+        select(user_roles.c.user_id, user_roles.c.role_id).where(user_roles.c.user_id.in_(ids))
+    ):
+        roles.setdefault(user_id, []).append(role_id)
+    for user in connection.execute(
+        select(User.id, User.organization_id, User.department_id, User.is_active).where(User.id.in_(ids))
+    ):
+        counts.update(user_groups(user.organization_id, user.department_id, user.is_active, roles.get(user.id, ())))
+    return counts
+
+
+@contextmanager
+def tracked_users(db: Session, user_ids: Iterable[int]) -> Iterator[None]:
+    """Apply the change in the given users' groups made by the enclosed statements."""
+    user_ids = list(user_ids)
+    before = _snapshot(db, user_ids)
+    yield
+    after = _snapshot(db, user_ids)
+    after.subtract(before)
+    apply_headcount_delta(db, after)
+
+
+def role_member_counts(db: Session, members: Select) -> dict[bool, int]:
+    """{is_active: n} over a SELECT of user ids, to adjust a role's counts for a membership change."""
+    return dict(
+        db.connection().execute(
+            select(User.is_active, func.count()).where(User.id.in_(members)).group_by(User.is_active)
+        ).all()
+    )
+
+
+def drop_headcount_group(db: Session, kind: str, group_id: int) -> None:
+    """Forget a deleted department or role."""
+    db.connection().execute(delete(Headcount).where(Headcount.kind == kind, Headcount.group_id == group_id))
+
+
+# ========== Session hooks ==========
+_PRE_FLUSH = "headcount_pre_flush"
+
+
+def _changed(obj: User) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in _GROUP_ATTRIBUTES)
+
+
+def _role_members(obj: Role) -> set[int]:
+    """Persistent users added to or removed from ``Role.users`` in this flush."""
+    history = inspect(obj).attrs.users.history
+    return {user.id for user in chain(history.added, history.deleted) if user.id is not None}
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, flush_context, instances) -> None:
+    session.info.pop(_PRE_FLUSH, None)  # left over by a failed flush
+    ids: set[int] = set()
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, User) and obj.id is not None and (obj in session.deleted or _changed(obj)):
+            ids.add(obj.id)
+        elif isinstance(obj, Role) and obj in session.dirty:
+            ids |= _role_members(obj)
+    for obj in session.new:
+        if isinstance(obj, Role):
+            ids |= _role_members(obj)
+    if not ids and not any(isinstance(obj, User) for obj in session.new):
+        return
+    session.info[_PRE_FLUSH] = (ids, _snapshot(session, ids))
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    pending = session.info.pop(_PRE_FLUSH, None)
+    if pending is None:
+        return
+    ids, before = pending
+    ids = ids | {obj.id for obj in session.new if isinstance(obj, User)}
+    after = _snapshot(session, ids)
+    after.subtract(before)
+    apply_headcount_delta(session, after)
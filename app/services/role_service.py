@@ -1,43 +1,215 @@
 """Service layer for Role operations."""
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from app.models.role import Role
-from app.schemas.role import RoleCreate, RoleUpdate
+from sqlalchemy import delete, insert, literal, select, update
+from app.core.cache import Cache
+from app.core.permissions import permission_mask, permission_names
+from app.models.department import Department
+from app.models.role import DepartmentRole, Role, user_roles
+from app.models.user import User
+from app.schemas.role import RoleCreate, RoleMembersChange, RoleRead, RoleUpdate
+from app.services.audit_service import record_created, record_membership, record_updated
+from app.services.batch import in_request_order, rows_by_id, unique_ids
+from app.services.department_service import subtree_department_ids
+from app.services.pagination import Page, paginate
+from app.services.permission_service import invalidate_permissions
+from app.services.report_service import apply_headcount_delta, drop_headcount_group, role_member_counts
+from app.services.writes import constraint_errors, update_returning, update_values
 
+# Read models cached by id and list parameters; cleared after every committed write.
+role_cache = Cache("roles")
 
-def create_role(db: Session, data: RoleCreate) -> Role:
-    role = Role(name=data.name, description=data.description)
-    db.add(role)
-    db.commit()
-    db.refresh(role)
-    return role
+ROLE_SORT_KEYS = {
+    "id": (Role.id,),
+    "name": (Role.name,),
+}
+
+
+ROLE_READ_COLUMNS = (Role.id, Role.name, Role.description, Role.permissions)
+ROLE_LIST_ADAPTER = TypeAdapter(list[RoleRead])
+
+
+def create_role(db: Session, data: RoleCreate) -> RoleRead:
+    """INSERT ... RETURNING; a duplicate name raises ConstraintViolation."""
+    stmt = insert(Role).values(
+        name=data.name,
+        description=data.description,
+        permissions=permission_names(permission_mask(data.permissions)),
+    )
+    with constraint_errors(db, "Role name already exists"):
+        row = db.execute(stmt.returning(*ROLE_READ_COLUMNS)).one()
+        record_created(db, "role", [row._asdict()])
+        db.commit()
+    role_cache.clear()
+    return RoleRead.model_validate(row._asdict())
 
 
 def get_role(db: Session, role_id: int) -> Role | None:
     return db.get(Role, role_id)
 
 
+def _to_read(role: Role | None) -> RoleRead | None:
+    return RoleRead.model_validate(role) if role is not None else None
+
+
+def get_role_read(db: Session, role_id: int) -> RoleRead | None:
+    """Cached read model of a role, for GET handlers that only serialize it."""
+    return role_cache.get_or_load(("id", role_id), lambda: _to_read(get_role(db, role_id)))
+
+
+def get_roles_read(db: Session, ids: Iterable[int]) -> tuple[list[RoleRead], list[int]]:
+    """Roles with the given ids as ``(items in request order, missing ids)``; see get_organizations_read."""
+    ids = unique_ids(ids)
+    cached = role_cache.get_many(("id", role_id) for role_id in ids)
+    found = {key[1]: role for key, role in cached.items()}
+    rest = [role_id for role_id in ids if role_id not in found]
+    if rest:
+        rows = rows_by_id(db, select(*ROLE_READ_COLUMNS), Role.id, rest)
+        for role in ROLE_LIST_ADAPTER.validate_python(list(rows.values())):
+            role_cache.set(("id", role.id), role)
+            found[role.id] = role
+    return in_request_order(ids, found)
+
+
 def get_role_by_name(db: Session, name: str) -> Role | None:
     stmt = select(Role).where(Role.name == name)
     return db.execute(stmt).scalar_one_or_none()
 
 
-def list_roles(db: Session, skip: int = 0, limit: int = 100) -> list[Role]:
-    stmt = select(Role).offset(skip).limit(limit)
-    return list(db.execute(stmt).scalars().all())
+def list_roles(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    order_by: str = "id",
+) -> Page[Role]:
+    stmt = select(Role)
+    return paginate(db, stmt, ROLE_SORT_KEYS[order_by], limit=limit, skip=skip, after=after)
 
 
-def update_role(db: Session, role: Role, data: RoleUpdate) -> Role:
-    if data.name is not None:
-        role.name = data.name
-    if data.description is not None:
-        role.description = data.description
-    db.add(role)
-    db.commit()
-    db.refresh(role)
-    return role
+def list_roles_read(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    order_by: str = "id",
+) -> Page[RoleRead]:
+    """Cached variant of list_roles returning read models."""
+
+    def load() -> Page[RoleRead]:
+        page = list_roles(db, skip=skip, limit=limit, after=after, order_by=order_by)
+        return Page([RoleRead.model_validate(r) for r in page.items], page.next_cursor)
+
+    return role_cache.get_or_load(("list", skip, limit, after, order_by), load)
+
+
+def _touch_users(db: Session, user_ids) -> None:
+    """Bump ``updated_at`` of users whose nested roles changed (keeps their ETags honest)."""
+    db.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _holders(role_id: int):
+    return select(user_roles.c.user_id).where(user_roles.c.role_id == role_id)
+
+
+def update_role(db: Session, role_id: int, data: RoleUpdate, partial: bool = False) -> RoleRead | None:
+    """One UPDATE ... RETURNING without loading the role; None if it does not exist.
+
+    Renames also touch the holders' ``updated_at``, since users embed their roles.
+    """
+    values = update_values(Role, data, partial)
+    if "permissions" in values:
+        values["permissions"] = permission_names(permission_mask(values["permissions"]))
+    with constraint_errors(db, "Role name already exists"):
+        if values.keys() & {"name", "description"}:
+            _touch_users(db, _holders(role_id))
+        row = update_returning(db, Role, role_id, values, ROLE_READ_COLUMNS)
+        if row is not None:
+            record_updated(db, "role", [role_id], values)
+        db.commit()
+    if values:
+        role_cache.clear()
+    return RoleRead.model_validate(row._asdict()) if row is not None else None
 
 
 def delete_role(db: Session, role: Role) -> None:
+    _touch_users(db, _holders(role.id))
+    drop_headcount_group(db, "role", role.id)
+    # SQLite does not enforce the ON DELETE CASCADE; without this a role that
+    # later reuses the id would inherit the old grants.
+    holders = db.execute(
+        delete(user_roles).where(user_roles.c.role_id == role.id).returning(user_roles.c.user_id)
+    ).scalars().all()
+    record_membership(db, "role_removed", role.id, holders)
+    invalidate_permissions(db, holders)
+    db.execute(delete(DepartmentRole).where(DepartmentRole.role_id == role.id))
     db.delete(role)
     db.commit()
+    role_cache.clear()
+
+
+# ========== Membership ==========
+class MembershipError(ValueError):
+    """Raised when a membership change targets a missing department."""
+
+
+def _member_clause(db: Session, change: RoleMembersChange):
+    """WHERE clause on ``User`` selecting the users a membership change applies to."""
+    if change.user_ids is not None:
+        return User.id.in_(change.user_ids)
+    dept = db.get(Department, change.department_id)
+    if dept is None:
+        raise MembershipError("Department not found")
+    if change.include_subdepartments:
+        return User.department_id.in_(subtree_department_ids(dept))
+    return User.department_id == dept.id
+
+
+def _adjust_role_headcount(db: Session, role_id: int, user_ids, sign: int) -> None:
+    counts = role_member_counts(db, user_ids)
+    apply_headcount_delta(db, Counter({("role", role_id, active): sign * n for active, n in counts.items()}))
+
+
+def add_role_members(db: Session, role: Role, change: RoleMembersChange) -> int:
+    """Assign ``role`` to the selected users with one INSERT ... SELECT; returns the number added.
+
+    Unknown user ids and users who already hold the role are skipped by the
+    SELECT itself, so nothing is loaded into the session. The same selection
+    first bumps the new members' ``updated_at`` in one UPDATE.
+    """
+    new_members = select(User.id).where(_member_clause(db, change), User.id.not_in(_holders(role.id)))
+    _adjust_role_headcount(db, role.id, new_members, 1)
+    _touch_users(db, new_members)
+    source = new_members.add_columns(literal(role.id))
+    added = db.execute(
+        insert(user_roles).from_select(["user_id", "role_id"], source).returning(user_roles.c.user_id)
+    ).scalars().all()
+    record_membership(db, "role_added", role.id, added)
+    invalidate_permissions(db, added)
+    db.commit()
+    return len(added)
+
+
+def remove_role_members(db: Session, role: Role, change: RoleMembersChange) -> int:
+    """Revoke ``role`` from the selected users with one DELETE; returns the number removed."""
+    if change.user_ids is not None:
+        members = user_roles.c.user_id.in_(change.user_ids)
+    else:
+        members = user_roles.c.user_id.in_(select(User.id).where(_member_clause(db, change)))
+    _adjust_role_headcount(db, role.id, _holders(role.id).where(members), -1)
+    _touch_users(db, _holders(role.id).where(members))
+    removed = db.execute(
+        delete(user_roles).where(user_roles.c.role_id == role.id, members).returning(user_roles.c.user_id)
+    ).scalars().all()
+    record_membership(db, "role_removed", role.id, removed)
+    invalidate_permissions(db, removed)
+    db.commit()
+    return len(removed)
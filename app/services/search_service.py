@@ -0,0 +1,140 @@
+"""Search across users (name, email), departments and organizations (name).
+
+On SQLite the FTS5 tables from app/db/search_index.py are used:
+
+1. token index: every query word, the last one as a prefix (``"hong" "gil"*``), ranked with
+   bm25 (title weighted above body). FTS5 ranks all matches and keeps the best
+   ``limit`` (``ORDER BY rank LIMIT``), so an unspecific query ("u") costs more
+   than a precise one but never returns anything except the top matches;
+2. trigram index, only when the token index finds nothing: the whole query as
+   a substring (3+ characters, e.g. the middle of an email address).
+
+Other backends (no FTS index) use a case-insensitive LIKE over the base tables,
+which scans them: the migrations create no index for it.
+"""
+import re
+from collections.abc import Sequence
+from sqlalchemy import func, literal, or_, select, text, union_all
+from sqlalchemy.orm import Session
+from app.db.search_index import has_search_index
+from app.models.department import Department
+from app.models.organization import Organization
+from app.models.user import User
+from app.schemas.search import SearchResult
+
+_WORD = re.compile(r"\w+")
+
+
+def _token_query(q: str) -> str | None:
+    """All words must match; only the last one as a prefix (search-as-you-type).
+
+    Expanding a common leading word as a prefix ("user" -> every "user000123"
+    email token) would merge thousands of posting lists for no benefit.
+    """
+    words = _WORD.findall(q)
+    if not words:
+        return None
+    return " ".join([*(f'"{word}"' for word in words[:-1]), f'"{words[-1]}"*'])
+
+
+def _phrase(q: str) -> str:
+    return '"' + q.replace('"', '""') + '"'
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _filters(kinds: Sequence[str] | None, organization_id: int | None, params: dict) -> str:
+    clauses = []
+    if kinds:
+        names = []
+        for i, kind in enumerate(kinds):
+            params[f"kind{i}"] = kind
+            names.append(f":kind{i}")
+        clauses.append(f"s.kind IN ({', '.join(names)})")
+    if organization_id is not None:
+        params["organization_id"] = organization_id
+        clauses.append("s.organization_id = :organization_id")
+    return "".join(f" AND {clause}" for clause in clauses)
+
+
+def search(
+    db: Session,
+    q: str,
+    limit: int = 20,
+    kinds: Sequence[str] | None = None,
+    organization_id: int | None = None,
+) -> list[SearchResult]:
+    q = q.strip()
+    if not q:
+        return []
+    if not has_search_index(db.connection()):
+        return _search_like(db, q, limit, kinds, organization_id)
+
+    def run(sql: str, params: dict, match: str) -> list[SearchResult]:
+        params["limit"] = limit
+        return [
+            SearchResult(kind=kind, id=ref_id, title=title, subtitle=body or None, organization_id=org_id, match=match)
+            for kind, ref_id, title, body, org_id in db.execute(text(sql), params)
+        ]
+
+    token_query = _token_query(q)
+    if token_query:
+        params = {"match": token_query}
+        results = run(
+            f"SELECT s.kind, s.ref_id, s.title, s.body, s.organization_id FROM search_index AS s "
+            f"WHERE search_index MATCH :match AND rank MATCH 'bm25(10.0, 1.0)'"
+            f"{_filters(kinds, organization_id, params)} ORDER BY rank LIMIT :limit",
+            params,
+            "token",
+        )
+        if results:
+            return results
+    if len(q) < 3:
+        return []
+    params = {"match": _phrase(q)}
+    return run(
+        f"SELECT s.kind, s.ref_id, s.title, s.body, s.organization_id FROM search_trigram AS t "
+        f"JOIN search_index AS s ON s.rowid = t.rowid "
+        f"WHERE search_trigram MATCH :match{_filters(kinds, organization_id, params)} ORDER BY t.rank LIMIT :limit",
+        params,
+        "substring",
+    )
+
+
+def _search_like(
+    db: Session, q: str, limit: int, kinds: Sequence[str] | None, organization_id: int | None
+) -> list[SearchResult]:
+    pattern = _like_pattern(q)
+    sources = {
+        "user": select(
+            literal("user").label("kind"),
+            User.id,
+            func.coalesce(User.full_name, "").label("title"),
+            User.email.label("subtitle"),
+            User.organization_id,
+        ).where(or_(func.lower(User.full_name).like(pattern, escape="\\"), func.lower(User.email).like(pattern, escape="\\"))),
+        "department": select(
+            literal("department").label("kind"),
+            Department.id,
+            Department.name.label("title"),
+            literal(None).label("subtitle"),
+            Department.organization_id,
+        ).where(func.lower(Department.name).like(pattern, escape="\\")),
+        "organization": select(
+            literal("organization").label("kind"),
+            Organization.id,
+            Organization.name.label("title"),
+            literal(None).label("subtitle"),
+            Organization.id.label("organization_id"),
+        ).where(func.lower(Organization.name).like(pattern, escape="\\")),
+    }
+    selected = [stmt for kind, stmt in sources.items() if not kinds or kind in kinds]
+    combined = union_all(*selected).subquery()
+    stmt = select(combined)
+    if organization_id is not None:
+        stmt = stmt.where(combined.c.organization_id == organization_id)
+    rows = db.execute(stmt.limit(limit)).all()
+    return [SearchResult(**row._asdict(), match="substring") for row in rows]
@@ -1,33 +1,88 @@
 """Service layer for User operations."""
-from hashlib import sha256
+import csv
+import io
+import json
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from itertools import chain
+from typing import Any, BinaryIO
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import Row, insert, select, update
+from app.core.passwords import hash_password, hash_passwords
+from app.models.department import Department
+from app.models.role import Role, user_roles
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import (
+    BulkUserImportResult,
+    BulkUserRowResult,
+    UserCreate,
+    UserListFilters,
+    UserRead,
+    UserUpdate,
+)
+from app.services.audit_service import record_created, record_updated
+from app.services.department_service import subtree_department_ids
+from app.services.batch import id_chunks, in_request_order, unique_ids
+from app.services.export import list_agg
+from app.services.fieldsets import Fields, select_columns, sparse_adapter, sparse_model, wants
+from app.services.loading import loader_options
+from app.services.pagination import Page, page_version, page_version_of, paginate, resolve_sort
+from app.services.permission_service import PERMISSION_USER_FIELDS, invalidate_permissions
+from app.services.report_service import apply_headcount_delta, tracked_users, user_groups
+from app.services.writes import constraint_errors, update_returning, update_values
 
+# Orderings available to list_users (``-name`` sorts descending); each must be
+# unique so it can back a cursor.
+USER_SORT_KEYS = {
+    "id": (User.id,),
+    "email": (User.email,),
+    "created_at": (User.created_at, User.id),
+}
 
-def _hash_password(raw: str) -> str:
-    # NOTE: For real applications use passlib/bcrypt or Argon2. This is for demo/testing only.
-    return sha256(raw.encode("utf-8")).hexdigest()
+# Columns behind UserRead (besides roles), selected as plain rows by list_users_read.
+USER_READ_COLUMNS = (
+    User.id,
+    User.email,
+    User.full_name,
+    User.is_active,
+    User.organization_id,
+    User.department_id,
+    User.created_at,
+    User.updated_at,
+)
+USER_LIST_ADAPTER = TypeAdapter(list[UserRead])
 
 
-def create_user(db: Session, data: UserCreate) -> User:
-    user = User(
+def create_user(db: Session, data: UserCreate, hashed_password: str | None = None) -> UserRead:
+    """INSERT ... RETURNING; a registered email raises ConstraintViolation.
+
+    Async handlers hash beforehand (``ahash_password``) and pass ``hashed_password``.
+    """
+    stmt = insert(User).values(
         email=data.email,
         full_name=data.full_name,
-        hashed_password=_hash_password(data.password),
+        hashed_password=hashed_password or hash_password(data.password),
         is_active=data.is_active,
         organization_id=data.organization_id,
         department_id=data.department_id,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    with constraint_errors(db, "Email already registered"):
+        row = db.execute(stmt.returning(*USER_READ_COLUMNS)).one()
+        apply_headcount_delta(db, Counter(user_groups(row.organization_id, row.department_id, row.is_active)))
+        record_created(db, "user", [row._asdict()])
+        db.commit()
+    return UserRead.model_validate({**row._asdict(), "roles": []})
 
 
 def get_user(db: Session, user_id: int) -> User | None:
-    return db.get(User, user_id)
+    return db.get(User, user_id, options=loader_options(UserRead))
+
+
+def get_user_version(db: Session, user_id: int) -> datetime | None:
+    """``updated_at`` of a user (None if missing): the validator behind GET /users/{id}."""
+    return db.execute(select(User.updated_at).where(User.id == user_id)).scalar_one_or_none()
 
 
 def get_user_by_email(db: Session, email: str) -> User | None:
@@ -35,24 +90,347 @@ def get_user_by_email(db: Session, email: str) -> User | None:
     return db.execute(stmt).scalar_one_or_none()
 
 
-def list_users(db: Session, skip: int = 0, limit: int = 100) -> list[User]:
-    stmt = select(User).offset(skip).limit(limit)
-    return list(db.execute(stmt).scalars().all())
+def filter_users(stmt, filters: UserListFilters | None):
+    """Add the WHERE clauses for ``filters`` to a statement selecting from users.
+
+    Organization + active state + id order is served by ix_users_org_active_id,
+    the role filter by ix_user_roles_role_id.
+    """
+    if filters is None:
+        return stmt
+    if filters.organization_id is not None:
+        stmt = stmt.where(User.organization_id == filters.organization_id)
+    if filters.is_active is not None:
+        stmt = stmt.where(User.is_active == filters.is_active)
+    if filters.department_id is not None:
+        stmt = stmt.where(User.department_id == filters.department_id)
+    if filters.role_id is not None:
+        stmt = stmt.where(User.id.in_(select(user_roles.c.user_id).where(user_roles.c.role_id == filters.role_id)))
+    if filters.created_after is not None:
+        stmt = stmt.where(User.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        stmt = stmt.where(User.created_at < filters.created_before)
+    return stmt
+
+
+def list_users(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    order_by: str = "id",
+    filters: UserListFilters | None = None,
+) -> Page[User]:
+    stmt = filter_users(select(User).options(*loader_options(UserRead)), filters)
+    keys, descending = resolve_sort(USER_SORT_KEYS, order_by)
+    return paginate(db, stmt, keys, limit=limit, skip=skip, after=after, descending=descending)
+
+
+def _roles_by_user(db: Session, user_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+    stmt = (
+        select(user_roles.c.user_id, Role.id, Role.name, Role.description)
+        .join(Role, Role.id == user_roles.c.role_id)
+        .where(user_roles.c.user_id.in_(user_ids))
+        .order_by(user_roles.c.user_id, Role.id)
+    )
+    roles: dict[int, list[dict[str, Any]]] = {}
+    for user_id, role_id, name, description in db.execute(stmt):
+        roles.setdefault(user_id, []).append({"id": role_id, "name": name, "description": description})
+    return roles
+
+
+def list_users_read(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    order_by: str = "id",
+    filters: UserListFilters | None = None,
+    fields: Fields | None = None,
+) -> Page[UserRead]:
+    """list_users for handlers that only serialize the result.
+
+    Selects UserRead's columns as rows (no ORM identity map or relationship
+    loading), fetches roles for the whole page in one query and validates the
+    page with a single TypeAdapter call. With ``fields`` only the selected
+    columns (plus sort keys and ``updated_at`` for the page version) are read,
+    roles only when selected, and items are ``sparse_model(UserRead, fields)``.
+    """
+    keys, descending = resolve_sort(USER_SORT_KEYS, order_by)
+    columns = select_columns(USER_READ_COLUMNS, fields, ["updated_at", *(key.key for key in keys)])
+    stmt = filter_users(select(*columns), filters)
+    page = paginate(db, stmt, keys, limit=limit, skip=skip, after=after, rows=True, descending=descending)
+    users = [row._asdict() for row in page.items]
+    if wants(fields, "roles"):
+        roles = _roles_by_user(db, [user["id"] for user in users]) if users else {}
+        for user in users:
+            user["roles"] = roles.get(user["id"], [])
+    adapter = USER_LIST_ADAPTER if fields is None else sparse_adapter(UserRead, fields)
+    return Page(adapter.validate_python(users), page.next_cursor, page_version_of(page.items))
+
+
+def get_user_fields(db: Session, user_id: int, fields: Fields) -> tuple[BaseModel, datetime] | None:
+    """``(sparse_model(UserRead, fields) item, updated_at)`` reading only the selected columns."""
+    columns = select_columns(USER_READ_COLUMNS, fields, ["updated_at"])
+    row = db.execute(select(*columns).where(User.id == user_id)).one_or_none()
+    if row is None:
+        return None
+    user = row._asdict()
+    if wants(fields, "roles"):
+        user["roles"] = _roles_by_user(db, [user_id]).get(user_id, [])
+    return sparse_model(UserRead, fields).model_validate(user), row.updated_at
+
+
+def get_users_read(
+    db: Session, ids: Iterable[int], fields: Fields | None = None
+) -> tuple[list[BaseModel], list[int]]:
+    """Users with the given ids as ``(items in request order, missing ids)``.
+
+    One column query per chunk of ids plus, when selected, one roles query per
+    chunk; items are UserRead or ``sparse_model(UserRead, fields)``.
+    """
+    ids = unique_ids(ids)
+    columns = select_columns(USER_READ_COLUMNS, fields)
+    found: dict[int, dict[str, Any]] = {}
+    for chunk in id_chunks(ids):
+        users = [row._asdict() for row in db.execute(select(*columns).where(User.id.in_(chunk)))]
+        if wants(fields, "roles") and users:
+            roles = _roles_by_user(db, [user["id"] for user in users])
+            for user in users:
+                user["roles"] = roles.get(user["id"], [])
+        found.update((user["id"], user) for user in users)
+    items, missing = in_request_order(ids, found)
+    adapter = USER_LIST_ADAPTER if fields is None else sparse_adapter(UserRead, fields)
+    return adapter.validate_python(items), missing
+
+
+def list_users_version(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    order_by: str = "id",
+    filters: UserListFilters | None = None,
+) -> tuple:
+    """Validator for the page list_users_read would return, without loading it.
+
+    Role changes touch ``users.updated_at`` (see app/models/user.py and
+    role_service), so nested roles are covered too.
+    """
+    stmt = filter_users(select(User.id, User.updated_at), filters)
+    keys, descending = resolve_sort(USER_SORT_KEYS, order_by)
+    return page_version(db, stmt, keys, limit=limit, skip=skip, after=after, descending=descending)
+
+
+def export_users_stmt(
+    organization_id: int | None = None,
+    department: Department | None = None,
+    include_subdepartments: bool = False,
+):
+    """Statement behind GET /users/export: UserRead's columns plus role names, in id order."""
+    role_names = (
+        select(list_agg(Role.name))
+        .join(user_roles, user_roles.c.role_id == Role.id)
+        .where(user_roles.c.user_id == User.id)
+        .scalar_subquery()
+    )
+    stmt = select(*USER_READ_COLUMNS, role_names.label("roles")).order_by(User.id)
+    if organization_id is not None:
+        stmt = stmt.where(User.organization_id == organization_id)
+    if department is not None:
+        if include_subdepartments:
+            stmt = stmt.where(User.department_id.in_(subtree_department_ids(department)))
+        else:
+            stmt = stmt.where(User.department_id == department.id)
+    return stmt
+
+
+def update_user(db: Session, user_id: int, data: UserUpdate, partial: bool = False) -> UserRead | None:
+    """One UPDATE ... RETURNING plus the user's roles; None if the user does not exist.
+
+    With ``partial=True`` (PATCH) an explicit null ``department_id`` detaches
+    the user from their department.
+    """
+    values = update_values(User, data, partial)
+    if values.keys() & PERMISSION_USER_FIELDS:
+        with tracked_users(db, [user_id]):
+            row = update_returning(db, User, user_id, values, USER_READ_COLUMNS)
+        invalidate_permissions(db, [user_id])
+    else:
+        row = update_returning(db, User, user_id, values, USER_READ_COLUMNS)
+    if row is not None:
+        record_updated(db, "user", [user_id], values)
+    db.commit()
+    if row is None:
+        return None
+    return UserRead.model_validate({**row._asdict(), "roles": _roles_by_user(db, [user_id]).get(user_id, [])})
+
+
+def get_credentials(db: Session, email: str) -> Row | None:
+    """(id, hashed_password, is_active) of the user with ``email``, for login."""
+    return db.execute(
+        select(User.id, User.hashed_password, User.is_active).where(User.email == email)
+    ).one_or_none()
 
 
-def update_user(db: Session, user: User, data: UserUpdate) -> User:
-    if data.full_name is not None:
-        user.full_name = data.full_name
-    if data.is_active is not None:
-        user.is_active = data.is_active
-    if data.department_id is not None:
-        user.department_id = data.department_id
-    db.add(user)
+def replace_password_hash(db: Session, user_id: int, old_hash: str, new_hash: str) -> bool:
+    """Store an upgraded hash unless the password changed meanwhile; False if it did.
+
+    ``updated_at`` is kept: the hash is not part of the read model, so ETags stay valid.
+    Executed on the connection, bypassing the session's statement hooks (the
+    permission cache does not depend on passwords).
+    """
+    stmt = (
+        update(User)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash, updated_at=User.updated_at)
+    )
+    replaced = db.connection().execute(stmt).rowcount == 1
     db.commit()
-    db.refresh(user)
-    return user
+    return replaced
 
 
 def delete_user(db: Session, user: User) -> None:
     db.delete(user)
     db.commit()
+
+
+# ========== Bulk import ==========
+# Request Content-Type -> payload format accepted by POST /users/bulk
+IMPORT_FORMATS = {
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+
+class InvalidImportPayload(ValueError):
+    """The payload as a whole cannot be parsed (e.g. JSON body that is not an array)."""
+
+
+def iter_import_rows(fp: BinaryIO, fmt: str) -> Iterator[Any]:
+    """Lazily yield raw rows from an uploaded file.
+
+    NDJSON and CSV are read line by line, so only one row is held at a time.
+    Lines that cannot be parsed are yielded as ``ValueError`` instances and
+    reported per row instead of aborting the import.
+    """
+    if fmt == "json":
+        try:
+            rows = json.load(fp)
+        except ValueError as exc:
+            raise InvalidImportPayload(f"Invalid JSON: {exc}") from exc
+        if not isinstance(rows, list):
+            raise InvalidImportPayload("JSON payload must be an array of users")
+        yield from rows
+        return
+
+    text = io.TextIOWrapper(fp, encoding="utf-8-sig", newline="")
+    if fmt == "ndjson":
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                yield ValueError(f"Invalid JSON line: {exc}")
+    elif fmt == "csv":
+        for record in csv.DictReader(text):
+            # Empty cells mean "not provided" so schema defaults apply.
+            yield {key: value for key, value in record.items() if key and value not in ("", None)}
+    else:
+        raise InvalidImportPayload(f"Unsupported import format: {fmt}")
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in exc.errors()
+    )
+
+
+def _insert_user_batch(
+    db: Session,
+    batch: list[tuple[int, UserCreate]],
+    seen_emails: set[str],
+    results: list[BulkUserRowResult],
+) -> None:
+    """Check email uniqueness for the whole batch in one query, then insert the rest in one statement."""
+    emails = [data.email for _, data in batch]
+    taken = set(db.execute(select(User.email).where(User.email.in_(emails))).scalars())
+
+    accepted: list[tuple[int, UserCreate]] = []
+    for index, data in batch:
+        if data.email in taken or data.email in seen_emails:
+            results.append(
+                BulkUserRowResult(index=index, status="error", email=data.email, error="Email already registered")
+            )
+            continue
+        seen_emails.add(data.email)
+        accepted.append((index, data))
+    if not accepted:
+        return
+
+    # RETURNING email as well: multi-row RETURNING order is not guaranteed on every backend.
+    stmt = insert(User).returning(User.email, User.id)
+    # Hashed in parallel across the password pool.
+    hashes = hash_passwords([data.password for _, data in accepted])
+    params = [
+        {
+            "email": data.email,
+            "full_name": data.full_name,
+            "hashed_password": hashed,
+            "is_active": data.is_active,
+            "organization_id": data.organization_id,
+            "department_id": data.department_id,
+        }
+        for (_, data), hashed in zip(accepted, hashes)
+    ]
+    ids = {email: user_id for email, user_id in db.execute(stmt, params)}
+    record_created(db, "user", ({**values, "id": ids[values["email"]]} for values in params))
+    apply_headcount_delta(
+        db,
+        Counter(
+            chain.from_iterable(
+                user_groups(data.organization_id, data.department_id, data.is_active) for _, data in accepted
+            )
+        ),
+    )
+    for index, data in accepted:
+        results.append(BulkUserRowResult(index=index, status="created", id=ids[data.email], email=data.email))
+
+
+def bulk_create_users(db: Session, rows: Iterable[Any], batch_size: int = 500) -> BulkUserImportResult:
+    """Validate and insert users in batches inside a single transaction.
+
+    Rows are validated one at a time as they are read; valid rows are buffered
+    until ``batch_size`` and then inserted together. Invalid rows and duplicate
+    emails are reported per row and do not abort the import.
+    """
+    results: list[BulkUserRowResult] = []
+    seen_emails: set[str] = set()
+    batch: list[tuple[int, UserCreate]] = []
+    try:
+        for index, raw in enumerate(rows):
+            if isinstance(raw, Exception):
+                results.append(BulkUserRowResult(index=index, status="error", error=str(raw)))
+                continue
+            try:
+                data = UserCreate.model_validate(raw)
+            except ValidationError as exc:
+                results.append(BulkUserRowResult(index=index, status="error", error=_format_validation_error(exc)))
+                continue
+            batch.append((index, data))
+            if len(batch) >= batch_size:
+                _insert_user_batch(db, batch, seen_emails, results)
+                batch = []
+        if batch:
+            _insert_user_batch(db, batch, seen_emails, results)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    results.sort(key=lambda r: r.index)
+    created = sum(1 for r in results if r.status == "created")
+    return BulkUserImportResult(created=created, failed=len(results) - created, results=results)
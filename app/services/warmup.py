@@ -0,0 +1,63 @@
+"""Pre-warming run by each server process before it accepts traffic (WARMUP_ON_STARTUP).
+
+- engine pool: open up to DB_POOL_SIZE connections (TCP/TLS handshakes, SQLite PRAGMAs)
+- password hashing: spawn the process pool and let every worker import its modules
+- read caches: load the default organization and role list pages, which also
+  compiles their statements into SQLAlchemy's statement cache
+
+Caches are per process with the memory backend, so this runs in every worker.
+"""
+import logging
+import time
+from contextlib import ExitStack
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.core.passwords import get_pool
+from app.schemas.organization import OrganizationListFilters
+from app.services.organization_service import list_organizations_read
+from app.services.role_service import list_roles_read
+
+logger = logging.getLogger("app.warmup")
+
+
+def warm_pool(engine: Engine) -> int:
+    """Hold ``pool.size()`` connections at once so each is opened; returns how many."""
+    size = getattr(engine.pool, "size", lambda: 1)()  # StaticPool/SingletonThreadPool have no size
+    with ExitStack() as stack:
+        for _ in range(size):
+            conn = stack.enter_context(engine.connect())
+            conn.exec_driver_sql("SELECT 1")
+    return size
+
+
+async def warm_async_pool(async_engine) -> int:
+    size = getattr(async_engine.sync_engine.pool, "size", lambda: 1)()
+    conns = [await async_engine.connect() for _ in range(size)]
+    try:
+        for conn in conns:
+            await conn.exec_driver_sql("SELECT 1")
+    finally:
+        for conn in conns:
+            await conn.close()
+    return size
+
+
+def warm_caches(db: Session) -> None:
+    """Load the pages the list routes serve with default parameters into the read caches."""
+    list_organizations_read(db, filters=OrganizationListFilters())
+    list_roles_read(db)
+
+
+def warm_up(engine: Engine, db: Session) -> dict[str, float]:
+    """Run every step; returns the milliseconds each took (also logged)."""
+    timings: dict[str, float] = {}
+    for name, step in (
+        ("db_pool", lambda: warm_pool(engine)),
+        ("password_pool", lambda: get_pool().warm()),
+        ("caches", lambda: warm_caches(db)),
+    ):
+        start = time.perf_counter()
+        step()
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+    logger.info("warm-up done: %s", ", ".join(f"{name} {ms}ms" for name, ms in timings.items()))
+    return timings
@@ -0,0 +1,63 @@
+"""Single-statement writes shared by the services.
+
+Creates are one ``INSERT ... RETURNING`` and updates one ``UPDATE ... RETURNING``
+of the columns the read model needs, so a write costs one round trip plus the
+commit. Nothing is loaded into the session first. Uniqueness is left to the
+database's constraints: an IntegrityError is rolled back and re-raised as
+``ConstraintViolation``, which routes map to 400. This also closes the race a
+check-then-insert leaves open.
+"""
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+from pydantic import BaseModel
+from sqlalchemy import Row, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+class ConstraintViolation(ValueError):
+    """A write was rejected by a database constraint (duplicate name/email, ...)."""
+
+
+@contextmanager
+def constraint_errors(db: Session, unique_message: str) -> Iterator[None]:
+    """Translate IntegrityError into ConstraintViolation; unique violations get ``unique_message``."""
+    try:
+        yield
+    except IntegrityError as exc:
+        db.rollback()
+        message = unique_message if "unique" in str(exc.orig).lower() else "Constraint violation"
+        raise ConstraintViolation(message) from exc
+
+
+def update_values(model: type, data: BaseModel, partial: bool) -> dict[str, Any]:
+    """Column values to write for an update payload.
+
+    PUT (``partial=False``) treats ``None`` as "leave unchanged". PATCH writes
+    every field the client sent, so an explicit null clears a nullable column;
+    nulls for NOT NULL columns are still ignored.
+    """
+    values = data.model_dump(exclude_unset=partial, exclude_none=not partial)
+    columns = model.__table__.c
+    return {key: value for key, value in values.items() if value is not None or columns[key].nullable}
+
+
+def update_returning(
+    db: Session, model: type, ident: int, values: dict[str, Any], columns: Sequence[Any]
+) -> Row | None:
+    """UPDATE the row ``ident`` with ``values`` and return ``columns`` of it (None if it does not exist).
+
+    Column ``onupdate`` defaults such as ``updated_at`` apply. With nothing to
+    write this is a plain SELECT.
+    """
+    if not values:
+        return db.execute(select(*columns).where(model.id == ident)).one_or_none()
+    stmt = (
+        update(model)
+        .where(model.id == ident)
+        .values(**values)
+        .returning(*columns)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).one_or_none()
@@ -0,0 +1 @@
+"""Benchmark suite for the HTTP API (seed, run, compare). See README "벤치마크"."""
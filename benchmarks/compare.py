@@ -0,0 +1,57 @@
+"""Compare two benchmark result files route by route.
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json --fail-above 20
+
+Exits with status 1 when any route's p95 latency grew by more than
+``--fail-above`` percent, so it can gate CI.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _change(old: float, new: float) -> float | None:
+    return None if not old else (new - old) / old * 100
+
+
+def compare(base: dict, head: dict, fail_above: float | None = None) -> tuple[list[str], list[str]]:
+    """Return (report lines, names of routes whose p95 regressed past ``fail_above``)."""
+    lines = [f"{'route':<48} {'p50 ms':>17} {'p95 ms':>17} {'req/s':>17}"]
+    regressions: list[str] = []
+    for name, new in head["results"].items():
+        old = base["results"].get(name)
+        if old is None:
+            lines.append(f"{name:<48} (new)")
+            continue
+        cells = []
+        for key in ("p50_ms", "p95_ms", "rps"):
+            delta = _change(old[key], new[key])
+            cells.append(f"{new[key]:>9.2f} {'' if delta is None else f'{delta:+6.1f}%':>7}")
+        lines.append(f"{name:<48} {' '.join(cells)}")
+        p95_delta = _change(old["p95_ms"], new["p95_ms"])
+        if fail_above is not None and p95_delta is not None and p95_delta > fail_above:
+            regressions.append(name)
+    return lines, regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument("--fail-above", type=float, help="Fail when p95 grows by more than this percent")
+    args = parser.parse_args(argv)
+
+    base = json.loads(args.base.read_text())
+    head = json.loads(args.head.read_text())
+    print(f"base {base['meta'].get('commit')}  vs  head {head['meta'].get('commit')}")
+    lines, regressions = compare(base, head, args.fail_above)
+    print("\n".join(lines))
+    if regressions:
+        print(f"p95 regressions above {args.fail_above}%: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
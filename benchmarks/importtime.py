@@ -0,0 +1,126 @@
+"""Import-time profile of the app, from ``python -X importtime``.
+
+    python -m benchmarks.importtime                  # app.main, best of 5 fresh interpreters
+    python -m benchmarks.importtime --top 40 --output importtime.json
+    python -m benchmarks.importtime --module app.db.base --budget-ms 400
+
+Reports the module's total import time, self time per package (``app.*`` per
+sub-package), the slowest imports, and any DEFERRED_MODULES found on the import
+path. Exits with status 1 when the total exceeds ``--budget-ms`` or a deferred
+module was imported, so it can gate CI like ``benchmarks.compare``.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, NamedTuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cold-start budget for ``import app.main`` (ms, under -X importtime); tests/test_startup.py checks it
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "2500"))
+
+# Modules that must stay off the app's import path: tooling (imported on use)
+# and code that only runs in other processes or on demand.
+DEFERRED_MODULES = ("alembic", "uvicorn", "httpx", "benchmarks", "app.serve", "app.services.warmup")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class ImportRecord(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse(stderr: str) -> list[ImportRecord]:
+    """Records of ``-X importtime`` output, in the order Python printed them (children first)."""
+    records = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def profile(module: str = "app.main", runs: int = 5, env: dict[str, str] | None = None) -> list[ImportRecord]:
+    """Import ``module`` in ``runs`` fresh interpreters; records of the fastest run."""
+    best: list[ImportRecord] | None = None
+    for _ in range(max(runs, 1)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, env={**os.environ, **(env or {})}, capture_output=True, text=True, timeout=120,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+        records = parse(proc.stderr)
+        if best is None or total_ms(records, module) < total_ms(best, module):
+            best = records
+    return best
+
+
+def total_ms(records: list[ImportRecord], module: str) -> float:
+    return next((r.cumulative_us / 1000 for r in records if r.name == module and r.depth == 0), 0.0)
+
+
+def _package(name: str) -> str:
+    parts = name.split(".")
+    return ".".join(parts[:2]) if parts[0] == "app" and len(parts) > 1 else parts[0]
+
+
+def summarize(records: list[ImportRecord], module: str, top: int = 20) -> dict[str, Any]:
+    by_package: Counter[str] = Counter()
+    for record in records:
+        by_package[_package(record.name)] += record.self_us
+    imported = {record.name for record in records}
+    return {
+        "module": module,
+        "total_ms": round(total_ms(records, module), 1),
+        "modules": len(records),
+        "by_package_ms": {name: round(us / 1000, 1) for name, us in by_package.most_common(top)},
+        "slowest": [
+            {"name": r.name, "cumulative_ms": round(r.cumulative_us / 1000, 1), "self_ms": round(r.self_us / 1000, 1)}
+            for r in sorted(records, key=lambda r: r.cumulative_us, reverse=True)
+            if r.name != module
+        ][:top],
+        "deferred_imported": sorted(
+            name for name in imported if any(name == d or name.startswith(f"{d}.") for d in DEFERRED_MODULES)
+        ),
+    }
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters; the fastest is reported")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--output", type=Path, help="Also write the summary as JSON")
+    args = parser.parse_args(argv)
+
+    summary = summarize(profile(args.module, args.runs), args.module, args.top)
+    print(f"import {args.module}: {summary['total_ms']:.1f}ms ({summary['modules']} modules, budget {args.budget_ms:.0f}ms)")
+    print("\nself time by package")
+    for name, ms in summary["by_package_ms"].items():
+        print(f"  {name:<40} {ms:>8.1f}ms")
+    print("\nslowest imports (cumulative / self)")
+    for item in summary["slowest"]:
+        print(f"  {item['name']:<48} {item['cumulative_ms']:>8.1f}ms {item['self_ms']:>8.1f}ms")
+    if summary["deferred_imported"]:
+        print(f"\ndeferred modules imported: {', '.join(summary['deferred_imported'])}")
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2))
+        print(f"wrote {args.output}")
+    if summary["total_ms"] > args.budget_ms or summary["deferred_imported"]:
+        sys.exit(1)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
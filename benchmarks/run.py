@@ -0,0 +1,201 @@
+"""Measure latency percentiles and throughput for every API route.
+
+The app is driven in-process through httpx.ASGITransport (no sockets, no
+server), against a throwaway copy of the seeded database so every run starts
+from identical data. Results are written as JSON; compare two runs with
+``python -m benchmarks.compare``.
+
+    python -m benchmarks.run --scale 0.1 --requests 200
+    DATABASE_ASYNC=true python -m benchmarks.run --only /users
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+import httpx
+from benchmarks.scenarios import SCENARIOS, Context, Scenario
+from benchmarks.seed import DatasetSize, seed
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: list[float], errors: int, wall_time: float) -> dict[str, float]:
+    ordered = sorted(latencies)
+    to_ms = lambda seconds: round(seconds * 1000, 3)  # noqa: E731
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / wall_time, 1) if wall_time else 0.0,
+        "mean_ms": to_ms(sum(ordered) / len(ordered)) if ordered else 0.0,
+        "p50_ms": to_ms(percentile(ordered, 50)),
+        "p90_ms": to_ms(percentile(ordered, 90)),
+        "p95_ms": to_ms(percentile(ordered, 95)),
+        "p99_ms": to_ms(percentile(ordered, 99)),
+        "max_ms": to_ms(ordered[-1]) if ordered else 0.0,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, ctx: Context, item: Scenario, requests: int, warmup: int, concurrency: int
+) -> dict[str, Any]:
+    if item.prepare is not None:
+        ctx.prepared[item.name] = await item.prepare(client, ctx, warmup + requests)
+
+    async def send(i: int) -> tuple[float, bool]:
+        path, kwargs = item.make(ctx, i)
+        started = time.perf_counter()
+        resp = await client.request(item.method, path, **kwargs)
+        await resp.aread()
+        return time.perf_counter() - started, resp.status_code == item.expected_status
+
+    for i in range(warmup):
+        await send(i)
+
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(warmup, warmup + requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            elapsed, ok = await send(i)
+            latencies.append(elapsed)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def api_routes(routes) -> set[str]:
+    """``"<METHOD> <path>"`` for every APIRoute, descending into included routers."""
+    from fastapi.routing import APIRoute
+
+    found: set[str] = set()
+    for route in routes:
+        if isinstance(route, APIRoute):
+            found.update(f"{method} {route.path}" for method in route.methods if method != "HEAD")
+        elif hasattr(route, "original_router"):
+            found |= api_routes(route.original_router.routes)
+    return found
+
+
+async def run_all(app, ctx: Context, args: argparse.Namespace) -> dict[str, dict[str, Any]]:
+    results: dict[str, dict[str, Any]] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for item in SCENARIOS:
+            if args.only and not any(part in item.name for part in args.only):
+                continue
+            results[item.name] = await run_scenario(
+                client, ctx, item, args.requests, args.warmup, args.concurrency
+            )
+            print(_format_row(item.name, results[item.name]), flush=True)
+    return results
+
+
+def _format_row(name: str, result: dict[str, Any]) -> str:
+    return (
+        f"{name:<48} {result['rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f}ms"
+        f"  p95 {result['p95_ms']:>8.2f}ms  p99 {result['p99_ms']:>8.2f}ms  errors {result['errors']}"
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _ensure_seed(seed_db: Path, size: DatasetSize, reseed: bool) -> dict[str, int]:
+    """Seed ``seed_db`` unless it already holds a dataset of the requested size."""
+    meta_path = seed_db.with_suffix(".json")
+    if not reseed and seed_db.exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text())
+        if meta.get("size") == asdict(size):
+            return meta["counts"]
+    print(f"seeding {seed_db} with {asdict(size)} ...", flush=True)
+    counts = seed(seed_db, size)
+    meta_path.write_text(json.dumps({"size": asdict(size), "counts": counts}, indent=2))
+    return counts
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed-db", type=Path, default=Path("benchmarks/.data/seed.db"))
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the default dataset size")
+    parser.add_argument("--reseed", action="store_true", help="Rebuild the seed database")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per route")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed requests per route")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent in-flight requests")
+    parser.add_argument("--only", action="append", help="Run routes whose name contains this text (repeatable)")
+    parser.add_argument("--output", type=Path, help="JSON result path (default benchmarks/results/<time>-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    size = DatasetSize().scaled(args.scale)
+    counts = _ensure_seed(args.seed_db, size, args.reseed)
+    commit = _git_commit()
+
+    with tempfile.TemporaryDirectory(prefix="erp-bench-") as workdir:
+        work_db = Path(workdir) / "bench.db"
+        shutil.copyfile(args.seed_db, work_db)
+        # Settings are read at import time, so point the app at the copy before importing it.
+        os.environ["DATABASE_URL"] = f"sqlite:///{work_db}"
+        from app.core.config import get_settings
+        from app.main import app
+
+        ctx = Context.load(work_db, run_id=uuid.uuid4().hex[:8])
+        missing = api_routes(app.routes) - {item.name for item in SCENARIOS}
+        if missing:
+            print(f"warning: no benchmark scenario for {sorted(missing)}", file=sys.stderr)
+        results = asyncio.run(run_all(app, ctx, args))
+
+        from app.db.session import engine
+
+        engine.dispose()
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database_async": get_settings().DATABASE_ASYNC,
+            "cache_backend": get_settings().CACHE_BACKEND,
+            "dataset": counts,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    output = args.output or Path("benchmarks/results") / (
+        f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"wrote {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
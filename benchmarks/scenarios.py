@@ -0,0 +1,430 @@
+"""One benchmark scenario per API route.
+
+A scenario turns the iteration number into a request against the seeded data.
+Scenarios that consume rows (DELETE) first create their targets through the API
+in an untimed ``prepare`` step. Results are keyed by ``"<METHOD> <route template>"``,
+the same label /metrics uses, so both can be compared.
+"""
+import random
+import sqlite3
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+import httpx
+
+Request = tuple[str, dict[str, Any]]
+
+
+@dataclass
+class Context:
+    """Ids sampled from the seeded database plus per-run state."""
+
+    org_ids: list[int]
+    dept_ids: list[tuple[int, int]]  # (department id, organization id)
+    root_dept_ids: list[int]
+    user_ids: list[int]
+    role_ids: list[int]
+    run_id: str
+    rng: random.Random = field(default_factory=lambda: random.Random(7))
+    prepared: dict[str, list] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, db_path: Path, run_id: str, sample: int = 1000) -> "Context":
+        conn = sqlite3.connect(db_path)
+        try:
+            def ids(sql: str) -> list:
+                return conn.execute(f"{sql} ORDER BY random() LIMIT {sample}").fetchall()
+
+            return cls(
+                org_ids=[row[0] for row in ids("SELECT id FROM organizations")],
+                dept_ids=[tuple(row) for row in ids("SELECT id, organization_id FROM departments")],
+                root_dept_ids=[row[0] for row in ids("SELECT id FROM departments WHERE depth = 0")],
+                user_ids=[row[0] for row in ids("SELECT id FROM users")],
+                role_ids=[row[0] for row in ids("SELECT id FROM roles")],
+                run_id=run_id,
+            )
+        finally:
+            conn.close()
+
+    def pick(self, values: list):
+        return self.rng.choice(values)
+
+
+@dataclass
+class Scenario:
+    method: str
+    route: str
+    make: Callable[[Context, int], Request]
+    prepare: Callable[[httpx.AsyncClient, Context, int], Awaitable[list]] | None = None
+    expected_status: int = 200
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}"
+
+
+SCENARIOS: list[Scenario] = []
+
+
+def scenario(method: str, route: str, *, prepare=None, expected_status: int = 200):
+    def register(make: Callable[[Context, int], Request]) -> Callable[[Context, int], Request]:
+        SCENARIOS.append(Scenario(method, route, make, prepare, expected_status))
+        return make
+
+    return register
+
+
+async def _create_many(client: httpx.AsyncClient, path: str, payloads: list[dict]) -> list[int]:
+    ids = []
+    for payload in payloads:
+        resp = await client.post(path, json=payload)
+        resp.raise_for_status()
+        ids.append(resp.json()["id"])
+    return ids
+
+
+# ========== Root ==========
+@scenario("GET", "/")
+def _root(ctx: Context, i: int) -> Request:
+    return "/", {}
+
+
+# ========== Organizations ==========
+@scenario("POST", "/organizations/", expected_status=201)
+def _create_org(ctx: Context, i: int) -> Request:
+    return "/organizations/", {"json": {"name": f"bench-{ctx.run_id}-org-{i}", "description": "benchmark"}}
+
+
+@scenario("GET", "/organizations/")
+def _list_orgs(ctx: Context, i: int) -> Request:
+    return "/organizations/", {"params": {"limit": 100}}
+
+
+@scenario("GET", "/organizations/export")
+def _export_orgs(ctx: Context, i: int) -> Request:
+    return "/organizations/export", {"params": {"format": "csv" if i % 2 else "ndjson"}}
+
+
+def _sample_ids(ctx: Context, ids: list[int], n: int) -> list[int]:
+    return [ctx.pick(ids) for _ in range(n)]
+
+
+@scenario("GET", "/organizations/batch")
+def _orgs_batch(ctx: Context, i: int) -> Request:
+    return "/organizations/batch", {"params": {"ids": ",".join(map(str, _sample_ids(ctx, ctx.org_ids, 20)))}}
+
+
+@scenario("POST", "/organizations/batch")
+def _post_orgs_batch(ctx: Context, i: int) -> Request:
+    return "/organizations/batch", {"json": {"ids": _sample_ids(ctx, ctx.org_ids, 200)}}
+
+
+@scenario("GET", "/organizations/{org_id}")
+def _get_org(ctx: Context, i: int) -> Request:
+    return f"/organizations/{ctx.pick(ctx.org_ids)}", {}
+
+
+@scenario("PUT", "/organizations/{org_id}")
+def _update_org(ctx: Context, i: int) -> Request:
+    return f"/organizations/{ctx.pick(ctx.org_ids)}", {"json": {"description": f"updated {i}"}}
+
+
+@scenario("PATCH", "/organizations/{org_id}")
+def _patch_org(ctx: Context, i: int) -> Request:
+    return f"/organizations/{ctx.pick(ctx.org_ids)}", {"json": {"description": f"patched {i}"}}
+
+
+async def _prepare_orgs(client: httpx.AsyncClient, ctx: Context, n: int) -> list[int]:
+    return await _create_many(
+        client, "/organizations/", [{"name": f"bench-{ctx.run_id}-doomed-org-{i}"} for i in range(n)]
+    )
+
+
+@scenario("DELETE", "/organizations/{org_id}", prepare=_prepare_orgs, expected_status=204)
+def _delete_org(ctx: Context, i: int) -> Request:
+    return f"/organizations/{ctx.prepared['DELETE /organizations/{org_id}'][i]}", {}
+
+
+@scenario("GET", "/organizations/{org_id}/detail")
+def _org_detail(ctx: Context, i: int) -> Request:
+    params = {"fields": "name,departments.name,departments.parent_id"} if i % 2 else {}
+    return f"/organizations/{ctx.pick(ctx.org_ids)}/detail", {"params": params}
+
+
+@scenario("GET", "/organizations/{org_id}/departments/tree")
+def _org_tree(ctx: Context, i: int) -> Request:
+    return f"/organizations/{ctx.pick(ctx.org_ids)}/departments/tree", {}
+
+
+# ========== Departments ==========
+@scenario("POST", "/departments/", expected_status=201)
+def _create_dept(ctx: Context, i: int) -> Request:
+    parent_id, org_id = ctx.pick(ctx.dept_ids)
+    return "/departments/", {"json": {"name": f"bench-dept-{i}", "organization_id": org_id, "parent_id": parent_id}}
+
+
+@scenario("GET", "/departments/{dept_id}")
+def _get_dept(ctx: Context, i: int) -> Request:
+    return f"/departments/{ctx.pick(ctx.dept_ids)[0]}", {}
+
+
+@scenario("PUT", "/departments/{dept_id}")
+def _update_dept(ctx: Context, i: int) -> Request:
+    return f"/departments/{ctx.pick(ctx.dept_ids)[0]}", {"json": {"name": f"renamed-{i}"}}
+
+
+async def _prepare_depts(client: httpx.AsyncClient, ctx: Context, n: int) -> list[int]:
+    payloads = []
+    for i in range(n):
+        parent_id, org_id = ctx.pick(ctx.dept_ids)
+        payloads.append({"name": f"bench-leaf-{i}", "organization_id": org_id, "parent_id": parent_id})
+    return await _create_many(client, "/departments/", payloads)
+
+
+@scenario("DELETE", "/departments/{dept_id}", prepare=_prepare_depts, expected_status=204)
+def _delete_dept(ctx: Context, i: int) -> Request:
+    return f"/departments/{ctx.prepared['DELETE /departments/{dept_id}'][i]}", {}
+
+
+@scenario("GET", "/departments/{dept_id}/descendants")
+def _descendants(ctx: Context, i: int) -> Request:
+    return f"/departments/{ctx.pick(ctx.root_dept_ids)}/descendants", {}
+
+
+@scenario("PUT", "/departments/{dept_id}/roles/{role_id}")
+def _grant_dept_role(ctx: Context, i: int) -> Request:
+    return f"/departments/{ctx.pick(ctx.dept_ids)[0]}/roles/{ctx.pick(ctx.role_ids)}", {}
+
+
+async def _prepare_dept_grants(client: httpx.AsyncClient, ctx: Context, n: int) -> list[tuple[int, int]]:
+    grants = []
+    for i in range(n):
+        # Leaf departments created for the run, so seeded grants stay untouched.
+        dept_ids = await _prepare_depts(client, ctx, 1)
+        role_id = ctx.pick(ctx.role_ids)
+        resp = await client.put(f"/departments/{dept_ids[0]}/roles/{role_id}")
+        resp.raise_for_status()
+        grants.append((dept_ids[0], role_id))
+    return grants
+
+
+@scenario("DELETE", "/departments/{dept_id}/roles/{role_id}", prepare=_prepare_dept_grants, expected_status=204)
+def _revoke_dept_role(ctx: Context, i: int) -> Request:
+    dept_id, role_id = ctx.prepared["DELETE /departments/{dept_id}/roles/{role_id}"][i]
+    return f"/departments/{dept_id}/roles/{role_id}", {}
+
+
+@scenario("GET", "/departments/{dept_id}/users")
+def _subtree_users(ctx: Context, i: int) -> Request:
+    return f"/departments/{ctx.pick(ctx.root_dept_ids)}/users", {"params": {"limit": 100}}
+
+
+# ========== Users ==========
+def _user_payload(ctx: Context, tag: str) -> dict:
+    dept_id, org_id = ctx.pick(ctx.dept_ids)
+    return {
+        "email": f"bench-{ctx.run_id}-{tag}@example.com",
+        "full_name": "Bench User",
+        "password": "benchmark-password",
+        "organization_id": org_id,
+        "department_id": dept_id,
+    }
+
+
+@scenario("POST", "/users/", expected_status=201)
+def _create_user(ctx: Context, i: int) -> Request:
+    return "/users/", {"json": _user_payload(ctx, f"new-{i}")}
+
+
+@scenario("POST", "/users/bulk")
+def _bulk_users(ctx: Context, i: int) -> Request:
+    return "/users/bulk", {"json": [_user_payload(ctx, f"bulk-{i}-{row}") for row in range(100)]}
+
+
+@scenario("GET", "/users/")
+def _list_users(ctx: Context, i: int) -> Request:
+    variants = (
+        {},
+        {"organization_id": ctx.pick(ctx.org_ids), "is_active": True},
+        {"role_id": ctx.pick(ctx.role_ids)},
+        {"order_by": "-created_at"},
+        {"fields": "email,full_name"},
+    )
+    return "/users/", {"params": {"limit": 100, **variants[i % len(variants)]}}
+
+
+@scenario("GET", "/users/batch")
+def _users_batch(ctx: Context, i: int) -> Request:
+    return "/users/batch", {"params": {"ids": ",".join(map(str, _sample_ids(ctx, ctx.user_ids, 100)))}}
+
+
+@scenario("POST", "/users/batch")
+def _post_users_batch(ctx: Context, i: int) -> Request:
+    return "/users/batch", {"json": {"ids": _sample_ids(ctx, ctx.user_ids, 1000)}}
+
+
+@scenario("GET", "/users/export")
+def _export_users(ctx: Context, i: int) -> Request:
+    # One organization (~4k users at full scale) per request; a full dump is a single long request.
+    return "/users/export", {"params": {"organization_id": ctx.pick(ctx.org_ids), "format": "csv" if i % 2 else "ndjson"}}
+
+
+@scenario("GET", "/users/{user_id}")
+def _get_user(ctx: Context, i: int) -> Request:
+    return f"/users/{ctx.pick(ctx.user_ids)}", {}
+
+
+@scenario("GET", "/users/{user_id}/permissions")
+def _user_permissions(ctx: Context, i: int) -> Request:
+    return f"/users/{ctx.pick(ctx.user_ids)}/permissions", {}
+
+
+@scenario("PUT", "/users/{user_id}")
+def _update_user(ctx: Context, i: int) -> Request:
+    return f"/users/{ctx.pick(ctx.user_ids)}", {"json": {"full_name": f"Renamed {i}"}}
+
+
+@scenario("PATCH", "/users/{user_id}")
+def _patch_user(ctx: Context, i: int) -> Request:
+    return f"/users/{ctx.pick(ctx.user_ids)}", {"json": {"is_active": bool(i % 2)}}
+
+
+async def _prepare_users(client: httpx.AsyncClient, ctx: Context, n: int) -> list[int]:
+    return await _create_many(client, "/users/", [_user_payload(ctx, f"doomed-{i}") for i in range(n)])
+
+
+@scenario("DELETE", "/users/{user_id}", prepare=_prepare_users, expected_status=204)
+def _delete_user(ctx: Context, i: int) -> Request:
+    return f"/users/{ctx.prepared['DELETE /users/{user_id}'][i]}", {}
+
+
+# ========== Auth ==========
+async def _prepare_logins(client: httpx.AsyncClient, ctx: Context, n: int) -> list[str]:
+    payloads = [_user_payload(ctx, f"login-{i}") for i in range(n)]
+    await _create_many(client, "/users/", payloads)
+    return [payload["email"] for payload in payloads]
+
+
+@scenario("POST", "/auth/login", prepare=_prepare_logins)
+def _login(ctx: Context, i: int) -> Request:
+    email = ctx.prepared["POST /auth/login"][i]
+    return "/auth/login", {"json": {"email": email, "password": "benchmark-password"}}
+
+
+# ========== Roles ==========
+@scenario("POST", "/roles/", expected_status=201)
+def _create_role(ctx: Context, i: int) -> Request:
+    return "/roles/", {"json": {"name": f"bench-{ctx.run_id}-role-{i}", "permissions": ["users:read"]}}
+
+
+@scenario("GET", "/roles/")
+def _list_roles(ctx: Context, i: int) -> Request:
+    return "/roles/", {"params": {"limit": 100}}
+
+
+@scenario("GET", "/roles/batch")
+def _roles_batch(ctx: Context, i: int) -> Request:
+    return "/roles/batch", {"params": {"ids": ",".join(map(str, _sample_ids(ctx, ctx.role_ids, 20)))}}
+
+
+@scenario("POST", "/roles/batch")
+def _post_roles_batch(ctx: Context, i: int) -> Request:
+    return "/roles/batch", {"json": {"ids": _sample_ids(ctx, ctx.role_ids, 200)}}
+
+
+@scenario("GET", "/roles/{role_id}")
+def _get_role(ctx: Context, i: int) -> Request:
+    return f"/roles/{ctx.pick(ctx.role_ids)}", {}
+
+
+@scenario("PUT", "/roles/{role_id}")
+def _update_role(ctx: Context, i: int) -> Request:
+    return f"/roles/{ctx.pick(ctx.role_ids)}", {"json": {"description": f"updated {i}"}}
+
+
+@scenario("PATCH", "/roles/{role_id}")
+def _patch_role(ctx: Context, i: int) -> Request:
+    return f"/roles/{ctx.pick(ctx.role_ids)}", {"json": {"description": f"patched {i}"}}
+
+
+async def _prepare_roles(client: httpx.AsyncClient, ctx: Context, n: int) -> list[int]:
+    return await _create_many(client, "/roles/", [{"name": f"bench-{ctx.run_id}-doomed-role-{i}"} for i in range(n)])
+
+
+@scenario("DELETE", "/roles/{role_id}", prepare=_prepare_roles, expected_status=204)
+def _delete_role(ctx: Context, i: int) -> Request:
+    return f"/roles/{ctx.prepared['DELETE /roles/{role_id}'][i]}", {}
+
+
+def _members_change(ctx: Context, i: int) -> dict:
+    if i % 2:
+        return {"department_id": ctx.pick(ctx.dept_ids)[0]}
+    return {"user_ids": [ctx.pick(ctx.user_ids) for _ in range(100)]}
+
+
+@scenario("POST", "/roles/{role_id}/members")
+def _add_role_members(ctx: Context, i: int) -> Request:
+    return f"/roles/{ctx.pick(ctx.role_ids)}/members", {"json": _members_change(ctx, i)}
+
+
+@scenario("DELETE", "/roles/{role_id}/members")
+def _remove_role_members(ctx: Context, i: int) -> Request:
+    return f"/roles/{ctx.pick(ctx.role_ids)}/members", {"json": _members_change(ctx, i)}
+
+
+# ========== Search ==========
+@scenario("GET", "/search")
+def _search(ctx: Context, i: int) -> Request:
+    user_id = ctx.pick(ctx.user_ids)
+    queries = (
+        f"user{user_id:06d}",  # email token prefix
+        f"User {user_id}",  # two words, one very common
+        "Department 1",
+        "Organization",
+        f"{user_id:06d}@exa",  # substring inside an email token (trigram)
+    )
+    return "/search", {"params": {"q": queries[i % len(queries)]}}
+
+
+# ========== Reports ==========
+@scenario("GET", "/reports/headcount/organizations")
+def _org_headcount(ctx: Context, i: int) -> Request:
+    return "/reports/headcount/organizations", {}
+
+
+@scenario("GET", "/reports/headcount/roles")
+def _role_headcount(ctx: Context, i: int) -> Request:
+    return "/reports/headcount/roles", {}
+
+
+@scenario("GET", "/reports/headcount/organizations/{org_id}/departments")
+def _dept_headcount(ctx: Context, i: int) -> Request:
+    return f"/reports/headcount/organizations/{ctx.pick(ctx.org_ids)}/departments", {}
+
+
+# ========== Audit ==========
+@scenario("GET", "/audit")
+def _audit(ctx: Context, i: int) -> Request:
+    params = (
+        {"limit": 50},  # newest changes
+        {"entity": "user", "entity_id": ctx.pick(ctx.user_ids)},  # one user's history
+        {"entity": "role", "action": "update", "limit": 20},
+    )
+    return "/audit", {"params": params[i % len(params)]}
+
+
+# ========== Operations ==========
+@scenario("GET", "/cache/stats")
+def _cache_stats(ctx: Context, i: int) -> Request:
+    return "/cache/stats", {}
+
+
+@scenario("GET", "/db/pool/stats")
+def _pool_stats(ctx: Context, i: int) -> Request:
+    return "/db/pool/stats", {}
+
+
+@scenario("GET", "/metrics")
+def _metrics(ctx: Context, i: int) -> Request:
+    return "/metrics", {}
@@ -0,0 +1,179 @@
+"""Seed a SQLite file with a realistic ERP dataset for benchmarking.
+
+Rows are generated deterministically (fixed RNG seed) and inserted with Core
+executemany in chunks, bypassing the ORM unit of work, so the full dataset
+(~200k users) seeds in well under a minute.
+
+    python -m benchmarks.seed --db benchmarks/.data/seed.db --scale 0.1
+"""
+import argparse
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import create_engine, func, insert, select
+from app.core.permissions import PERMISSIONS
+from app.db.base import load_models
+from app.db.headcounts import rebuild_headcounts
+from app.models.audit import AuditEvent
+from app.models.department import Department
+from app.models.organization import Organization
+from app.models.role import DepartmentRole, Role, user_roles
+from app.models.user import User
+
+CHUNK_SIZE = 10_000
+
+
+@dataclass
+class DatasetSize:
+    organizations: int = 50
+    departments: int = 5_000
+    users: int = 200_000
+    roles: int = 40
+
+    def scaled(self, scale: float) -> "DatasetSize":
+        return DatasetSize(
+            organizations=max(1, round(self.organizations * min(scale, 1.0))),
+            departments=max(1, round(self.departments * scale)),
+            users=max(1, round(self.users * scale)),
+            roles=max(1, round(self.roles * min(scale, 1.0))),
+        )
+
+
+def _chunks(rows, size: int = CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def seed(db_path: Path, size: DatasetSize, rng_seed: int = 42) -> dict[str, int]:
+    """Create the schema in a fresh ``db_path`` and fill it. Returns row counts per table."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    rng = random.Random(rng_seed)
+    now = datetime(2024, 1, 1)
+    engine = create_engine(f"sqlite:///{db_path}")
+    load_models().create_all(engine)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+
+        conn.execute(
+            insert(Organization),
+            [
+                {"id": i, "name": f"Organization {i:03d}", "description": f"Benchmark organization {i}",
+                 "created_at": now, "updated_at": now}
+                for i in range(1, size.organizations + 1)
+            ],
+        )
+        conn.execute(
+            insert(Role),
+            [
+                {"id": i, "name": f"role-{i:03d}", "description": f"Role {i}",
+                 "permissions": [name for bit, name in enumerate(PERMISSIONS) if (i >> (bit % 6)) & 1]}
+                for i in range(1, size.roles + 1)
+            ],
+        )
+
+        # Departments: per organization a handful of roots, every other node hangs
+        # below a random earlier node of the same organization (depth ~4-8).
+        departments: list[dict] = []
+        by_org: dict[int, list[dict]] = {}
+        for dept_id in range(1, size.departments + 1):
+            org_id = (dept_id - 1) % size.organizations + 1
+            siblings = by_org.setdefault(org_id, [])
+            parent = rng.choice(siblings) if len(siblings) >= 5 else None
+            row = {
+                "id": dept_id,
+                "name": f"Department {dept_id}",
+                "organization_id": org_id,
+                "parent_id": parent["id"] if parent else None,
+                "path": f"{parent['path'] if parent else '/'}{dept_id}/",
+                "depth": parent["depth"] + 1 if parent else 0,
+            }
+            siblings.append(row)
+            departments.append(row)
+        for chunk in _chunks(departments):
+            conn.execute(insert(Department), chunk)
+        # Every root department grants one role to its whole subtree.
+        conn.execute(
+            insert(DepartmentRole),
+            [
+                {"department_id": row["id"], "role_id": row["id"] % size.roles + 1, "include_subdepartments": True}
+                for row in departments
+                if row["parent_id"] is None
+            ],
+        )
+
+        def user_rows():
+            for user_id in range(1, size.users + 1):
+                org_id = rng.randint(1, size.organizations)
+                org_departments = by_org.get(org_id)
+                yield {
+                    "id": user_id,
+                    "email": f"user{user_id:06d}@example.com",
+                    "full_name": f"User {user_id}",
+                    "hashed_password": "x" * 64,
+                    "is_active": rng.random() > 0.05,
+                    "organization_id": org_id,
+                    "department_id": rng.choice(org_departments)["id"] if org_departments else None,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+
+        for chunk in _chunks(user_rows()):
+            conn.execute(insert(User), chunk)
+
+        def assignment_rows():
+            for user_id in range(1, size.users + 1):
+                for role_id in rng.sample(range(1, size.roles + 1), k=min(size.roles, rng.randint(1, 3))):
+                    yield {"user_id": user_id, "role_id": role_id}
+
+        for chunk in _chunks(assignment_rows()):
+            conn.execute(insert(user_roles), chunk)
+
+        # History starts with one create event per seeded user (GET /audit)
+        def audit_rows():
+            for user_id in range(1, size.users + 1):
+                yield {"occurred_at": now, "entity": "user", "entity_id": user_id, "action": "create", "changes": None}
+
+        for chunk in _chunks(audit_rows()):
+            conn.execute(insert(AuditEvent), chunk)
+
+        # Bulk inserts above bypass the services that keep the summary current
+        rebuild_headcounts(conn)
+        conn.exec_driver_sql("ANALYZE")
+        counts = {
+            table.name: conn.execute(select(func.count()).select_from(table)).scalar_one()
+            for table in (
+                Organization.__table__, Department.__table__, User.__table__, Role.__table__, user_roles,
+                DepartmentRole.__table__, AuditEvent.__table__,
+            )
+        }
+    engine.dispose()
+    return counts
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=Path("benchmarks/.data/seed.db"))
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the default dataset size")
+    args = parser.parse_args(argv)
+
+    size = DatasetSize().scaled(args.scale)
+    started = time.perf_counter()
+    counts = seed(args.db, size)
+    print(f"seeded {args.db} in {time.perf_counter() - started:.1f}s: {counts} (requested {asdict(size)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 """Thin launcher for running the FastAPI app.
 Run:
     uv run uvicorn app.main:app --reload
+Production (multiple workers, see app/serve.py):
+    python -m app.serve --workers 4
 """
 from app.main import app  # noqa: F401
@@ -1,11 +1,27 @@
 import os
+from contextlib import contextmanager
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.db.base import Base
+# Keep the app's own engine (used by the startup hook) off the local erp.db file.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+# Trace every request so tests that regress into N+1 fail (see _fail_on_n_plus_one).
+os.environ.setdefault("SQL_DEBUG", "true")
+os.environ.setdefault("N_PLUS_ONE_THRESHOLD", "5")
+# Cheap scrypt hashed inline; tests/test_passwords.py exercises the process pool itself.
+os.environ.setdefault("PASSWORD_SCRYPT_N", "1024")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+# The shared in-memory database has one connection, which a writer thread must not
+# use concurrently; tests/test_audit.py turns the audit log on against its own file.
+os.environ.setdefault("AUDIT_MODE", "off")
+
+from app.core.cache import clear_all_caches
+from app.core.metrics import install_sql_timing
+from app.core.sql_debug import collect_findings, install_sql_debug
+from app.db.base import load_models
 from app.api.deps import get_db
 from app.main import app
 
@@ -18,9 +34,28 @@ def db_engine():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    Base.metadata.create_all(bind=engine)
+    load_models().create_all(bind=engine)
+    install_sql_timing(engine)
+    install_sql_debug(engine)
     yield engine
-    Base.metadata.drop_all(bind=engine)
+    load_models().drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    # The test database is shared across tests; start each test with cold caches.
+    clear_all_caches()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _fail_on_n_plus_one(request):
+    """Fail a test when one of its requests repeated a SELECT more than N_PLUS_ONE_THRESHOLD times."""
+    with collect_findings() as findings:
+        yield
+    if findings and request.node.get_closest_marker("allow_n_plus_one") is None:
+        details = "\n".join(f"{f.label}: {f.count}x {f.statement}" for f in findings)
+        pytest.fail(f"N+1 query pattern detected:\n{details}", pytrace=False)
 
 
 @pytest.fixture()
@@ -46,3 +81,29 @@ def client(db_session):
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def count_queries(db_engine):
+    """Count SQL statements executed against the test engine.
+
+    Usage:
+        with count_queries() as statements:
+            client.get("/users/")
+        assert len(statements) == 2
+    """
+
+    @contextmanager
+    def _count():
+        statements: list[str] = []
+
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db_engine, "before_cursor_execute", _before_cursor_execute)
+
+    return _count
@@ -0,0 +1,116 @@
+"""Run the API against an AsyncSession (aiosqlite) to make sure every handler works in async mode,
+i.e. nothing is lazy-loaded outside the session's greenlet during serialization."""
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app.api.deps import get_db
+from app.core import passwords
+from app.core.passwords import HashingPool, ScryptHasher
+from app.db.base import load_models
+from app.main import app
+from app.db.session import to_async_url
+
+pytest.importorskip("aiosqlite")
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+
+@pytest.fixture()
+def async_client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    load_models().create_all(bind=sync_engine)
+    sync_engine.dispose()
+
+    # NullPool: TestClient runs the app on its own event loop; don't keep aiosqlite connections across loops.
+    engine = create_async_engine(to_async_url(url), poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+def test_to_async_url():
+    assert to_async_url("sqlite:///./erp.db") == "sqlite+aiosqlite:///./erp.db"
+    assert (
+        to_async_url("postgresql+psycopg2://u:p@db:5432/erp") == "postgresql+asyncpg://u:p@db:5432/erp"
+    )
+
+
+def test_crud_flow_on_async_session(async_client):
+    c = async_client
+    org = c.post("/organizations/", json={"name": "Async Hospital"}).json()
+    assert c.get(f"/organizations/{org['id']}").json()["name"] == "Async Hospital"
+    assert c.put(f"/organizations/{org['id']}", json={"description": "async"}).json()["description"] == "async"
+
+    dept = c.post("/departments/", json={"name": "ER", "organization_id": org["id"]}).json()
+    sub = c.post("/departments/", json={"name": "Triage", "organization_id": org["id"], "parent_id": dept["id"]}).json()
+    assert c.get(f"/organizations/{org['id']}/departments/tree").json()[0]["children"][0]["id"] == sub["id"]
+    assert len(c.get(f"/organizations/{org['id']}/detail").json()["departments"]) == 2
+
+    resp = c.post(
+        "/users/",
+        json={"email": "async@example.com", "password": "secret123", "organization_id": org["id"], "department_id": sub["id"]},
+    )
+    assert resp.status_code == 201, resp.text
+    user = resp.json()
+    assert user["roles"] == []
+    assert c.put(f"/users/{user['id']}", json={"full_name": "Async User"}).json()["full_name"] == "Async User"
+    assert [u["id"] for u in c.get(f"/departments/{dept['id']}/users").json()] == [user["id"]]
+
+    resp = c.post(
+        "/users/bulk",
+        json=[{"email": f"bulk{i}@async.example.com", "password": "secret123", "organization_id": org["id"]} for i in range(3)],
+    )
+    assert resp.json()["created"] == 3
+    assert len(c.get("/users/", params={"limit": 10}).json()) == 4
+    exported = c.get("/users/export", params={"organization_id": org["id"]}).text.splitlines()
+    assert len(exported) == 4
+
+    role = c.post("/roles/", json={"name": "async-role"}).json()
+    assert c.get(f"/roles/{role['id']}").status_code == 200
+
+    assert c.delete(f"/users/{user['id']}").status_code == 204
+    assert c.get(f"/users/{user['id']}").status_code == 404
+
+
+def test_bulk_import_hashing_does_not_block_the_event_loop(async_client, monkeypatch):
+    # More rows than pending slots: the import waits for slots, the loop must not.
+    pool = HashingPool(workers=2, max_pending=4)
+    monkeypatch.setattr(passwords, "get_pool", lambda: pool)
+    monkeypatch.setattr(passwords, "get_hasher", lambda: ScryptHasher(n=2**13))
+    org = async_client.post("/organizations/", json={"name": "Async Bulk Hospital"}).json()
+    rows = [
+        {"email": f"loop{i}@async.example.com", "password": "secret123", "organization_id": org["id"]}
+        for i in range(70)
+    ]
+
+    async def scenario() -> tuple[float, float]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            started = time.perf_counter()
+            bulk = asyncio.create_task(client.post("/users/bulk", json=rows))
+            await asyncio.sleep(0.2)
+            resp = await client.get(f"/organizations/{org['id']}")
+            assert resp.status_code == 200
+            served = time.perf_counter() - started
+            assert (await bulk).json()["created"] == 70
+            return served, time.perf_counter() - started
+
+    try:
+        pool.warm()
+        served, total = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert served < total / 2, (served, total)
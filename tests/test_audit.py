@@ -0,0 +1,155 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_db
+from app.core.audit import AuditWriter
+from app.core.config import Settings, get_settings
+from app.db.base import load_models
+from app.db.session import create_db_engine
+from app.main import app
+from app.services.audit_service import flush_audit, shutdown_audit
+
+
+@pytest.fixture()
+def audit_client(tmp_path, monkeypatch):
+    """Client on its own file database with AUDIT_MODE=behind (a real writer thread)."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'audit.db'}", Settings(DB_POOL_SIZE=2))
+    load_models().create_all(bind=engine)
+    session_factory = sessionmaker(autoflush=False, bind=engine)
+    monkeypatch.setattr(get_settings(), "AUDIT_MODE", "behind")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+    shutdown_audit()
+    engine.dispose()
+
+
+def _history(client, entity: str, entity_id: int) -> list[tuple[str, dict | None]]:
+    flush_audit()
+    resp = client.get("/audit", params={"entity": entity, "entity_id": entity_id})
+    assert resp.status_code == 200, resp.text
+    return [(event["action"], event["changes"]) for event in reversed(resp.json())]
+
+
+def test_every_write_path_is_audited_after_commit(audit_client):
+    c = audit_client
+    org = c.post("/organizations/", json={"name": "Audit Hospital"}).json()
+    assert c.patch(f"/organizations/{org['id']}", json={"description": "main"}).status_code == 200
+    assert c.post("/organizations/", json={"name": "Audit Hospital"}).status_code == 400  # rolled back
+    dept = c.post("/departments/", json={"name": "Audit Ward", "organization_id": org["id"]}).json()
+    role = c.post("/roles/", json={"name": "audit-nurse"}).json()
+    assert c.put(f"/roles/{role['id']}", json={"permissions": ["users:read"]}).status_code == 200
+
+    payload = {"email": "audit@example.com", "password": "secret123", "organization_id": org["id"]}
+    user = c.post("/users/", json={**payload, "department_id": dept["id"]}).json()
+    assert c.patch(f"/users/{user['id']}", json={"full_name": "Audit User"}).status_code == 200
+    assert c.post(f"/roles/{role['id']}/members", json={"user_ids": [user["id"]]}).json()["changed"] == 1
+    assert c.request("DELETE", f"/roles/{role['id']}/members", json={"user_ids": [user["id"]]}).status_code == 200
+    assert c.post(f"/roles/{role['id']}/members", json={"user_ids": [user["id"]]}).json()["changed"] == 1
+    assert c.delete(f"/departments/{dept['id']}").status_code == 204
+    assert c.delete(f"/roles/{role['id']}").status_code == 204
+    bulk = c.post("/users/bulk", json=[{**payload, "email": "audit-bulk@example.com"}]).json()
+    assert c.delete(f"/users/{user['id']}").status_code == 204
+
+    assert _history(c, "organization", org["id"]) == [
+        ("create", {"name": "Audit Hospital", "description": None}),
+        ("update", {"description": "main"}),
+    ]
+    assert _history(c, "role", role["id"]) == [
+        ("create", {"name": "audit-nurse", "description": None, "permissions": []}),
+        ("update", {"permissions": ["users:read"]}),
+        ("delete", {"name": "audit-nurse", "description": None, "permissions": ["users:read"]}),
+    ]
+    fields = {"email": "audit@example.com", "full_name": None, "is_active": True, "organization_id": org["id"]}
+    assert _history(c, "user", user["id"]) == [
+        ("create", {**fields, "department_id": dept["id"]}),
+        ("update", {"full_name": "Audit User"}),
+        ("role_added", {"role_id": role["id"]}),
+        ("role_removed", {"role_id": role["id"]}),
+        ("role_added", {"role_id": role["id"]}),
+        ("update", {"department_id": None}),
+        ("role_removed", {"role_id": role["id"]}),
+        ("delete", {**fields, "full_name": "Audit User", "department_id": None}),
+    ]
+    assert _history(c, "user", bulk["results"][0]["id"])[0][0] == "create"
+
+
+def test_audit_query_filters_and_pages(audit_client):
+    c = audit_client
+    orgs = [c.post("/organizations/", json={"name": f"Audit Page {i}"}).json() for i in range(3)]
+    flush_audit()
+
+    first = c.get("/audit", params={"entity": "organization", "action": "create", "limit": 2})
+    assert [e["entity_id"] for e in first.json()] == [orgs[2]["id"], orgs[1]["id"]]
+    rest = c.get("/audit", params={"entity": "organization", "limit": 2, "after": first.headers["X-Next-Cursor"]})
+    assert [e["entity_id"] for e in rest.json()] == [orgs[0]["id"]]
+    assert "X-Next-Cursor" not in rest.headers
+
+    since = first.json()[0]["occurred_at"]
+    assert [e["entity_id"] for e in c.get("/audit", params={"since": since}).json()] == [orgs[2]["id"]]
+    assert c.get("/audit", params={"entity_id": orgs[0]["id"]}).status_code == 400
+    assert c.get("/audit", params={"after": "garbage"}).status_code == 400
+    assert c.get("/audit", params={"action": "rename"}).status_code == 422
+    assert 'audit_records_written_total' in c.get("/metrics").text
+
+
+def test_transaction_mode_writes_with_the_change(client, monkeypatch, count_queries):
+    monkeypatch.setattr(get_settings(), "AUDIT_MODE", "transaction")
+    with count_queries() as statements:
+        org = client.post("/organizations/", json={"name": "Audit Inline"}).json()
+    assert any(s.lstrip().upper().startswith("INSERT INTO AUDIT_EVENTS") for s in statements)
+    events = client.get("/audit", params={"entity": "organization", "entity_id": org["id"]}).json()
+    assert [e["action"] for e in events] == ["create"]
+
+
+def test_writer_batches_applies_backpressure_and_drains_on_close():
+    started, release = threading.Event(), threading.Event()
+    batches: list[list[dict]] = []
+
+    def write(batch):
+        if threading.current_thread().name == "audit-writer":
+            started.set()
+            release.wait(5)
+        batches.append(list(batch))
+
+    writer = AuditWriter(write, max_pending=3, batch_size=2, flush_interval=0, enqueue_timeout=0.05)
+    writer.submit([{"n": 0}])
+    assert started.wait(5)  # the writer thread is busy with the first batch
+    writer.submit([{"n": n} for n in range(1, 6)])
+    # Three fit in the queue; the committer waited, then wrote the last two itself.
+    assert batches == [[{"n": 4}, {"n": 5}]]
+    assert writer.as_dict()["pending"] == 3 and writer.inline == 2
+
+    release.set()
+    writer.close()
+    assert sorted(record["n"] for batch in batches for record in batch) == list(range(6))
+    assert max(len(batch) for batch in batches) <= 2
+    assert writer.as_dict() == {"pending": 0, "submitted": 6, "written": 6, "batches": len(batches), "inline": 2, "lost": 0}
+
+    writer.submit([{"n": 6}])  # after close: written by the caller
+    assert batches[-1] == [{"n": 6}]
+
+
+def test_writer_logs_records_it_cannot_write(caplog):
+    def write(batch):
+        raise RuntimeError("database is down")
+
+    writer = AuditWriter(write, flush_interval=0)
+    writer.retry_delay = 0
+    writer.submit([{"entity": "user", "entity_id": 1, "action": "delete"}])
+    writer.flush()
+    writer.close()
+    assert writer.lost == 1 and writer.written == 0
+    assert '"action": "delete"' in caplog.text
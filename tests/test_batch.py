@@ -0,0 +1,75 @@
+from app.core.cache import Cache
+from app.core.config import get_settings
+
+
+def _setup(client, tag: str) -> dict:
+    org_ids = [client.post("/organizations/", json={"name": f"Batch {tag} Org {i}"}).json()["id"] for i in range(3)]
+    role = client.post("/roles/", json={"name": f"batch-{tag}-role", "permissions": ["roles:read"]}).json()
+    users = [
+        client.post(
+            "/users/",
+            json={"email": f"batch-{tag}-{i}@example.com", "password": "secret123", "organization_id": org_ids[i % 3]},
+        ).json()
+        for i in range(4)
+    ]
+    client.post(f"/roles/{role['id']}/members", json={"user_ids": [users[1]["id"]]})
+    return {"org_ids": org_ids, "role": role, "users": users}
+
+
+def test_users_batch_preserves_order_and_reports_missing(client, count_queries):
+    data = _setup(client, "users")
+    a, b, c = (user["id"] for user in data["users"][:3])
+
+    with count_queries() as statements:
+        resp = client.get("/users/batch", params={"ids": f"{c},999999,{a}"})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert [user["id"] for user in body["items"]] == [c, a] and body["missing"] == [999999]
+    assert len(statements) == 2  # users, then their roles
+
+    # Repeated parameters, duplicates, POST body and sparse fieldsets
+    resp = client.get(f"/users/batch?ids={b}&ids={a},{b}&fields=email,roles.name")
+    assert [(u["id"], set(u)) for u in resp.json()["items"]] == [(b, {"id", "email", "roles"}), (a, {"id", "email", "roles"})]
+    assert resp.json()["items"][0]["roles"] == [{"id": data["role"]["id"], "name": "batch-users-role"}]
+    resp = client.post("/users/batch", json={"ids": [a, b]}, params={"fields": "email"})
+    assert [set(u) for u in resp.json()["items"]] == [{"id", "email"}, {"id", "email"}]
+
+
+def test_batch_queries_are_chunked(client, count_queries, monkeypatch):
+    data = _setup(client, "chunks")
+    ids = [user["id"] for user in data["users"]]
+    monkeypatch.setattr(get_settings(), "BATCH_READ_CHUNK_SIZE", 2)
+    with count_queries() as statements:
+        resp = client.post("/users/batch", json={"ids": ids + [999998]}, params={"fields": "email"})
+    assert [u["id"] for u in resp.json()["items"]] == ids and resp.json()["missing"] == [999998]
+    assert len(statements) == 3  # ceil(5 / 2) chunks, no roles query
+
+
+def test_orgs_and_roles_batch_use_the_cache(client, count_queries):
+    data = _setup(client, "cache")
+    org_ids, role_id = data["org_ids"], data["role"]["id"]
+    client.get(f"/organizations/{org_ids[1]}")  # cached by id
+
+    organizations = Cache._registry["organizations"]
+    hits = organizations.hits
+    with count_queries() as statements:
+        resp = client.get("/organizations/batch", params={"ids": f"{org_ids[2]},{org_ids[1]},{org_ids[0]}"})
+    assert [org["id"] for org in resp.json()["items"]] == [org_ids[2], org_ids[1], org_ids[0]]
+    assert organizations.hits == hits + 1 and len(statements) == 1
+    with count_queries() as statements:
+        client.post("/organizations/batch", json={"ids": org_ids})
+    assert statements == []  # all cached now
+
+    resp = client.get("/roles/batch", params={"ids": f"999997,{role_id}"})
+    assert resp.json() == {"items": [{**data["role"]}], "missing": [999997]}
+    assert client.post("/roles/batch", json={"ids": [role_id]}).json()["items"][0]["permissions"] == ["roles:read"]
+
+
+def test_batch_rejects_bad_ids(client, monkeypatch):
+    assert client.get("/users/batch", params={"ids": "1,x"}).status_code == 400
+    assert client.get("/roles/batch", params={"ids": ","}).json()["detail"] == "Give at least one id"
+    assert client.get("/organizations/batch").status_code == 422
+    assert client.post("/roles/batch", json={"ids": []}).status_code == 422
+    monkeypatch.setattr(get_settings(), "BATCH_MAX_IDS", 2)
+    resp = client.post("/organizations/batch", json={"ids": [1, 2, 3]})
+    assert resp.status_code == 400 and resp.json()["detail"] == "At most 2 ids per request"
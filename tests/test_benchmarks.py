@@ -0,0 +1,45 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from benchmarks.compare import compare
+from benchmarks.run import percentile
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_compare_flags_p95_regressions():
+    base = {"results": {"GET /users/": {"p50_ms": 10, "p95_ms": 20, "rps": 100}}}
+    head = {"results": {
+        "GET /users/": {"p50_ms": 11, "p95_ms": 30, "rps": 90},
+        "GET /search": {"p50_ms": 1, "p95_ms": 2, "rps": 500},
+    }}
+    lines, regressions = compare(base, head, fail_above=20)
+    assert regressions == ["GET /users/"]
+    assert any("GET /search" in line and "(new)" in line for line in lines)
+
+
+def test_benchmark_run_covers_every_route(tmp_path):
+    output = tmp_path / "result.json"
+    proc = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.run",
+            "--seed-db", str(tmp_path / "seed.db"), "--scale", "0.001",
+            "--requests", "2", "--warmup", "0", "--output", str(output),
+        ],
+        cwd=ROOT, capture_output=True, text=True, timeout=300,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert "no benchmark scenario" not in proc.stderr
+    report = json.loads(output.read_text())
+    assert report["meta"]["dataset"]["users"] == 200
+    assert all(result["errors"] == 0 for result in report["results"].values()), report["results"]
+    assert report["results"]["GET /users/"]["requests"] == 2
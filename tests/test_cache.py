@@ -0,0 +1,99 @@
+import time
+
+from app.core.cache import MISSING, Cache, MemoryCacheBackend, SQLiteCacheBackend
+
+
+def test_role_reads_are_cached_and_invalidated_on_write(client, count_queries):
+    role_id = client.post("/roles/", json={"name": "cached-role"}).json()["id"]
+    client.get(f"/roles/{role_id}")
+    client.get("/roles/")
+
+    with count_queries() as statements:
+        assert client.get(f"/roles/{role_id}").json()["name"] == "cached-role"
+        assert any(r["id"] == role_id for r in client.get("/roles/").json())
+    assert statements == []
+
+    assert client.put(f"/roles/{role_id}", json={"name": "cached-role-2"}).status_code == 200
+    assert client.get(f"/roles/{role_id}").json()["name"] == "cached-role-2"
+    assert any(r["name"] == "cached-role-2" for r in client.get("/roles/").json())
+
+    assert client.delete(f"/roles/{role_id}").status_code == 204
+    assert client.get(f"/roles/{role_id}").status_code == 404
+
+    stats = client.get("/cache/stats").json()
+    assert stats["namespaces"]["roles"]["hits"] >= 2
+    assert stats["namespaces"]["roles"]["misses"] >= 2
+
+
+def test_organization_reads_are_cached(client, count_queries):
+    org_id = client.post("/organizations/", json={"name": "Cached Org"}).json()["id"]
+    client.get(f"/organizations/{org_id}")
+    with count_queries() as statements:
+        assert client.get(f"/organizations/{org_id}").status_code == 200
+    assert statements == []
+    client.put(f"/organizations/{org_id}", json={"description": "changed"})
+    assert client.get(f"/organizations/{org_id}").json()["description"] == "changed"
+
+
+def test_memory_backend_lru_and_ttl():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    assert backend.get("a") == 1  # "a" becomes most recently used
+    backend.set("c", 3, ttl=60)
+    assert backend.get("b") is MISSING
+    assert backend.get("a") == 1 and backend.get("c") == 3
+
+    backend.set("short", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert backend.get("short") is MISSING
+
+
+def test_cache_namespace_clear_and_counters():
+    cache = Cache("test-namespace", backend=MemoryCacheBackend())
+    other = Cache("test-other", backend=cache.backend)
+    calls = []
+    assert cache.get_or_load(1, lambda: calls.append(1) or "x") == "x"
+    assert cache.get_or_load(1, lambda: calls.append(1) or "y") == "x"
+    assert cache.get_or_load(2, lambda: None) is None
+    assert cache.get_or_load(2, lambda: None) is None
+    other.get_or_load(1, lambda: "other")
+    assert cache.stats() == {"hits": 1, "misses": 3}
+
+    cache.clear()
+    assert cache.get_or_load(1, lambda: "z") == "z"
+    assert other.get_or_load(1, lambda: "not used") == "other"
+
+
+def test_cache_counters_are_exact_under_concurrent_reads():
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = Cache("test-concurrent-counters", backend=MemoryCacheBackend())
+    cache.set("hot", 1)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible to expose lost updates
+
+    def read(_):
+        for _ in range(500):
+            cache.get_or_load("hot", lambda: 1)
+            cache.get_many(["hot", "cold"])
+
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(read, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+    assert cache.stats() == {"hits": 8 * 500 * 2, "misses": 8 * 500}
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    worker_a = SQLiteCacheBackend(path)
+    worker_b = SQLiteCacheBackend(path)
+    worker_a.set("roles:1", {"name": "admin"}, ttl=60)
+    assert worker_b.get("roles:1") == {"name": "admin"}
+    worker_b.delete_prefix("roles:")
+    assert worker_a.get("roles:1") is MISSING
+    worker_a.set("roles:2", "gone", ttl=-1)
+    assert worker_b.get("roles:2") is MISSING
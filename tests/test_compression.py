@@ -0,0 +1,90 @@
+import gzip
+from app.core.compression import choose_encoding
+
+
+def _seed(client, name: str, users: int = 30) -> dict:
+    org = client.post("/organizations/", json={"name": name}).json()
+    dept = client.post("/departments/", json={"name": f"{name} Dept", "organization_id": org["id"]}).json()
+    role = client.post("/roles/", json={"name": f"{name}-role", "description": "x" * 40}).json()
+    payload = [
+        {"email": f"{name.lower().replace(' ', '')}{i}@example.com", "full_name": f"User {i}", "password": "secret123",
+         "organization_id": org["id"], "department_id": dept["id"]}
+        for i in range(users)
+    ]
+    ids = [row["id"] for row in client.post("/users/bulk", json=payload).json()["results"]]
+    client.post(f"/roles/{role['id']}/members", json={"user_ids": ids})
+    return {"org": org, "dept": dept, "role": role, "user_ids": ids}
+
+
+def test_choose_encoding_honours_q_values():
+    assert choose_encoding("gzip, deflate", ("br", "gzip")) == "gzip"
+    assert choose_encoding("gzip;q=0.5, br", ("br", "gzip")) == "br"
+    assert choose_encoding("br;q=0.2, gzip;q=0.8", ("br", "gzip")) == "gzip"
+    assert choose_encoding("gzip;q=0", ("gzip",)) is None
+    assert choose_encoding("*", ("gzip",)) == "gzip"
+    assert choose_encoding("identity", ("gzip",)) is None
+
+
+def test_large_responses_are_gzipped_small_ones_are_not(client):
+    seeded = _seed(client, "Gzip Org")
+    params = {"organization_id": seeded["org"]["id"], "limit": 100}
+    resp = client.get("/users/", params=params, headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert len(resp.json()) == 30  # httpx decoded it
+    assert int(resp.headers["content-length"]) < len(resp.content)
+    assert resp.headers["etag"]
+
+    plain = client.get("/users/", params=params, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.json() == resp.json()
+    small = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    # Streaming exports are compressed chunk by chunk.
+    with client.stream(
+        "GET", "/users/export", params={"organization_id": seeded["org"]["id"]}, headers={"Accept-Encoding": "gzip"}
+    ) as export:
+        assert export.headers["content-encoding"] == "gzip"
+        raw = b"".join(export.iter_raw())
+    assert len(gzip.decompress(raw).splitlines()) == 30
+
+
+def test_sparse_fields_narrow_select_and_items(client, count_queries):
+    seeded = _seed(client, "Fields Org", users=3)
+    params = {"organization_id": seeded["org"]["id"]}
+    with count_queries() as statements:
+        resp = client.get("/users/", params={**params, "fields": "email"})
+    assert [set(item) for item in resp.json()] == [{"id", "email"}] * 3
+    assert len(statements) == 1 and "full_name" not in statements[0]
+
+    items = client.get("/users/", params={**params, "fields": "email,roles.name"}).json()
+    assert items[0]["roles"] == [{"id": seeded["role"]["id"], "name": "Fields Org-role"}]
+    full = client.get("/users/", params=params)
+    assert full.headers["etag"] != resp.headers["etag"]
+    assert client.get("/users/", params={"fields": "password"}).status_code == 400
+    assert client.get("/users/", params={"fields": "email.domain"}).status_code == 400
+
+    user_id = seeded["user_ids"][0]
+    detail = client.get(f"/users/{user_id}", params={"fields": "full_name"})
+    assert detail.json() == {"id": user_id, "full_name": "User 0"}
+    etag = detail.headers["etag"]
+    assert client.get(f"/users/{user_id}", params={"fields": "full_name"}, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"/users/{user_id}", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/users/999999", params={"fields": "email"}).status_code == 404
+
+    with count_queries() as statements:
+        orgs = client.get("/organizations/", params={"name_prefix": "Fields Org", "fields": "name"}).json()
+    assert orgs == [{"id": seeded["org"]["id"], "name": "Fields Org"}]
+    assert len(statements) == 1 and "description" not in statements[0]
+    # Each selection has its own cache entry: the full page is not served from the narrowed one.
+    full_orgs = client.get("/organizations/", params={"name_prefix": "Fields Org"}).json()
+    assert full_orgs[0]["description"] is None and "created_at" in full_orgs[0]
+
+    org_id = seeded["org"]["id"]
+    with count_queries() as statements:
+        org = client.get(f"/organizations/{org_id}/detail", params={"fields": "name,departments.name"}).json()
+    assert org == {"id": org_id, "name": "Fields Org", "departments": [{"id": seeded["dept"]["id"], "name": "Fields Org Dept"}]}
+    assert len(statements) == 2 and "path" not in statements[1]
+    with count_queries() as statements:
+        org = client.get(f"/organizations/{org_id}/detail", params={"fields": "name"}).json()
+    assert org == {"id": org_id, "name": "Fields Org"} and len(statements) == 1
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from app.models.role import Role
+from app.models.user import User
+
+
+def _revalidate(client, path: str, response, params=None):
+    return client.get(path, params=params, headers={"If-None-Match": response.headers["ETag"]})
+
+
+def test_organization_item_and_list_304(client, count_queries):
+    org = client.post("/organizations/", json={"name": "Conditional Org"}).json()
+    first = client.get(f"/organizations/{org['id']}")
+    assert first.headers["ETag"].startswith('W/"')
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert "Last-Modified" in first.headers
+
+    with count_queries() as statements:
+        again = _revalidate(client, f"/organizations/{org['id']}", first)
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert statements == []  # answered from the cached read model
+
+    since = client.get(f"/organizations/{org['id']}", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+    stale = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+    assert client.get(f"/organizations/{org['id']}", headers={"If-Modified-Since": stale}).status_code == 200
+
+    listing = client.get("/organizations/", params={"name_prefix": "Conditional"})
+    assert _revalidate(client, "/organizations/", listing, {"name_prefix": "Conditional"}).status_code == 304
+
+    client.put(f"/organizations/{org['id']}", json={"description": "changed"})
+    assert _revalidate(client, f"/organizations/{org['id']}", first).status_code == 200
+    assert _revalidate(client, "/organizations/", listing, {"name_prefix": "Conditional"}).status_code == 200
+
+
+def test_user_item_304_skips_loading(client, count_queries):
+    org = client.post("/organizations/", json={"name": "Conditional Users Org"}).json()
+    user = client.post(
+        "/users/", json={"email": "conditional@example.com", "password": "secret123", "organization_id": org["id"]}
+    ).json()
+    first = client.get(f"/users/{user['id']}")
+    with count_queries() as statements:
+        assert _revalidate(client, f"/users/{user['id']}", first).status_code == 304
+    assert len(statements) == 1  # the updated_at lookup only
+
+    client.put(f"/users/{user['id']}", json={"full_name": "Changed"})
+    changed = _revalidate(client, f"/users/{user['id']}", first)
+    assert changed.status_code == 200 and changed.json()["full_name"] == "Changed"
+    assert client.get("/users/999999", headers={"If-None-Match": first.headers["ETag"]}).status_code == 404
+
+
+def test_user_list_etag_tracks_page_rows_and_roles(client, db_session, count_queries):
+    org = client.post("/organizations/", json={"name": "Conditional List Org"}).json()
+    ids = [
+        client.post(
+            "/users/",
+            json={"email": f"conditional-list-{i}@example.com", "password": "secret123", "organization_id": org["id"]},
+        ).json()["id"]
+        for i in range(3)
+    ]
+    params = {"organization_id": org["id"]}
+    first = client.get("/users/", params=params)
+    with count_queries() as statements:
+        assert _revalidate(client, "/users/", first, params).status_code == 304
+    assert len(statements) == 1  # one aggregate, no rows or roles loaded
+
+    # Nested roles are part of the representation.
+    role = client.post("/roles/", json={"name": "conditional-role"}).json()
+    assert client.post(f"/roles/{role['id']}/members", json={"user_ids": [ids[0]]}).json()["changed"] == 1
+    second = _revalidate(client, "/users/", first, params)
+    assert second.status_code == 200 and second.json()[0]["roles"][0]["name"] == "conditional-role"
+
+    client.put(f"/roles/{role['id']}", json={"name": "conditional-role-renamed"})
+    third = _revalidate(client, "/users/", second, params)
+    assert third.status_code == 200 and third.json()[0]["roles"][0]["name"] == "conditional-role-renamed"
+
+    user = db_session.get(User, ids[1])
+    user.roles.append(db_session.get(Role, role["id"]))
+    db_session.commit()
+    assert _revalidate(client, "/users/", third, params).status_code == 200
+
+    fourth = client.get("/users/", params=params)
+    client.delete(f"/users/{ids[2]}")
+    assert _revalidate(client, "/users/", fourth, params).status_code == 200
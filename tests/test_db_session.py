@@ -0,0 +1,40 @@
+from sqlalchemy import text
+
+from app.core.config import Settings
+from app.db.session import POOL_STATS, create_db_engine, engine_options
+
+
+def test_sqlite_file_engine_applies_pragmas_and_pool_settings(tmp_path):
+    cfg = Settings(DB_POOL_SIZE=3, DB_MAX_OVERFLOW=2, SQLITE_CACHE_SIZE=-2048, SQLITE_MMAP_SIZE=1048576)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pragmas.db'}", cfg)
+    try:
+        assert engine.pool.size() == 3
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -2048
+            assert conn.execute(text("PRAGMA mmap_size")).scalar() == 1048576
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == cfg.SQLITE_BUSY_TIMEOUT_MS
+            assert POOL_STATS[engine].checked_out == 1
+        with engine.connect():
+            pass
+        stats = POOL_STATS[engine].as_dict()
+        assert stats["connects"] == 1
+        assert stats["checkouts"] == 2 and stats["checkins"] == 2
+        assert stats["checked_out"] == 0 and stats["peak_checked_out"] == 1
+    finally:
+        engine.dispose()
+
+
+def test_engine_options_skip_pool_sizing_for_memory_sqlite():
+    cfg = Settings()
+    assert "pool_size" not in engine_options("sqlite://", cfg)
+    assert "pool_size" not in engine_options("sqlite:///:memory:", cfg)
+    opts = engine_options("postgresql+psycopg2://u:p@db/erp", cfg)
+    assert opts["pool_size"] == cfg.DB_POOL_SIZE and opts["pool_pre_ping"] is cfg.DB_POOL_PRE_PING
+    assert "connect_args" not in opts
+
+
+def test_pool_stats_endpoint(client):
+    body = client.get("/db/pool/stats").json()
+    assert {"connects", "checkouts", "checked_out", "status"} <= set(body["sync"])
@@ -0,0 +1,150 @@
+def _org(client, name: str) -> int:
+    resp = client.post("/organizations/", json={"name": name})
+    assert resp.status_code == 201, resp.text
+    return resp.json()["id"]
+
+
+def _dept(client, org_id: int, name: str, parent_id: int | None = None) -> dict:
+    resp = client.post("/departments/", json={"name": name, "organization_id": org_id, "parent_id": parent_id})
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def test_department_tree_and_descendants(client, count_queries):
+    org_id = _org(client, "Tree Hospital")
+    medicine = _dept(client, org_id, "Medicine")
+    cardio = _dept(client, org_id, "Cardiology", medicine["id"])
+    ward = _dept(client, org_id, "Cardio Ward", cardio["id"])
+    surgery = _dept(client, org_id, "Surgery")
+    assert ward["path"] == f"/{medicine['id']}/{cardio['id']}/{ward['id']}/"
+    assert ward["depth"] == 2
+
+    with count_queries() as statements:
+        resp = client.get(f"/organizations/{org_id}/departments/tree")
+    assert resp.status_code == 200
+    # (cached) organization existence check + one query for the whole tree
+    assert len(statements) <= 2
+    roots = resp.json()
+    assert [r["name"] for r in roots] == ["Medicine", "Surgery"]
+    assert roots[0]["children"][0]["children"][0]["id"] == ward["id"]
+    assert roots[1]["children"] == []
+
+    resp = client.get(f"/departments/{medicine['id']}/descendants")
+    assert [d["id"] for d in resp.json()] == [cardio["id"], ward["id"]]
+    resp = client.get(f"/departments/{surgery['id']}/descendants", params={"include_self": True})
+    assert [d["id"] for d in resp.json()] == [surgery["id"]]
+
+
+def test_move_department_rewrites_subtree(client):
+    org_id = _org(client, "Move Hospital")
+    a = _dept(client, org_id, "A")
+    b = _dept(client, org_id, "B", a["id"])
+    c = _dept(client, org_id, "C", b["id"])
+    other = _dept(client, org_id, "Other")
+
+    resp = client.put(f"/departments/{b['id']}", json={"parent_id": other["id"]})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["path"] == f"/{other['id']}/{b['id']}/"
+    moved_c = client.get(f"/departments/{c['id']}").json()
+    assert moved_c["path"] == f"/{other['id']}/{b['id']}/{c['id']}/"
+    assert moved_c["depth"] == 2
+    assert client.get(f"/departments/{a['id']}/descendants").json() == []
+
+    # Explicit null moves to the root.
+    resp = client.put(f"/departments/{b['id']}", json={"parent_id": None})
+    assert resp.json()["path"] == f"/{b['id']}/" and resp.json()["depth"] == 0
+    assert client.get(f"/departments/{c['id']}").json()["depth"] == 1
+
+    # Cycles are rejected.
+    resp = client.put(f"/departments/{b['id']}", json={"parent_id": c["id"]})
+    assert resp.status_code == 400
+    assert client.get(f"/departments/{b['id']}").json()["parent_id"] is None
+
+
+def test_subtree_users_and_delete_rules(client):
+    org_id = _org(client, "Users Hospital")
+    root = _dept(client, org_id, "Root")
+    leaf = _dept(client, org_id, "Leaf", root["id"])
+    for email, dept_id in [("root@tree.example.com", root["id"]), ("leaf@tree.example.com", leaf["id"])]:
+        client.post(
+            "/users/",
+            json={"email": email, "password": "secret123", "organization_id": org_id, "department_id": dept_id},
+        )
+    emails = {u["email"] for u in client.get(f"/departments/{root['id']}/users").json()}
+    assert emails == {"root@tree.example.com", "leaf@tree.example.com"}
+    assert [u["email"] for u in client.get(f"/departments/{leaf['id']}/users").json()] == ["leaf@tree.example.com"]
+
+    other_org = _org(client, "Other Users Hospital")
+    resp = client.post("/departments/", json={"name": "X", "organization_id": other_org, "parent_id": root["id"]})
+    assert resp.status_code == 400
+
+    assert client.delete(f"/departments/{root['id']}").status_code == 400
+    assert client.delete(f"/departments/{leaf['id']}").status_code == 204
+    assert client.get(f"/departments/{root['id']}/descendants").json() == []
+
+
+def test_rebuild_department_paths_backfills_adjacency_rows(db_session):
+    from app.models.department import Department
+    from app.models.organization import Organization
+    from app.services.department_service import rebuild_department_paths
+
+    org = Organization(name="Backfill Hospital")
+    db_session.add(org)
+    db_session.flush()
+    top = Department(name="Top", organization_id=org.id)
+    db_session.add(top)
+    db_session.flush()
+    child = Department(name="Child", organization_id=org.id, parent_id=top.id)
+    db_session.add(child)
+    db_session.commit()
+    assert child.path == ""
+
+    assert rebuild_department_paths(db_session, org.id) == 2
+    assert child.path == f"/{top.id}/{child.id}/" and child.depth == 1
+    assert rebuild_department_paths(db_session, org.id) == 0
+
+
+def test_create_schema_adds_paths_to_existing_departments_table(tmp_path):
+    from sqlalchemy import text
+
+    from app.core.config import Settings
+    from app.db.schema import prepare_schema
+    from app.db.session import create_db_engine
+
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'old.db'}", Settings(DB_POOL_SIZE=2))
+    try:
+        # departments as created by create_all before path/depth existed
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE organizations (id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL)"))
+            conn.execute(text(
+                "CREATE TABLE departments (id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, "
+                "organization_id INTEGER NOT NULL REFERENCES organizations (id), "
+                "parent_id INTEGER REFERENCES departments (id))"
+            ))
+            conn.execute(text("INSERT INTO organizations (id, name) VALUES (1, 'Old Hospital')"))
+            conn.execute(text(
+                "INSERT INTO departments (id, name, organization_id, parent_id) "
+                "VALUES (1, 'Top', 1, NULL), (2, 'Child', 1, 1), (3, 'Grandchild', 1, 2)"
+            ))
+
+        prepare_schema(engine, "create")
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT id, path, depth FROM departments ORDER BY id")).all()
+            indexes = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars().all()
+        assert rows == [(1, "/1/", 0), (2, "/1/2/", 1), (3, "/1/2/3/", 2)]
+        assert "ix_departments_path" in indexes
+        prepare_schema(engine, "create")  # idempotent: nothing left to add
+    finally:
+        engine.dispose()
+
+
+def test_department_path_compares_in_byte_order_on_postgresql():
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateTable
+
+    from app.models.department import Department
+
+    dialect = postgresql.dialect()
+    assert 'path VARCHAR(1024) COLLATE "C" NOT NULL' in str(CreateTable(Department.__table__).compile(dialect=dialect))
+    # the range bounds are only meaningful in byte order: "/" (0x2F) sorts right before "0"
+    assert "/1/5/" < "/1/5/12/" < "/1/50" < "/1/50/"
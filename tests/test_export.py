@@ -0,0 +1,122 @@
+import asyncio
+import csv
+import io
+import json
+from app.api import responses
+from app.models.department import Department
+from app.models.organization import Organization
+from app.models.role import Role
+from app.models.user import User
+from app.services.user_service import export_users_stmt
+
+
+def _seed(db_session, name: str) -> dict[str, int]:
+    org = Organization(name=name)
+    roles = [Role(name=f"{name}-auditor"), Role(name=f"{name}-admin")]
+    db_session.add_all([org, *roles])
+    db_session.flush()
+    root = Department(name="Root", organization_id=org.id)
+    db_session.add(root)
+    db_session.flush()
+    child = Department(name="Child", organization_id=org.id, parent_id=root.id, depth=1)
+    db_session.add(child)
+    db_session.flush()
+    root.path, child.path = f"/{root.id}/", f"/{root.id}/{child.id}/"
+    users = [
+        User(email=f"{name.lower()}-{i}@example.com", full_name=f"Export {i}", hashed_password="x",
+             organization_id=org.id, department_id=(root.id, child.id, None)[i % 3], roles=roles[: i % 3])
+        for i in range(7)
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+    ids = {"org": org.id, "root": root.id, "child": child.id}
+    db_session.expunge_all()
+    return ids
+
+
+def _ndjson(resp) -> list[dict]:
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_users_export_ndjson(client, db_session):
+    ids = _seed(db_session, "ExportNd")
+    resp = client.get("/users/export", params={"organization_id": ids["org"]})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert resp.headers["content-disposition"] == 'attachment; filename="users.ndjson"'
+    rows = _ndjson(resp)
+    assert [r["email"] for r in rows] == [f"exportnd-{i}@example.com" for i in range(7)]
+    assert rows[0]["roles"] == []
+    assert rows[2]["roles"] == ["ExportNd-admin", "ExportNd-auditor"]
+    assert set(rows[0]) == {
+        "id", "email", "full_name", "is_active", "organization_id", "department_id", "created_at", "updated_at", "roles",
+    }
+    assert rows[0]["created_at"] == client.get(f"/users/{rows[0]['id']}").json()["created_at"]
+
+
+def test_users_export_csv(client, db_session):
+    ids = _seed(db_session, "ExportCsv")
+    resp = client.get("/users/export", params={"organization_id": ids["org"], "format": "csv"})
+    assert resp.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == 7
+    assert rows[2]["roles"] == "ExportCsv-admin;ExportCsv-auditor"
+    assert rows[2]["full_name"] == "Export 2"
+
+
+def test_users_export_department_filters(client, db_session):
+    ids = _seed(db_session, "ExportDept")
+    only_root = _ndjson(client.get("/users/export", params={"department_id": ids["root"]}))
+    subtree = _ndjson(
+        client.get("/users/export", params={"department_id": ids["root"], "include_subdepartments": True})
+    )
+    assert {r["department_id"] for r in only_root} == {ids["root"]}
+    assert {r["department_id"] for r in subtree} == {ids["root"], ids["child"]}
+    assert len(subtree) == 5
+    assert client.get("/users/export", params={"department_id": 999999}).status_code == 404
+
+
+def test_users_export_streams_in_partitions_with_one_query(db_session, count_queries, monkeypatch):
+    ids = _seed(db_session, "ExportChunks")
+    monkeypatch.setattr(responses, "EXPORT_PARTITION_SIZE", 2)
+    response = responses.export_response(db_session, export_users_stmt(ids["org"]), "ndjson", "users", ("roles",))
+
+    async def consume() -> list[bytes]:
+        return [chunk async for chunk in response.body_iterator]
+
+    with count_queries() as statements:
+        chunks = asyncio.run(consume())
+    assert len(statements) == 1
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 2, 1]
+
+
+def test_organizations_export(client, db_session):
+    _seed(db_session, "ExportOrgs")
+    rows = _ndjson(client.get("/organizations/export"))
+    assert "ExportOrgs" in {r["name"] for r in rows}
+    assert [r["id"] for r in rows] == sorted(r["id"] for r in rows)
+    header = client.get("/organizations/export", params={"format": "csv"}).text.splitlines()[0]
+    assert header == "id,name,description,created_at,updated_at"
+
+
+def test_ndjson_encoding_is_the_same_without_orjson(monkeypatch):
+    from datetime import datetime
+    from app.services import export
+
+    rows = [(1, "Ünïcode", datetime(2024, 5, 1, 12, 30, 0, 120), "b\x1fa"), (2, None, datetime(2024, 5, 2), None)]
+    columns = ["id", "name", "created_at", "roles"]
+    fast = export.encode_ndjson(rows, columns, ("roles",))
+    monkeypatch.setattr(export, "orjson", None)
+    assert export.encode_ndjson(rows, columns, ("roles",)) == fast
+
+
+def test_export_body_does_not_use_the_request_session(db_session):
+    ids = _seed(db_session, "ExportOwnSession")
+    response = responses.export_response(db_session, export_users_stmt(ids["org"]), "ndjson", "users", ("roles",))
+    db_session.close()  # what get_session's teardown does before the body is sent
+
+    async def consume() -> list[bytes]:
+        return [chunk async for chunk in response.body_iterator]
+
+    assert b"".join(asyncio.run(consume())).count(b"\n") == 7
+    assert not db_session.in_transaction()
@@ -0,0 +1,55 @@
+"""The list endpoints serialize through TypeAdapter + FastJSONResponse; their
+output must stay identical to the per-object response_model path."""
+from app.api import responses
+from app.api.responses import FastJSONResponse
+from app.models.organization import Organization
+from app.models.role import Role
+from app.models.user import User
+
+
+def _seed(db_session, tag: str) -> None:
+    org = Organization(name=f"FastJson {tag}", description="fast")
+    roles = [Role(name=f"fastjson-{tag}-b"), Role(name=f"fastjson-{tag}-a")]
+    db_session.add_all([org, *roles])
+    db_session.flush()
+    db_session.add_all(
+        User(email=f"fastjson-{tag}-{i}@example.com", full_name=f"Fast {i}", hashed_password="x",
+             organization_id=org.id, roles=roles[: i % 3])
+        for i in range(5)
+    )
+    db_session.commit()
+    db_session.expunge_all()
+
+
+def test_user_list_matches_detail_serialization(client, db_session):
+    _seed(db_session, "users")
+    resp = client.get("/users/", params={"limit": 500})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    listed = [u for u in resp.json() if u["email"].startswith("fastjson-users-")]
+    assert len(listed) == 5
+    for user in listed:
+        detail = client.get(f"/users/{user['id']}").json()
+        detail["roles"].sort(key=lambda role: role["id"])
+        assert user == detail
+
+
+def test_organization_list_matches_detail_serialization(client, db_session):
+    _seed(db_session, "orgs")
+    listed = {o["name"]: o for o in client.get("/organizations/", params={"limit": 500}).json()}
+    org = listed["FastJson orgs"]
+    assert org == client.get(f"/organizations/{org['id']}").json()
+
+
+def test_list_cursor_header_survives_custom_response(client, db_session):
+    _seed(db_session, "cursor")
+    resp = client.get("/users/", params={"limit": 2})
+    assert "X-Next-Cursor" in resp.headers
+    nxt = client.get("/users/", params={"limit": 2, "after": resp.headers["X-Next-Cursor"]})
+    assert [u["id"] for u in nxt.json()][0] > resp.json()[-1]["id"]
+
+
+def test_fast_json_response_without_orjson(monkeypatch):
+    monkeypatch.setattr(responses, "orjson", None)
+    assert FastJSONResponse({"a": "é", "n": [1, None]}).body == '{"a":"é","n":[1,null]}'.encode()
+    assert FastJSONResponse(b'[{"id":1}]').body == b'[{"id":1}]'
@@ -0,0 +1,61 @@
+import re
+import pytest
+
+
+def _timing(resp) -> dict[str, str]:
+    entries = {}
+    for part in resp.headers["server-timing"].split(","):
+        name, *params = part.strip().split(";")
+        entries[name] = ";".join(params)
+    return entries
+
+
+def test_server_timing_header_reports_sql(client):
+    org_id = client.post("/organizations/", json={"name": "Timing Org"}).json()["id"]
+    resp = client.get(f"/organizations/{org_id}/detail")
+    assert resp.status_code == 200
+    timing = _timing(resp)
+    assert set(timing) == {"db", "app", "ser", "total"}
+    assert 'desc="2 queries"' in timing["db"]
+    assert re.match(r"dur=\d+\.\d+$", timing["total"])
+
+
+def test_metrics_endpoint_exposes_route_histograms(client):
+    client.post("/roles/", json={"name": "metrics-role"})
+    for _ in range(3):
+        client.get("/roles/")
+    client.get("/no/such/path")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    text = resp.text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert re.search(r'http_request_duration_seconds_count\{method="GET",route="/roles/"\} [3-9]', text)
+    assert 'http_requests_total{method="POST",route="/roles/",status="201"}' in text
+    assert 'http_request_db_statements_bucket{method="GET",route="/roles/",le="+Inf"}' in text
+    assert 'route="<unmatched>"' in text
+    assert 'cache_hits_total{namespace="roles"}' in text
+    assert "db_pool_checkouts_total" in text
+
+
+def test_failed_statement_leaves_no_timing_state(db_session):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    from app.core import metrics
+
+    stats = metrics.RequestStats()
+    token = metrics._current.set(stats)
+    try:
+        conn = db_session.connection()
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        db_session.rollback()
+        conn = db_session.connection()
+        conn.execute(text("SELECT 1"))
+    finally:
+        metrics._current.reset(token)
+    assert not conn.info.get("query_start_time")
+    assert stats.sql_count == 1
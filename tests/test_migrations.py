@@ -0,0 +1,49 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _alembic(db_path: Path, *args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    return subprocess.run(
+        [sys.executable, "-m", "alembic", *args], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+
+
+def test_migrations_match_models_and_downgrade(tmp_path):
+    db_path = tmp_path / "migrated.db"
+    upgrade = _alembic(db_path, "upgrade", "head")
+    assert upgrade.returncode == 0, upgrade.stderr
+    # The migrated schema is exactly what the models declare.
+    check = _alembic(db_path, "check")
+    assert check.returncode == 0, check.stdout + check.stderr
+    downgrade = _alembic(db_path, "downgrade", "base")
+    assert downgrade.returncode == 0, downgrade.stderr
+
+
+def test_stamped_baseline_database_upgrades_to_head(tmp_path):
+    # A database created by the app before migrations existed: the baseline tables only.
+    db_path = tmp_path / "stamped.db"
+    assert _alembic(db_path, "upgrade", "0001").returncode == 0
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO organizations (id, name, created_at, updated_at) "
+            "VALUES (1, 'Old Hospital', '2024-01-01', '2024-01-01')"
+        )
+        conn.executemany(
+            "INSERT INTO departments (id, name, organization_id, parent_id) VALUES (?, ?, 1, ?)",
+            [(1, "Medicine", None), (2, "Cardiology", 1), (3, "Cardiac Ward", 2), (4, "Orphan", 99)],
+        )
+
+    upgrade = _alembic(db_path, "upgrade", "head")
+    assert upgrade.returncode == 0, upgrade.stderr
+    check = _alembic(db_path, "check")
+    assert check.returncode == 0, check.stdout + check.stderr
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT id, path, depth FROM departments ORDER BY id").fetchall()
+        assert rows == [(1, "/1/", 0), (2, "/1/2/", 1), (3, "/1/2/3/", 2), (4, "/4/", 0)]
+        assert conn.execute("SELECT count(*) FROM search_index WHERE kind = 'department'").fetchone() == (4,)
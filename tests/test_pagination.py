@@ -0,0 +1,134 @@
+from app.services.pagination import encode_cursor
+
+
+def _walk(client, path: str, limit: int, order_by: str = "id") -> list[dict]:
+    items: list[dict] = []
+    params = {"limit": limit, "order_by": order_by}
+    while True:
+        resp = client.get(path, params=params)
+        assert resp.status_code == 200, resp.text
+        items.extend(resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return items
+        params = {"limit": limit, "order_by": order_by, "after": cursor}
+
+
+def test_roles_cursor_pagination_matches_offset_listing(client):
+    for i in range(7):
+        resp = client.post("/roles/", json={"name": f"page-role-{i}"})
+        assert resp.status_code == 201, resp.text
+
+    full = client.get("/roles/", params={"limit": 1000}).json()
+    walked = _walk(client, "/roles/", limit=3)
+    assert [r["id"] for r in walked] == [r["id"] for r in full]
+    assert [r["id"] for r in full] == sorted(r["id"] for r in full)
+
+    by_name = _walk(client, "/roles/", limit=2, order_by="name")
+    assert [r["name"] for r in by_name] == sorted(r["name"] for r in full)
+
+
+def test_organizations_cursor_pagination(client):
+    for i in range(5):
+        client.post("/organizations/", json={"name": f"Paged Org {i}"})
+    full = client.get("/organizations/", params={"limit": 1000}).json()
+    assert [o["id"] for o in _walk(client, "/organizations/", limit=2)] == [o["id"] for o in full]
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/users/", params={"after": "not-a-cursor"}).status_code == 400
+
+    client.post("/roles/", json={"name": "cursor-a"})
+    client.post("/roles/", json={"name": "cursor-b"})
+    cursor = client.get("/roles/", params={"limit": 1}).headers["X-Next-Cursor"]
+    # A cursor minted for id ordering cannot be replayed against name ordering.
+    resp = client.get("/roles/", params={"limit": 1, "after": cursor, "order_by": "name"})
+    assert resp.status_code == 400
+
+    # Well-formed cursors whose values do not fit the sort keys.
+    crafted = [
+        ("/users/", "id", ["id"], [{}]),
+        ("/users/", "id", ["id"], ["1"]),
+        ("/users/", "id", ["id"], [True]),
+        ("/users/", "created_at", ["created_at", "id"], [1, 1]),
+        ("/users/", "created_at", ["created_at", "id"], ["yesterday", 1]),
+        ("/roles/", "name", ["name"], [["cursor-a"]]),
+        ("/organizations/", "-name", ["-name"], [1.5]),
+    ]
+    for path, order_by, keys, values in crafted:
+        resp = client.get(path, params={"order_by": order_by, "after": encode_cursor(keys, values)})
+        assert resp.status_code == 400, (path, values)
+    assert client.get("/roles/", params={"order_by": "name", "after": encode_cursor(["name"], ["cursor-a"])}).status_code == 200
+
+
+def _seed_filter_users(client, tag: str) -> tuple[dict, list[dict], dict]:
+    org = client.post("/organizations/", json={"name": f"Filter Org {tag}"}).json()
+    dept = client.post("/departments/", json={"name": "Filtered", "organization_id": org["id"]}).json()
+    role = client.post("/roles/", json={"name": f"filter-role-{tag}"}).json()
+    users = []
+    for i in range(5):
+        resp = client.post(
+            "/users/",
+            json={
+                "email": f"filter-{tag}-{i}@example.com",
+                "password": "secret123",
+                "organization_id": org["id"],
+                "department_id": dept["id"] if i % 2 else None,
+                "is_active": i != 4,
+            },
+        )
+        assert resp.status_code == 201, resp.text
+        users.append(resp.json())
+    return org, users, role
+
+
+def test_user_list_filters(client, db_session):
+    from app.models.role import Role
+    from app.models.user import User
+
+    org, users, role = _seed_filter_users(client, "a")
+    holder = db_session.get(User, users[2]["id"])
+    holder.roles.append(db_session.get(Role, role["id"]))
+    db_session.commit()
+
+    def ids(**params) -> list[int]:
+        resp = client.get("/users/", params={"organization_id": org["id"], **params})
+        assert resp.status_code == 200, resp.text
+        return [u["id"] for u in resp.json()]
+
+    assert ids() == [u["id"] for u in users]
+    assert ids(is_active=False) == [users[4]["id"]]
+    assert ids(is_active=True, department_id=users[1]["department_id"]) == [users[1]["id"], users[3]["id"]]
+    assert ids(role_id=role["id"]) == [users[2]["id"]]
+    assert ids(created_after=users[3]["created_at"]) == [users[3]["id"], users[4]["id"]]
+    assert ids(created_before=users[1]["created_at"] + "Z") == [users[0]["id"]]
+
+
+def test_user_list_descending_sort_with_cursor(client):
+    org, users, _ = _seed_filter_users(client, "b")
+    params = {"organization_id": org["id"], "order_by": "-created_at", "limit": 2}
+    walked: list[int] = []
+    while True:
+        resp = client.get("/users/", params=params)
+        assert resp.status_code == 200, resp.text
+        walked += [u["id"] for u in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["after"] = cursor
+    assert walked == [u["id"] for u in reversed(users)]
+
+    # A cursor minted for the descending order cannot continue the ascending one.
+    first = client.get("/users/", params={"organization_id": org["id"], "order_by": "-created_at", "limit": 2})
+    cursor = first.headers["X-Next-Cursor"]
+    resp = client.get("/users/", params={"order_by": "created_at", "after": cursor})
+    assert resp.status_code == 400
+
+
+def test_organization_list_filters(client):
+    for name in ("Prefix_Alpha", "Prefix_Beta", "PrefixGamma"):
+        client.post("/organizations/", json={"name": name})
+    names = [o["name"] for o in client.get("/organizations/", params={"name_prefix": "Prefix_"}).json()]
+    assert names == ["Prefix_Alpha", "Prefix_Beta"]  # "_" is matched literally
+    names = [o["name"] for o in client.get("/organizations/", params={"name_prefix": "Prefix", "order_by": "-name"}).json()]
+    assert names == ["Prefix_Beta", "Prefix_Alpha", "PrefixGamma"]
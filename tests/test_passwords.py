@@ -0,0 +1,90 @@
+import hashlib
+import pytest
+from sqlalchemy import select, update
+from app.core.passwords import HashingPool, PasswordHasher, ScryptHasher, _check, _hash, identify_hasher
+from app.models.user import User
+
+
+def test_scrypt_format_is_versioned_and_self_describing():
+    hasher = ScryptHasher(n=1024, r=8, p=1)
+    encoded = hasher.hash("s3cret!")
+    assert encoded.startswith("$scrypt$v=1$n=1024,r=8,p=1$")
+    assert hasher.verify("s3cret!", encoded) and not hasher.verify("wrong", encoded)
+    # Parameters are read from the hash, so a differently configured hasher still verifies it.
+    stronger = ScryptHasher(n=2048)
+    assert stronger.verify("s3cret!", encoded)
+    assert stronger.needs_rehash(encoded) and not hasher.needs_rehash(encoded)
+    assert identify_hasher(hashlib.sha256(b"x").hexdigest()).scheme == "sha256"
+    assert identify_hasher("x" * 64) is None
+    with pytest.raises(TypeError):
+        PasswordHasher()  # abstract: schemes implement identify/hash/verify
+
+
+def test_malformed_scrypt_hashes_do_not_verify():
+    hasher = ScryptHasher(n=1024)
+    salt_key = hasher.hash("s3cret!").rsplit("$", 2)[-2:]
+    for params in ("n=1024", "n=1024,r=8", "n=1024,r=8,p=1,x=1", "n=1000,r=8,p=1", "n=1024,r=0,p=1", "r", "n=a,r=8,p=1"):
+        encoded = "$".join(["", "scrypt", "v=1", params, *salt_key])
+        assert not hasher.verify("s3cret!", encoded) and hasher.needs_rehash(encoded), params
+    for encoded in ("$scrypt$v=1", f"$scrypt$v=1$n=1024,r=8,p=1${salt_key[0]}$", "$scrypt$v=1$n=1024,r=8,p=1$!$!"):
+        assert not hasher.verify("s3cret!", encoded), encoded
+
+
+def test_check_upgrades_legacy_and_outdated_hashes():
+    current = ScryptHasher(n=1024)
+    legacy = hashlib.sha256(b"s3cret!").hexdigest()
+    valid, replacement = _check(current, "s3cret!", legacy)
+    assert valid and replacement.startswith("$scrypt$")
+    assert _check(current, "s3cret!", replacement) == (True, None)
+    assert _check(current, "wrong", legacy) == (False, None)
+    assert _check(current, "s3cret!", None) == (False, None)
+
+
+def test_pool_hashes_in_worker_processes():
+    pool = HashingPool(workers=2, max_pending=2)
+    try:
+        hasher = ScryptHasher(n=1024)
+        hashes = pool.map(_hash, [(hasher, f"password-{i}") for i in range(6)])
+        assert len(set(hashes)) == 6
+        assert all(hasher.verify(f"password-{i}", encoded) for i, encoded in enumerate(hashes))
+        assert pool.run(_check, hasher, "password-0", hashes[0]) == (True, None)
+    finally:
+        pool.shutdown()
+
+
+def test_login_rehashes_legacy_password(client, db_session):
+    org = client.post("/organizations/", json={"name": "Login Org"}).json()
+    user = client.post(
+        "/users/", json={"email": "login@example.com", "password": "s3cret!", "organization_id": org["id"]}
+    ).json()
+    stored = db_session.execute(select(User.hashed_password).where(User.id == user["id"])).scalar_one()
+    assert stored.startswith("$scrypt$")
+
+    login = {"email": "login@example.com", "password": "s3cret!"}
+    resp = client.post("/auth/login", json=login)
+    assert resp.status_code == 200 and resp.json()["id"] == user["id"]
+    assert client.post("/auth/login", json={**login, "password": "wrong"}).status_code == 401
+    assert client.post("/auth/login", json={**login, "email": "nobody@example.com"}).status_code == 401
+
+    # A hash from before versioning is accepted once and replaced, without touching updated_at.
+    legacy = hashlib.sha256(b"s3cret!").hexdigest()
+    db_session.execute(update(User).where(User.id == user["id"]).values(hashed_password=legacy))
+    db_session.commit()
+    before = client.get(f"/users/{user['id']}").json()["updated_at"]
+    assert client.post("/auth/login", json=login).status_code == 200
+    db_session.expire_all()
+    stored = db_session.execute(select(User.hashed_password).where(User.id == user["id"])).scalar_one()
+    assert stored.startswith("$scrypt$") and stored != legacy
+    assert client.get(f"/users/{user['id']}").json()["updated_at"] == before
+
+    # A corrupt stored hash is a failed login, not a server error.
+    db_session.execute(
+        update(User).where(User.id == user["id"]).values(hashed_password="$scrypt$v=1$n=16384$c2FsdA$a2V5")
+    )
+    db_session.commit()
+    assert client.post("/auth/login", json=login).status_code == 401
+    db_session.execute(update(User).where(User.id == user["id"]).values(hashed_password=stored))
+    db_session.commit()
+
+    client.patch(f"/users/{user['id']}", json={"is_active": False})
+    assert client.post("/auth/login", json=login).status_code == 401
@@ -0,0 +1,152 @@
+import pytest
+from app.core.permissions import PERMISSIONS, permission_mask, permission_names
+from app.models.role import Role
+from app.models.user import User
+from app.services.permission_service import UnknownPermission, has_permission, permission_cache
+
+
+def _setup(client, tag: str) -> dict:
+    org = client.post("/organizations/", json={"name": f"Perm Org {tag}"}).json()
+    root = client.post("/departments/", json={"name": "HQ", "organization_id": org["id"]}).json()
+    child = client.post(
+        "/departments/", json={"name": "Team", "organization_id": org["id"], "parent_id": root["id"]}
+    ).json()
+    user = client.post(
+        "/users/",
+        json={
+            "email": f"perm-{tag}@example.com",
+            "password": "secret123",
+            "organization_id": org["id"],
+            "department_id": child["id"],
+        },
+    ).json()
+    return {"org": org, "root": root, "child": child, "user": user}
+
+
+def _permissions(client, user_id: int) -> list[str]:
+    resp = client.get(f"/users/{user_id}/permissions")
+    assert resp.status_code == 200, resp.text
+    return resp.json()["permissions"]
+
+
+def test_permission_mask_round_trip():
+    assert permission_names(permission_mask(["users:write", "users:read", "nope"])) == ["users:read", "users:write"]
+    assert permission_names(permission_mask(PERMISSIONS)) == list(PERMISSIONS)
+
+
+def test_role_permissions_are_validated_and_stored_in_catalog_order(client):
+    resp = client.post("/roles/", json={"name": "perm-bad", "permissions": ["users:fly"]})
+    assert resp.status_code == 422
+    resp = client.post("/roles/", json={"name": "perm-ordered", "permissions": ["users:write", "users:read", "users:read"]})
+    assert resp.json()["permissions"] == ["users:read", "users:write"]
+
+
+def test_direct_roles_and_invalidation(client, db_session):
+    ids = _setup(client, "direct")
+    user_id = ids["user"]["id"]
+    role = client.post("/roles/", json={"name": "perm-direct", "permissions": ["users:read"]}).json()
+    assert _permissions(client, user_id) == []
+
+    user = db_session.get(User, user_id)
+    user.roles.append(db_session.get(Role, role["id"]))
+    db_session.commit()
+    assert _permissions(client, user_id) == ["users:read"]
+
+    # Changing the role's permission set drops every cached entry.
+    client.put(f"/roles/{role['id']}", json={"permissions": ["users:read", "reports:read"]})
+    assert _permissions(client, user_id) == ["users:read", "reports:read"]
+
+    # Deactivated users hold nothing.
+    client.put(f"/users/{user_id}", json={"is_active": False})
+    assert _permissions(client, user_id) == []
+    assert client.get("/users/999999/permissions").status_code == 404
+
+
+def test_department_grants_follow_the_hierarchy(client):
+    ids = _setup(client, "dept")
+    user_id, root_id, child_id = ids["user"]["id"], ids["root"]["id"], ids["child"]["id"]
+    role = client.post("/roles/", json={"name": "perm-dept", "permissions": ["departments:read"]}).json()
+
+    resp = client.put(f"/departments/{root_id}/roles/{role['id']}", params={"include_subdepartments": False})
+    assert resp.status_code == 200
+    assert resp.json() == {"department_id": root_id, "role_id": role["id"], "include_subdepartments": False}
+    assert _permissions(client, user_id) == []  # the grant stops at the root
+
+    client.put(f"/departments/{root_id}/roles/{role['id']}")
+    assert _permissions(client, user_id) == ["departments:read"]
+
+    # Moving the user's department out of the subtree removes the inherited role.
+    client.put(f"/departments/{child_id}", json={"parent_id": None})
+    assert _permissions(client, user_id) == []
+    client.put(f"/departments/{child_id}", json={"parent_id": root_id})
+    assert _permissions(client, user_id) == ["departments:read"]
+
+    assert client.delete(f"/departments/{root_id}/roles/{role['id']}").status_code == 204
+    assert _permissions(client, user_id) == []
+    assert client.delete(f"/departments/{root_id}/roles/{role['id']}").status_code == 404
+    assert client.put(f"/departments/{root_id}/roles/999999").status_code == 404
+
+
+def test_has_permission_is_served_from_the_cache(client, db_session, count_queries):
+    ids = _setup(client, "hot")
+    user_id = ids["user"]["id"]
+    role = client.post("/roles/", json={"name": "perm-hot", "permissions": ["audit:read"]}).json()
+    client.put(f"/departments/{ids['child']['id']}/roles/{role['id']}")
+
+    assert has_permission(db_session, user_id, "audit:read")
+    with count_queries() as statements:
+        for _ in range(100):
+            assert has_permission(db_session, user_id, "audit:read")
+            assert not has_permission(db_session, user_id, "users:write")
+    assert statements == []
+    with pytest.raises(UnknownPermission):
+        has_permission(db_session, user_id, "users:fly")
+
+
+def test_set_based_user_writes_drop_only_the_affected_entries(client, db_session):
+    ids = _setup(client, "narrow")
+    other = client.post(
+        "/users/",
+        json={"email": "perm-narrow-other@example.com", "password": "secret123", "organization_id": ids["org"]["id"]},
+    ).json()
+    user_id, other_id = ids["user"]["id"], other["id"]
+    role = client.post("/roles/", json={"name": "perm-narrow", "permissions": ["users:read"]}).json()
+
+    def cached() -> set[int]:
+        for uid in (user_id, other_id):
+            has_permission(db_session, uid, "users:read")  # fills the entry if it was dropped
+        return set(permission_cache.get_many([user_id, other_id]))
+
+    assert cached() == {user_id, other_id}
+    # A name change does not touch permissions: nothing is dropped.
+    client.patch(f"/users/{user_id}", json={"full_name": "Narrow User"})
+    assert set(permission_cache.get_many([user_id, other_id])) == {user_id, other_id}
+
+    # Membership changes drop the members' entries only.
+    client.post(f"/roles/{role['id']}/members", json={"user_ids": [user_id]})
+    assert set(permission_cache.get_many([user_id, other_id])) == {other_id}
+    assert _permissions(client, user_id) == ["users:read"]
+
+    assert cached() == {user_id, other_id}
+    client.request("DELETE", f"/roles/{role['id']}/members", json={"user_ids": [user_id]})
+    assert set(permission_cache.get_many([user_id, other_id])) == {other_id}
+
+    assert cached() == {user_id, other_id}
+    client.patch(f"/users/{other_id}", json={"department_id": ids["root"]["id"]})
+    assert set(permission_cache.get_many([user_id, other_id])) == {user_id}
+
+
+def test_permission_cache_does_not_evict_shared_entries(client, count_queries):
+    from app.core.cache import get_cache_backend
+    from app.core.config import get_settings
+
+    assert permission_cache.backend is not get_cache_backend()
+    org = client.post("/organizations/", json={"name": "Perm Evict Org"}).json()
+    client.get(f"/organizations/{org['id']}")  # cached in the shared backend
+    # More masks than the shared backend could hold.
+    for n in range(get_settings().CACHE_MAX_ENTRIES + 100):
+        permission_cache.set(("fill", n), 0)
+    with count_queries() as statements:
+        assert client.get(f"/organizations/{org['id']}").status_code == 200
+    assert statements == []
+    permission_cache.clear()
@@ -0,0 +1,71 @@
+"""Statement-count regression tests: list/detail endpoints must not issue
+one query per row when serializing nested relationships."""
+from app.models.department import Department
+from app.models.organization import Organization
+from app.models.role import Role
+from app.models.user import User
+
+
+def _seed(db_session, name: str, n_users: int, n_departments: int) -> int:
+    org = Organization(name=name)
+    roles = [Role(name=f"{name}-role-{i}") for i in range(3)]
+    db_session.add(org)
+    db_session.add_all(roles)
+    db_session.flush()
+    for i in range(n_departments):
+        db_session.add(Department(name=f"{name}-dept-{i}", organization_id=org.id))
+    for i in range(n_users):
+        db_session.add(
+            User(
+                email=f"{name.lower()}-{i}@example.com",
+                hashed_password="x",
+                organization_id=org.id,
+                roles=roles[: i % 3 + 1],
+            )
+        )
+    db_session.commit()
+    org_id = org.id
+    db_session.expunge_all()
+    return org_id
+
+
+def test_user_list_query_count_is_independent_of_page_size(client, db_session, count_queries):
+    _seed(db_session, "QcUsers", n_users=3, n_departments=0)
+    with count_queries() as small:
+        resp = client.get("/users/?limit=3")
+    assert resp.status_code == 200
+
+    _seed(db_session, "QcUsersMore", n_users=30, n_departments=0)
+    with count_queries() as large:
+        resp = client.get("/users/?limit=30")
+    assert resp.status_code == 200
+    assert len(resp.json()) == 30
+    assert len(large) == len(small) == 2
+
+
+def test_user_detail_query_count(client, db_session, count_queries):
+    _seed(db_session, "QcDetail", n_users=1, n_departments=0)
+    user_id = db_session.query(User.id).filter(User.email == "qcdetail-0@example.com").scalar()
+    db_session.expunge_all()
+    with count_queries() as statements:
+        resp = client.get(f"/users/{user_id}")
+    assert resp.status_code == 200
+    assert len(resp.json()["roles"]) == 1
+    assert len(statements) == 2
+
+
+def test_organization_detail_query_count(client, db_session, count_queries):
+    org_id = _seed(db_session, "QcOrg", n_users=0, n_departments=25)
+    with count_queries() as statements:
+        resp = client.get(f"/organizations/{org_id}/detail")
+    assert resp.status_code == 200
+    assert len(resp.json()["departments"]) == 25
+    assert len(statements) == 2
+
+
+def test_list_endpoints_single_query(client, db_session, count_queries):
+    _seed(db_session, "QcFlat", n_users=0, n_departments=0)
+    for path in ("/organizations/", "/roles/"):
+        with count_queries() as statements:
+            assert client.get(path).status_code == 200
+        assert len(statements) == 1, path
@@ -0,0 +1,96 @@
+from sqlalchemy import text
+from app.db.headcounts import rebuild_headcounts
+
+
+def _user(client, tag: str, org_id: int, dept_id: int | None = None, **extra) -> dict:
+    payload = {"email": f"report-{tag}@example.com", "password": "secret123", "organization_id": org_id}
+    resp = client.post("/users/", json={**payload, "department_id": dept_id, **extra})
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def _assert_summary_matches_live(client, org_id: int) -> None:
+    for path in (
+        "/reports/headcount/organizations",
+        "/reports/headcount/roles",
+        f"/reports/headcount/organizations/{org_id}/departments",
+    ):
+        summary = client.get(path).json()
+        assert summary == client.get(path, params={"source": "live"}).json(), path
+
+
+def _by_id(rows: list[dict]) -> dict[int, dict]:
+    return {row["id"]: row for row in rows}
+
+
+def test_headcounts_follow_every_write_path(client):
+    org = client.post("/organizations/", json={"name": "Report Org"}).json()
+    root = client.post("/departments/", json={"name": "Report Root", "organization_id": org["id"]}).json()
+    child = client.post(
+        "/departments/", json={"name": "Report Child", "organization_id": org["id"], "parent_id": root["id"]}
+    ).json()
+    role = client.post("/roles/", json={"name": "report-role"}).json()
+
+    a = _user(client, "a", org["id"], root["id"])
+    b = _user(client, "b", org["id"], child["id"])
+    _user(client, "c", org["id"], child["id"], is_active=False)
+    _assert_summary_matches_live(client, org["id"])
+    assert _by_id(client.get("/reports/headcount/organizations").json())[org["id"]] == {
+        "id": org["id"], "name": "Report Org", "active": 2, "inactive": 1, "total": 3,
+    }
+
+    bulk = [
+        {"email": f"report-bulk-{i}@example.com", "password": "secret123", "organization_id": org["id"], "department_id": child["id"]}
+        for i in range(3)
+    ]
+    assert client.post("/users/bulk", json=bulk).json()["created"] == 3
+    _assert_summary_matches_live(client, org["id"])
+
+    assert client.post(f"/roles/{role['id']}/members", json={"user_ids": [a["id"], b["id"]]}).json()["changed"] == 2
+    _assert_summary_matches_live(client, org["id"])
+    assert client.patch(f"/users/{b['id']}", json={"is_active": False, "department_id": root["id"]}).status_code == 200
+    _assert_summary_matches_live(client, org["id"])
+    assert _by_id(client.get("/reports/headcount/roles").json())[role["id"]]["inactive"] == 1
+
+    client.request("DELETE", f"/roles/{role['id']}/members", json={"user_ids": [a["id"]]})
+    _assert_summary_matches_live(client, org["id"])
+    assert client.delete(f"/users/{a['id']}").status_code == 204
+    _assert_summary_matches_live(client, org["id"])
+    assert client.delete(f"/departments/{child['id']}").status_code == 204
+    _assert_summary_matches_live(client, org["id"])
+    assert client.delete(f"/roles/{role['id']}").status_code == 204
+    _assert_summary_matches_live(client, org["id"])
+
+
+def test_department_counts_roll_up_subtrees(client):
+    org = client.post("/organizations/", json={"name": "Rollup Org"}).json()
+    root = client.post("/departments/", json={"name": "Rollup Root", "organization_id": org["id"]}).json()
+    child = client.post(
+        "/departments/", json={"name": "Rollup Child", "organization_id": org["id"], "parent_id": root["id"]}
+    ).json()
+    _user(client, "rollup-1", org["id"], root["id"])
+    _user(client, "rollup-2", org["id"], child["id"])
+    _user(client, "rollup-3", org["id"], child["id"], is_active=False)
+
+    rows = client.get(f"/reports/headcount/organizations/{org['id']}/departments").json()
+    assert [(r["id"], r["parent_id"], r["direct"], r["active"], r["inactive"]) for r in rows] == [
+        (root["id"], None, 1, 2, 1),
+        (child["id"], root["id"], 2, 1, 1),
+    ]
+    assert client.get("/reports/headcount/organizations/999999/departments").status_code == 404
+    assert client.get("/reports/headcount/roles", params={"source": "other"}).status_code == 422
+
+
+def test_rebuild_repairs_drift(client, db_session):
+    org = client.post("/organizations/", json={"name": "Drift Org"}).json()
+    _user(client, "drift", org["id"])
+    db_session.execute(
+        text("UPDATE headcounts SET count = count + 5 WHERE kind = 'organization'")
+    )
+    db_session.commit()
+    assert client.get("/reports/headcount/organizations").json() != client.get(
+        "/reports/headcount/organizations", params={"source": "live"}
+    ).json()
+    rebuild_headcounts(db_session.connection())
+    db_session.commit()
+    _assert_summary_matches_live(client, org["id"])
@@ -0,0 +1,76 @@
+def _org_with_users(client, tag: str) -> dict:
+    org = client.post("/organizations/", json={"name": f"Members Org {tag}"}).json()
+    root = client.post("/departments/", json={"name": "Root", "organization_id": org["id"]}).json()
+    child = client.post(
+        "/departments/", json={"name": "Child", "organization_id": org["id"], "parent_id": root["id"]}
+    ).json()
+    users = []
+    for i, dept in enumerate([root, child, child, None]):
+        users.append(
+            client.post(
+                "/users/",
+                json={
+                    "email": f"members-{tag}-{i}@example.com",
+                    "password": "secret123",
+                    "organization_id": org["id"],
+                    "department_id": dept["id"] if dept else None,
+                },
+            ).json()
+        )
+    role = client.post("/roles/", json={"name": f"members-{tag}", "permissions": ["roles:read"]}).json()
+    return {"root": root, "child": child, "users": users, "role": role}
+
+
+def _role_names(client, user_id: int) -> list[str]:
+    return [r["name"] for r in client.get(f"/users/{user_id}").json()["roles"]]
+
+
+def test_add_and_remove_members_by_user_ids(client, count_queries):
+    data = _org_with_users(client, "ids")
+    role_id, users = data["role"]["id"], data["users"]
+    ids = [users[0]["id"], users[3]["id"], 999_999]  # unknown ids are skipped
+
+    with count_queries() as statements:
+        resp = client.post(f"/roles/{role_id}/members", json={"user_ids": ids})
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == {"role_id": role_id, "changed": 2}
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO USER_ROLES")]
+    assert len(inserts) == 1 and "SELECT" in inserts[0].upper()
+
+    # Granting again is a no-op; permissions reflect the new assignment.
+    assert client.post(f"/roles/{role_id}/members", json={"user_ids": ids}).json()["changed"] == 0
+    assert _role_names(client, users[0]["id"]) == ["members-ids"]
+    assert client.get(f"/users/{users[0]['id']}/permissions").json()["permissions"] == ["roles:read"]
+
+    resp = client.request("DELETE", f"/roles/{role_id}/members", json={"user_ids": [users[0]["id"]]})
+    assert resp.json()["changed"] == 1
+    assert _role_names(client, users[0]["id"]) == []
+    assert _role_names(client, users[3]["id"]) == ["members-ids"]
+    assert client.get(f"/users/{users[0]['id']}/permissions").json()["permissions"] == []
+
+
+def test_members_by_department_subtree(client):
+    data = _org_with_users(client, "dept")
+    role_id, users = data["role"]["id"], data["users"]
+
+    resp = client.post(
+        f"/roles/{role_id}/members", json={"department_id": data["child"]["id"], "include_subdepartments": False}
+    )
+    assert resp.json()["changed"] == 2
+    resp = client.post(f"/roles/{role_id}/members", json={"department_id": data["root"]["id"]})
+    assert resp.json()["changed"] == 1  # the child's members already hold it
+    assert [bool(_role_names(client, u["id"])) for u in users] == [True, True, True, False]
+
+    resp = client.request("DELETE", f"/roles/{role_id}/members", json={"department_id": data["root"]["id"]})
+    assert resp.json()["changed"] == 3
+    assert not any(_role_names(client, u["id"]) for u in users)
+
+
+def test_member_changes_are_validated(client):
+    data = _org_with_users(client, "invalid")
+    role_id = data["role"]["id"]
+    assert client.post(f"/roles/{role_id}/members", json={}).status_code == 422
+    both = {"user_ids": [1], "department_id": data["root"]["id"]}
+    assert client.post(f"/roles/{role_id}/members", json=both).status_code == 422
+    assert client.post(f"/roles/{role_id}/members", json={"department_id": 999_999}).status_code == 404
+    assert client.post("/roles/999999/members", json={"user_ids": [1]}).status_code == 404
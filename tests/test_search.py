@@ -0,0 +1,128 @@
+from app.db.search_index import rebuild_search_index
+from app.services import search_service
+
+
+def _setup(client, tag: str) -> dict:
+    org = client.post("/organizations/", json={"name": f"Searchable {tag} Hospital"}).json()
+    dept = client.post("/departments/", json={"name": f"Cardiology {tag}", "organization_id": org["id"]}).json()
+    user = client.post(
+        "/users/",
+        json={
+            "email": f"hong.gildong.{tag}@example.com",
+            "full_name": "홍길동",
+            "password": "secret123",
+            "organization_id": org["id"],
+            "department_id": dept["id"],
+        },
+    ).json()
+    return {"org": org, "dept": dept, "user": user}
+
+
+def _search(client, q: str, **params) -> list[dict]:
+    resp = client.get("/search", params={"q": q, **params})
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_search_finds_each_kind_by_word_prefix(client):
+    data = _setup(client, "alpha")
+    hits = _search(client, "searchable alp")
+    assert [(h["kind"], h["id"]) for h in hits] == [("organization", data["org"]["id"])]
+    assert hits[0]["match"] == "token"
+
+    dept_hits = _search(client, "cardio", kind="department", organization_id=data["org"]["id"])
+    assert [h["id"] for h in dept_hits] == [data["dept"]["id"]]
+
+    user_hits = _search(client, "홍", kind="user", organization_id=data["org"]["id"])
+    assert user_hits[0] == {
+        "kind": "user",
+        "id": data["user"]["id"],
+        "title": "홍길동",
+        "subtitle": "hong.gildong.alpha@example.com",
+        "organization_id": data["org"]["id"],
+        "match": "token",
+    }
+    assert _search(client, "gildong alpha")[0]["id"] == data["user"]["id"]
+
+
+def test_title_matches_rank_above_body_matches(client):
+    data = _setup(client, "rank")
+    client.post("/users/", json={"email": "rankuser@example.com", "full_name": "Gildong Rank",
+                                 "password": "secret123", "organization_id": data["org"]["id"]})
+    hits = _search(client, "gildong", organization_id=data["org"]["id"])
+    assert [h["title"] for h in hits] == ["Gildong Rank", "홍길동"]
+
+
+def test_substring_fallback_uses_trigram_index(client):
+    data = _setup(client, "beta")
+    hits = _search(client, "ildong.be")
+    assert [(h["id"], h["match"]) for h in hits] == [(data["user"]["id"], "substring")]
+    assert _search(client, "ld") == []  # too short for trigrams and no word starts with it
+
+
+def test_index_follows_updates_deletes_and_bulk_inserts(client):
+    data = _setup(client, "gamma")
+    client.put(f"/users/{data['user']['id']}", json={"full_name": "Kim Cheolsu"})
+    assert _search(client, "cheolsu")[0]["id"] == data["user"]["id"]
+    assert all(h["title"] != "홍길동" for h in _search(client, "gildong gamma"))
+
+    client.put(f"/organizations/{data['org']['id']}", json={"name": "Renamed Gamma Clinic"})
+    assert [h["kind"] for h in _search(client, "renamed gamma")] == ["organization"]
+    assert _search(client, "searchable gamma") == []
+
+    client.delete(f"/users/{data['user']['id']}")
+    assert _search(client, "cheolsu") == []
+
+    resp = client.post(
+        "/users/bulk",
+        json=[{"email": f"bulk.searchable{i}@example.com", "full_name": f"Bulkfound {i}",
+               "password": "secret123", "organization_id": data["org"]["id"]} for i in range(3)],
+    )
+    assert resp.json()["created"] == 3
+    assert len(_search(client, "bulkfound")) == 3
+
+
+def test_rebuild_and_like_fallback(client, db_session, monkeypatch):
+    data = _setup(client, "delta")
+    rebuild_search_index(db_session.connection())
+    db_session.commit()
+    assert _search(client, "cardiology delta")[0]["id"] == data["dept"]["id"]
+
+    # Backends without the FTS index fall back to LIKE over the base tables.
+    monkeypatch.setattr(search_service, "has_search_index", lambda connection: False)
+    hits = _search(client, "GILDONG.DELTA")
+    assert [(h["kind"], h["id"], h["subtitle"]) for h in hits] == [
+        ("user", data["user"]["id"], "hong.gildong.delta@example.com")
+    ]
+    assert [h["kind"] for h in _search(client, "delta", organization_id=data["org"]["id"], kind="department")] == [
+        "department"
+    ]
+
+
+def test_search_validates_query(client):
+    assert client.get("/search").status_code == 422
+    assert client.get("/search", params={"q": "x", "kind": "invoice"}).status_code == 422
+    assert _search(client, "   ") == []
+
+
+def test_best_match_wins_among_thousands_of_matches(client, db_session):
+    from sqlalchemy import delete, insert
+
+    from app.models.user import User
+
+    org_id = client.post("/organizations/", json={"name": "Zebulonqx Rank Hospital"}).json()["id"]
+    rows = [{"email": f"filler{i}@zebulon.example.com", "full_name": "Zebulonqx Filler Person Name",
+             "hashed_password": "x", "organization_id": org_id} for i in range(2500)]
+    # Inserted last, so it has the highest rowid: ranking only a prefix of the matches misses it.
+    rows.append({"email": "best@zebulon.example.com", "full_name": "Zebulonqx",
+                 "hashed_password": "x", "organization_id": org_id})
+    db_session.execute(insert(User), rows)
+    db_session.commit()
+    try:
+        token_hits = _search(client, "zebulonqx", kind="user", limit=1)
+        assert [(h["title"], h["match"]) for h in token_hits] == [("Zebulonqx", "token")]
+        substring_hits = _search(client, "ebulonq", kind="user", limit=1)
+        assert [(h["title"], h["match"]) for h in substring_hits] == [("Zebulonqx", "substring")]
+    finally:
+        db_session.execute(delete(User).where(User.organization_id == org_id))
+        db_session.commit()
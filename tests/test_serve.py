@@ -0,0 +1,71 @@
+import os
+
+import pytest
+from sqlalchemy import inspect
+
+from app.core.cache import Cache
+from app.core.config import Settings
+from app.core.passwords import HashingPool
+from app.db.schema import SchemaOutOfDate, check_schema, prepare_schema
+from app.db.session import create_db_engine
+from app import serve
+from app.services.warmup import warm_caches, warm_pool
+
+
+def test_schema_modes(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'schema.db'}", Settings(DB_POOL_SIZE=2))
+    try:
+        with pytest.raises(SchemaOutOfDate, match="no revision"):
+            prepare_schema(engine, "check")
+        prepare_schema(engine, "upgrade")
+        assert check_schema(engine) == "0007"
+        assert {"users", "headcounts", "audit_events", "alembic_version"} <= set(inspect(engine).get_table_names())
+        prepare_schema(engine, "off")
+        with pytest.raises(ValueError):
+            prepare_schema(engine, "drop")
+        assert warm_pool(engine) == 2
+        assert engine.pool.checkedin() == 2
+    finally:
+        engine.dispose()
+
+
+def test_warm_caches_fill_default_list_pages(client, db_session):
+    client.post("/organizations/", json={"name": "Warm Org"})
+    Cache._registry["organizations"].clear()
+    warm_caches(db_session)
+    organizations = Cache._registry["organizations"]
+    hits = organizations.hits
+    assert client.get("/organizations/").status_code == 200
+    assert organizations.hits == hits + 1
+
+
+def test_hashing_pool_warm_starts_workers():
+    pool = HashingPool(workers=2, max_pending=4)
+    try:
+        assert pool.warm() == 2
+        assert len(pool._get_executor()._processes) == 2
+    finally:
+        pool.shutdown()
+    assert HashingPool(workers=0, max_pending=4).warm() == 0
+
+
+def test_launcher_prepares_schema_once_and_configures_workers(monkeypatch):
+    calls = []
+    settings = Settings()
+    monkeypatch.setattr(serve, "get_settings", lambda: settings)
+    monkeypatch.setattr(serve, "prepare_schema", lambda engine, mode: calls.append(("schema", mode)))
+    monkeypatch.setattr("uvicorn.run", lambda app, **options: calls.append(("run", app, options)))
+    for name in ("SCHEMA_ON_STARTUP", "WARMUP_ON_STARTUP", "PASSWORD_HASH_WORKERS"):
+        monkeypatch.delenv(name, raising=False)
+    serve.main(["--workers", "2", "--limit-concurrency", "500", "--schema", "upgrade"])
+    # Overrides reach spawned workers through the environment and an in-process worker through Settings
+    assert os.environ["SCHEMA_ON_STARTUP"] == "off" and os.environ["WARMUP_ON_STARTUP"] == "true"
+    assert settings.SCHEMA_ON_STARTUP == "off" and settings.WARMUP_ON_STARTUP is True
+    assert settings.PASSWORD_HASH_WORKERS == int(os.environ["PASSWORD_HASH_WORKERS"]) >= 1
+
+    assert calls[0] == ("schema", "upgrade")
+    _, app, options = calls[1]
+    assert app == "app.main:app"
+    assert options["workers"] == 2 and options["limit_concurrency"] == 500
+    assert options["limit_max_requests"] is None and options["backlog"] == 2048
+    assert options["timeout_keep_alive"] == 65
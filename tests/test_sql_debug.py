@@ -0,0 +1,99 @@
+import logging
+import pytest
+from app.core.config import get_settings
+from app.core.sql_debug import collect_findings, normalize_statement, sql_trace
+from app.models.department import Department
+from app.models.organization import Organization
+from app.models.role import Role
+from app.models.user import User
+from app.schemas.user import UserRead
+from app.services import loading
+
+
+def _seed_users(db_session, name: str, n_users: int) -> int:
+    org = Organization(name=name)
+    role = Role(name=f"{name}-role")
+    db_session.add_all([org, role])
+    db_session.flush()
+    dept = Department(name=f"{name}-dept", organization_id=org.id)
+    db_session.add(dept)
+    db_session.flush()
+    dept.path = f"/{dept.id}/"
+    db_session.add_all(
+        User(
+            email=f"{name.lower()}-{i}@example.com",
+            hashed_password="x",
+            organization_id=org.id,
+            department_id=dept.id,
+            roles=[role],
+        )
+        for i in range(n_users)
+    )
+    db_session.commit()
+    dept_id = dept.id
+    db_session.expunge_all()
+    return dept_id
+
+
+def test_normalize_statement_collapses_literals_and_in_lists():
+    a = normalize_statement("SELECT * FROM users\n  WHERE id IN (?, ?, ?) AND email = 'a@x'  LIMIT 10")
+    b = normalize_statement("SELECT * FROM users WHERE id IN (?) AND email = 'b@y' LIMIT 20")
+    assert a == b == "SELECT * FROM users WHERE id IN (?) AND email = ? LIMIT ?"
+    assert normalize_statement("SELECT users_1.id FROM users AS users_1") == "SELECT users_1.id FROM users AS users_1"
+
+
+@pytest.mark.allow_n_plus_one
+def test_lazy_loading_regression_is_reported(client, db_session, monkeypatch):
+    dept_id = _seed_users(db_session, "NPlusOne", n_users=8)
+    # Simulate dropping the eager load for UserRead.roles.
+    monkeypatch.setitem(loading._LOADER_OPTIONS, UserRead, ())
+    with collect_findings() as findings:
+        assert client.get(f"/departments/{dept_id}/users").status_code == 200
+    assert len(findings) == 1
+    assert findings[0].label == "GET /departments/{dept_id}/users"
+    assert findings[0].count == 8
+    assert "user_roles" in findings[0].statement
+
+
+def test_eager_loaded_list_is_not_reported(client, db_session):
+    dept_id = _seed_users(db_session, "EagerOk", n_users=8)
+    with collect_findings() as findings:
+        assert client.get(f"/departments/{dept_id}/users").status_code == 200
+    assert findings == []
+
+
+@pytest.mark.allow_n_plus_one
+def test_sql_trace_outside_requests(db_session):
+    _seed_users(db_session, "TraceBlock", n_users=4)
+    with collect_findings() as findings:
+        with sql_trace("roles report", threshold=3):
+            for user in db_session.query(User).filter(User.email.like("traceblock-%")).all():
+                user.roles  # lazy load per user
+    assert [(f.label, f.count) for f in findings] == [("roles report", 4)]
+
+
+def test_slow_queries_are_logged_with_route(client, caplog, monkeypatch):
+    monkeypatch.setattr(get_settings(), "SLOW_QUERY_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        assert client.get("/roles/", params={"limit": 7}).status_code == 200
+    messages = [r.getMessage() for r in caplog.records if r.name == "app.sql.slow"]
+    assert any("[GET /roles/]" in m and "FROM roles" in m and "params=" in m for m in messages)
+
+
+def test_failed_statement_leaves_no_debug_state(db_session, caplog, monkeypatch):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    monkeypatch.setattr(get_settings(), "SLOW_QUERY_MS", 0)
+    conn = db_session.connection()
+    for _ in range(3):
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+    db_session.rollback()
+    conn = db_session.connection()
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        conn.execute(text("SELECT 42"))
+    assert not conn.info.get("sql_debug_start")
+    assert [r.getMessage().split(": ", 1)[1] for r in caplog.records if r.name == "app.sql.slow"] == [
+        "SELECT 42 | params=()"
+    ]
@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.modules import MODULES, enabled_modules, hook_modules, model_modules
+from benchmarks.importtime import STARTUP_BUDGET_MS, parse, profile, summarize
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_parse_importtime_output():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     app.core\n"
+        "import time:      1500 |       1620 |   app.core.config\n"
+        "import time:       300 |       1920 | app\n"
+    )
+    records = parse(stderr)
+    assert [(r.name, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+        ("app.core", 120, 120, 2), ("app.core.config", 1500, 1620, 1), ("app", 300, 1920, 0),
+    ]
+    summary = summarize(records, "app")
+    assert summary["total_ms"] == 1.9 and summary["by_package_ms"]["app.core"] == 1.6
+
+
+def test_app_import_stays_within_startup_budget():
+    summary = summarize(profile("app.main", runs=3), "app.main")
+    assert summary["deferred_imported"] == [], "import these where they are used, not at module level"
+    assert summary["total_ms"] <= STARTUP_BUDGET_MS, summary["slowest"][:10]
+
+
+def test_only_enabled_modules_are_imported():
+    script = (
+        "import json, sys, app.main\n"
+        "from benchmarks.run import api_routes\n"
+        "print(json.dumps({'modules': sorted(m for m in sys.modules if m.startswith('app.routes.')),"
+        " 'routes': sorted(api_routes(app.main.app.routes)),"
+        " 'tags': [t['name'] for t in app.main.app.openapi()['tags']]}))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "ENABLED_MODULES": "organizations,operations"},
+    )
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout)
+    assert result["modules"] == ["app.routes.departments", "app.routes.ops", "app.routes.organization"]
+    assert "GET /organizations/" in result["routes"] and "GET /metrics" in result["routes"]
+    assert not any(route.split()[1].startswith(("/users", "/roles", "/search")) for route in result["routes"])
+    assert result["tags"] == ["Organizations", "Operations"]
+
+
+def test_session_hooks_load_whichever_modules_are_enabled():
+    script = (
+        "import json, sys, app.main\n"
+        "from app.modules import hook_modules\n"
+        "print(json.dumps({'hooks': [m in sys.modules for m in hook_modules()],"
+        " 'routes': sorted(m for m in sys.modules if m.startswith('app.routes.'))}))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "ENABLED_MODULES": "roles"},
+    )
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout)
+    assert result["routes"] == ["app.routes.roles"]
+    assert result["hooks"] == [True] * len(hook_modules())
+
+
+def test_enabled_modules_and_models():
+    assert [m.name for m in enabled_modules("")] == list(MODULES)
+    assert [m.name for m in enabled_modules(" roles, users ")] == ["users", "roles"]
+    with pytest.raises(ValueError, match="Unknown modules: payroll"):
+        enabled_modules("users,payroll")
+    assert {"app.models.user", "app.db.search_index", "app.db.headcounts"} <= set(model_modules())
+    assert {"app.services.permission_service", "app.services.audit_service", "app.services.report_service"} <= set(
+        hook_modules()
+    )
@@ -0,0 +1,71 @@
+import json
+
+
+def _org(client, name: str) -> int:
+    resp = client.post("/organizations/", json={"name": name})
+    assert resp.status_code == 201, resp.text
+    return resp.json()["id"]
+
+
+def test_bulk_import_json_array_reports_per_row(client):
+    org_id = _org(client, "Bulk Org JSON")
+    client.post("/users/", json={"email": "taken@bulk.example.com", "password": "secret123", "organization_id": org_id})
+    rows = [
+        {"email": "a@bulk.example.com", "password": "secret123", "organization_id": org_id},
+        {"email": "not-an-email", "password": "secret123", "organization_id": org_id},
+        {"email": "taken@bulk.example.com", "password": "secret123", "organization_id": org_id},
+        {"email": "b@bulk.example.com", "password": "secret123", "organization_id": org_id, "full_name": "B"},
+        {"email": "a@bulk.example.com", "password": "secret123", "organization_id": org_id},
+    ]
+    resp = client.post("/users/bulk?batch_size=2", json=rows)
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["created"] == 2 and body["failed"] == 3
+    assert [r["index"] for r in body["results"]] == [0, 1, 2, 3, 4]
+    assert [r["status"] for r in body["results"]] == ["created", "error", "error", "created", "error"]
+    assert body["results"][2]["error"] == "Email already registered"
+    assert body["results"][4]["error"] == "Email already registered"
+
+    user = client.get(f"/users/{body['results'][3]['id']}").json()
+    assert user["full_name"] == "B" and user["is_active"] is True
+
+
+def test_bulk_import_ndjson_and_csv(client):
+    org_id = _org(client, "Bulk Org Streams")
+    ndjson = "\n".join(
+        [json.dumps({"email": f"nd{i}@bulk.example.com", "password": "secret123", "organization_id": org_id}) for i in range(3)]
+        + ["{broken"]
+    )
+    resp = client.post("/users/bulk", content=ndjson, headers={"Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["created"] == 3
+    assert resp.json()["results"][3]["status"] == "error"
+
+    csv_body = (
+        "email,full_name,password,organization_id,is_active,department_id\n"
+        f"csv1@bulk.example.com,Csv One,secret123,{org_id},false,\n"
+        f"csv2@bulk.example.com,,short,{org_id},,\n"
+    )
+    resp = client.post("/users/bulk", content=csv_body, headers={"Content-Type": "text/csv"})
+    assert resp.status_code == 200, resp.text
+    results = resp.json()["results"]
+    assert results[0]["status"] == "created"
+    assert results[1]["status"] == "error" and "password" in results[1]["error"]
+    assert client.get(f"/users/{results[0]['id']}").json()["is_active"] is False
+
+
+def test_bulk_import_batches_statements(client, count_queries):
+    org_id = _org(client, "Bulk Org Batches")
+    rows = [{"email": f"batch{i}@bulk.example.com", "password": "secret123", "organization_id": org_id} for i in range(50)]
+    with count_queries() as statements:
+        resp = client.post("/users/bulk?batch_size=25", json=rows)
+    assert resp.json()["created"] == 50
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO USERS")]
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(inserts) == 2
+    assert len(selects) == 2
+
+
+def test_bulk_import_rejects_bad_payloads(client):
+    assert client.post("/users/bulk", json={"email": "x"}).status_code == 400
+    assert client.post("/users/bulk", content="x", headers={"Content-Type": "text/plain"}).status_code == 415
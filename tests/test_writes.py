@@ -0,0 +1,66 @@
+def _writes(statements: list[str]) -> list[str]:
+    return [s for s in statements if s.lstrip().split()[0].upper() in {"INSERT", "UPDATE", "DELETE"}]
+
+
+def test_create_is_one_insert_returning_and_duplicates_are_400(client, count_queries):
+    with count_queries() as statements:
+        resp = client.post("/organizations/", json={"name": "Returning Org", "description": "d"})
+    assert resp.status_code == 201, resp.text
+    assert resp.json()["description"] == "d" and resp.json()["created_at"]
+    assert len(statements) == 1 and "RETURNING" in statements[0].upper()
+
+    dup = client.post("/organizations/", json={"name": "Returning Org"})
+    assert dup.status_code == 400 and dup.json()["detail"] == "Organization name already exists"
+    assert client.post("/roles/", json={"name": "returning-role"}).status_code == 201
+    assert client.post("/roles/", json={"name": "returning-role"}).json()["detail"] == "Role name already exists"
+
+    user = {"email": "returning@example.com", "password": "secret123", "organization_id": resp.json()["id"]}
+    created = client.post("/users/", json=user)
+    assert created.status_code == 201 and created.json()["roles"] == []
+    assert client.post("/users/", json=user).json()["detail"] == "Email already registered"
+    # The session is usable again after the rolled back INSERT.
+    assert client.get(f"/users/{created.json()['id']}").status_code == 200
+
+
+def test_patch_is_one_update_without_loading(client, count_queries):
+    org = client.post("/organizations/", json={"name": "Patch Org", "description": "keep"}).json()
+    with count_queries() as statements:
+        resp = client.patch(f"/organizations/{org['id']}", json={"name": "Patched Org"})
+    assert resp.json()["name"] == "Patched Org" and resp.json()["description"] == "keep"
+    assert resp.json()["updated_at"] >= org["updated_at"]
+    assert len(statements) == 1 and statements[0].lstrip().upper().startswith("UPDATE")
+
+    # PATCH writes explicit nulls (nullable columns only); PUT ignores them.
+    assert client.put(f"/organizations/{org['id']}", json={"description": None}).json()["description"] == "keep"
+    assert client.patch(f"/organizations/{org['id']}", json={"description": None}).json()["description"] is None
+    assert client.patch(f"/organizations/{org['id']}", json={"name": None}).json()["name"] == "Patched Org"
+    assert client.patch("/organizations/999999", json={"name": "x"}).status_code == 404
+
+    client.post("/organizations/", json={"name": "Patch Org Taken"})
+    resp = client.patch(f"/organizations/{org['id']}", json={"name": "Patch Org Taken"})
+    assert resp.status_code == 400 and resp.json()["detail"] == "Organization name already exists"
+
+
+def test_patch_user_and_role(client, count_queries):
+    org = client.post("/organizations/", json={"name": "Patch Users Org"}).json()
+    dept = client.post("/departments/", json={"name": "Patch Dept", "organization_id": org["id"]}).json()
+    user = client.post(
+        "/users/",
+        json={"email": "patch@example.com", "password": "secret123", "organization_id": org["id"], "department_id": dept["id"]},
+    ).json()
+    role = client.post("/roles/", json={"name": "patch-role", "description": "keep"}).json()
+    client.post(f"/roles/{role['id']}/members", json={"user_ids": [user["id"]]})
+
+    with count_queries() as statements:
+        resp = client.patch(f"/users/{user['id']}", json={"full_name": "Patched"})
+    assert resp.json()["full_name"] == "Patched" and resp.json()["department_id"] == dept["id"]
+    assert [r["name"] for r in resp.json()["roles"]] == ["patch-role"]
+    assert len(_writes(statements)) == 1
+
+    assert client.put(f"/users/{user['id']}", json={"department_id": None}).json()["department_id"] == dept["id"]
+    assert client.patch(f"/users/{user['id']}", json={"department_id": None}).json()["department_id"] is None
+    assert client.patch("/users/999999", json={"full_name": "x"}).status_code == 404
+
+    resp = client.patch(f"/roles/{role['id']}", json={"permissions": ["users:write", "users:read"]})
+    assert resp.json() == {**role, "permissions": ["users:read", "users:write"]}
+    assert client.get(f"/users/{user['id']}/permissions").json()["permissions"] == ["users:read", "users:write"]